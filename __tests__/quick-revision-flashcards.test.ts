@@ -20,6 +20,8 @@ describe("/api/quick-revision/flashcards - GET", () => {
     where: jest.Mock;
   };
   let mockGet: jest.Mock;
+  let mockPoolGet: jest.Mock;
+  let mockCatalogGet: jest.Mock;
 
   beforeEach(() => {
     mockGet = jest.fn();
@@ -28,8 +30,22 @@ describe("/api/quick-revision/flashcards - GET", () => {
         get: mockGet,
       }),
     };
+    // No flashcard pools by default, so the route scans curriculum_chunks.
+    mockPoolGet = jest.fn().mockResolvedValue({ docs: [] });
+    const mockPoolQuery: Record<string, jest.Mock> = {};
+    mockPoolQuery.where = jest.fn().mockReturnValue(mockPoolQuery);
+    mockPoolQuery.select = jest.fn().mockReturnValue(mockPoolQuery);
+    mockPoolQuery.get = mockPoolGet;
+    mockCatalogGet = jest.fn().mockResolvedValue({ exists: false });
+    const mockCatalog = { doc: jest.fn().mockReturnValue({ get: mockCatalogGet }) };
     getFirestoreClientMock.mockReturnValue({
-      collection: jest.fn().mockReturnValue(mockCollection),
+      collection: jest.fn((name: string) =>
+        name === "curriculum_pools"
+          ? mockPoolQuery
+          : name === "curriculum_catalog"
+            ? mockCatalog
+            : mockCollection
+      ),
     } as unknown as ReturnType<typeof getFirestoreClient>);
   });
 
@@ -257,6 +273,93 @@ describe("/api/quick-revision/flashcards - GET", () => {
     expect(data.flashcards[0].definition).toContain("Mitochondria");
   });
 
+  it("reads pool samples without scanning chunks once every chapter has a pool", async () => {
+    mockPoolGet.mockResolvedValue({
+      docs: [
+        {
+          data: () => ({
+            chapterId: "chapter-1",
+            chapterTitle: "Physics: Forces",
+            sample: [
+              { id: "chapter-1-force", term: "Force", definition: "A push or pull" },
+              { id: "chapter-1-mass", term: "Mass", definition: "Quantity of matter" },
+            ],
+          }),
+        },
+        {
+          data: () => ({
+            chapterId: "chapter-2",
+            chapterTitle: "Motion",
+            sample: [{ id: "chapter-2-force", term: "Force", definition: "Duplicate" }],
+          }),
+        },
+      ],
+    });
+    mockCatalogGet.mockResolvedValue({
+      exists: true,
+      data: () => ({ chapters: { "chapter-1": {}, "chapter-2": {} } }),
+    });
+
+    const response = await GET(makeRequest("Science"));
+    const data = await response.json();
+
+    expect(response.status).toBe(200);
+    expect(mockGet).not.toHaveBeenCalled();
+    expect(data.flashcards.map((card: { term: string }) => card.term)).toEqual(["Force", "Mass"]);
+    expect(data.flashcards[0]).toEqual({
+      id: "chapter-1-force",
+      chapterId: "chapter-1",
+      chapterTitle: "Physics: Forces",
+      term: "Force",
+      definition: "A push or pull",
+    });
+  });
+
+  it("scans chunks for catalog chapters that have no pool yet", async () => {
+    mockPoolGet.mockResolvedValue({
+      docs: [
+        {
+          data: () => ({
+            chapterId: "chapter-1",
+            chapterTitle: "Forces",
+            sample: [{ id: "chapter-1-force", term: "Force", definition: "A push or pull" }],
+          }),
+        },
+      ],
+    });
+    mockCatalogGet.mockResolvedValue({
+      exists: true,
+      data: () => ({ chapters: { "chapter-1": {}, "chapter-2": {} } }),
+    });
+    mockGet.mockResolvedValue({
+      docs: [
+        {
+          id: "chapter-1-t1-s1",
+          data: () => ({
+            chapterId: "chapter-1",
+            chapterTitle: "Forces",
+            content: { keyTerms: { Inertia: "Resistance to change in motion" } },
+          }),
+        },
+        {
+          id: "chapter-2-t1-s1",
+          data: () => ({
+            chapterId: "chapter-2",
+            chapterTitle: "Motion",
+            content: { keyTerms: { Velocity: "Speed with direction" } },
+          }),
+        },
+      ],
+    });
+
+    const response = await GET(makeRequest("Science"));
+    const data = await response.json();
+
+    expect(response.status).toBe(200);
+    expect(data.flashcards.map((card: { term: string }) => card.term)).toEqual(["Force", "Velocity"]);
+    expect(data.flashcards[1].id).toBe("chapter-2-velocity");
+  });
+
   it("returns 500 when Firestore throws an error", async () => {
     mockGet.mockRejectedValue(new Error("Firestore error"));
 
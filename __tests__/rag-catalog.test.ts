@@ -0,0 +1,107 @@
+/**
+ * Tests for getCatalogFromDB in lib/rag
+ */
+
+import { getCatalogFromDB } from "@/lib/rag";
+import { getFirestoreClient } from "@/lib/firebase-admin";
+
+jest.mock("next/cache", () => ({
+  unstable_cache: (fn: unknown) => fn,
+}));
+
+jest.mock("@/lib/firebase-admin", () => ({
+  getFirestoreClient: jest.fn(),
+}));
+
+const getFirestoreClientMock = getFirestoreClient as jest.MockedFunction<typeof getFirestoreClient>;
+
+describe("getCatalogFromDB", () => {
+  let catalogDoc: { exists: boolean; data: () => unknown };
+  let chunksGet: jest.Mock;
+
+  beforeEach(() => {
+    catalogDoc = { exists: false, data: () => undefined };
+    chunksGet = jest.fn().mockResolvedValue({ docs: [] });
+    getFirestoreClientMock.mockReturnValue({
+      collection: jest.fn((name: string) =>
+        name === "curriculum_catalog"
+          ? { doc: jest.fn().mockReturnValue({ get: jest.fn().mockResolvedValue(catalogDoc) }) }
+          : { where: jest.fn().mockReturnValue({ get: chunksGet }) }
+      ),
+    } as unknown as ReturnType<typeof getFirestoreClient>);
+  });
+
+  afterEach(() => {
+    jest.clearAllMocks();
+  });
+
+  it("builds the catalog from the catalog document without scanning chunks", async () => {
+    catalogDoc = {
+      exists: true,
+      data: () => ({
+        subject: "Science",
+        chapters: {
+          "science-7-6": {
+            id: "science-7-6",
+            title: "Detected Chapter",
+            topics: [
+              {
+                id: "6-2",
+                title: "Acids",
+                subtopics: [
+                  { id: "6-2-2", title: "Neutralisation" },
+                  { id: "6-2-1", title: "Indicators" },
+                ],
+              },
+              { id: "6-1", title: "", subtopics: [{ id: "6-1-1", title: "Bases" }] },
+            ],
+          },
+          "science-7-1": {
+            id: "science-7-1",
+            title: "Acids and Bases",
+            topics: [{ id: "1-1", title: "Intro", subtopics: [{ id: "1-1-1", title: "Overview" }] }],
+          },
+        },
+      }),
+    };
+
+    const catalog = await getCatalogFromDB("Science");
+
+    expect(chunksGet).not.toHaveBeenCalled();
+    expect(catalog.subject).toBe("Science");
+    expect(catalog.chapters.map((chapter) => chapter.title)).toEqual(["Acids and Bases", "Science 7 6"]);
+    const chapter = catalog.chapters[1];
+    expect(chapter.topics.map((topic) => topic.title)).toEqual(["6 1", "Acids"]);
+    expect(chapter.topics[1].subtopics.map((subtopic) => subtopic.id)).toEqual(["6-2-1", "6-2-2"]);
+  });
+
+  it("falls back to scanning chunks when the subject has no catalog document", async () => {
+    chunksGet.mockResolvedValue({
+      docs: [
+        {
+          data: () => ({
+            subject: "Science",
+            chapterId: "science-7-1",
+            chapterTitle: "Acids and Bases",
+            topicId: "1-1",
+            topicTitle: "Intro",
+            subtopicId: "1-1-1",
+            subtopicTitle: "Overview",
+            content: { title: "Overview of Acids" },
+          }),
+        },
+      ],
+    });
+
+    const catalog = await getCatalogFromDB("Science");
+
+    expect(chunksGet).toHaveBeenCalled();
+    expect(catalog.chapters).toEqual([
+      {
+        id: "science-7-1",
+        title: "Acids and Bases",
+        topics: [{ id: "1-1", title: "Intro", subtopics: [{ id: "1-1-1", title: "Overview of Acids" }] }],
+      },
+    ]);
+  });
+});
@@ -61,6 +61,9 @@ describe("/api/unittest/questions", () => {
     }>;
   };
 
+  let mockPoolDocs: Array<{ data: () => unknown }>;
+  let mockCatalogChapters: Record<string, unknown> | null;
+
   beforeEach(() => {
     getRequestUserIdMock.mockReset();
     getRequestUserIdMock.mockResolvedValue("student-1");
@@ -105,8 +108,29 @@ describe("/api/unittest/questions", () => {
       }),
     };
 
+    // No question pools by default, so the route scans curriculum_chunks.
+    mockPoolDocs = [];
+    const mockPoolQuery: Record<string, jest.Mock> = {};
+    mockPoolQuery.where = jest.fn().mockReturnValue(mockPoolQuery);
+    mockPoolQuery.select = jest.fn().mockReturnValue(mockPoolQuery);
+    mockPoolQuery.get = jest.fn(async () => ({ docs: mockPoolDocs }));
+    mockCatalogChapters = null;
+    const mockCatalog = {
+      doc: jest.fn().mockReturnValue({
+        get: jest.fn(async () => ({
+          exists: mockCatalogChapters !== null,
+          data: () => ({ chapters: mockCatalogChapters }),
+        })),
+      }),
+    };
     getFirestoreClientMock.mockReturnValue({
-      collection: jest.fn().mockReturnValue(mockCollection),
+      collection: jest.fn((name: string) =>
+        name === "curriculum_pools"
+          ? mockPoolQuery
+          : name === "curriculum_catalog"
+            ? mockCatalog
+            : mockCollection
+      ),
     } as unknown as ReturnType<typeof getFirestoreClient>);
   });
 
@@ -306,6 +330,55 @@ describe("/api/unittest/questions", () => {
     });
   });
 
+  describe("Question pools", () => {
+    it("reads pool samples without scanning chunks once every chapter has a pool", async () => {
+      mockPoolDocs = [
+        {
+          data: () => ({
+            chapterId: "ch1",
+            chapterTitle: "Introduction to Physics",
+            sample: { topicId: "t1", subtopicId: "st1", question: mockQuestion },
+          }),
+        },
+      ];
+      mockCatalogChapters = { ch1: {} };
+
+      const request = makeRequest("Science");
+      const response = await GET(request);
+      const data = await response.json();
+
+      expect(response.status).toBe(200);
+      expect(mockCollection.where).not.toHaveBeenCalled();
+      expect(data.questions).toEqual([
+        { chapterId: "ch1", chapterTitle: "Introduction to Physics", question: mockQuestion },
+      ]);
+    });
+
+    it("scans chunks for catalog chapters that have no pool yet", async () => {
+      const pooled = { ...mockQuestion, id: "p1", question: "Which quantity is a vector?" };
+      mockPoolDocs = [
+        {
+          data: () => ({
+            chapterId: "ch1",
+            chapterTitle: "Introduction to Physics",
+            sample: { topicId: "t1", subtopicId: "st1", question: pooled },
+          }),
+        },
+      ];
+      mockCatalogChapters = { ch1: {}, ch2: {} };
+
+      const request = makeRequest("Science");
+      const response = await GET(request);
+      const data = await response.json();
+
+      expect(response.status).toBe(200);
+      expect(mockCollection.where).toHaveBeenCalled();
+      expect(data.questions.map((q: { chapterId: string }) => q.chapterId)).toEqual(["ch1", "ch2"]);
+      expect(data.questions[0].question).toEqual(pooled);
+      expect(data.questions[1].question.id).toBe("q2");
+    });
+  });
+
   describe("Error handling", () => {
     it("returns error when Firestore fails", async () => {
       const mockCollectionError = {
@@ -1,6 +1,7 @@
 import { NextRequest, NextResponse } from "next/server";
 import { getFirestoreClient } from "@/lib/firebase-admin";
 import { isValidSubject } from "@/lib/api/shared";
+import { byChapterId, getPoolSamples } from "@/lib/curriculum-pools";
 import type { SubtopicKnowledge } from "@/lib/learning-types";
 
 interface Flashcard {
@@ -11,27 +12,50 @@ interface Flashcard {
   definition: string;
 }
 
-// GET /api/quick-revision/flashcards - fetch flashcards
-export async function GET(request: NextRequest) {
-  const subject = request.nextUrl.searchParams.get("subject");
-  if (!subject || !isValidSubject(subject)) {
-    return NextResponse.json(
-      { error: "Subject query param must be Science or Maths" },
-      { status: 400 }
-    );
+type CardSample = { id: string; term: string; definition: string };
+
+// Cards of one subtopic per chapter, like the old chunk scan took them.
+function chunkCards(chapterId: string, chapterTitle: string, content: SubtopicKnowledge): CardSample[] {
+  const cards: CardSample[] = [];
+
+  if (content.keyTerms && Object.keys(content.keyTerms).length > 0) {
+    for (const [term, definition] of Object.entries(content.keyTerms)) {
+      cards.push({ id: `${chapterId}-${term.toLowerCase().trim()}`, term, definition });
+    }
   }
 
-  try {
+  if (content.keyConcepts && content.keyConcepts.length > 0) {
+    for (const concept of content.keyConcepts) {
+      const conceptKey = concept.toLowerCase().trim().substring(0, 50);
+      cards.push({
+        id: `${chapterId}-concept-${conceptKey}`,
+        term: concept,
+        definition: `Learn more about ${concept} in the chapter ${chapterTitle}`,
+      });
+    }
+  }
+
+  return cards;
+}
+
+async function loadFlashcards(subject: string): Promise<Flashcard[]> {
+  // Chapter samples come from the flashcard pools where the seeder wrote
+  // them, otherwise from the first subtopic a chunk scan finds.
+  const { samples, complete } = await getPoolSamples<CardSample[]>(subject, "flashcards");
+  const byChapter = new Map<string, { chapterTitle: string; cards: CardSample[] }>();
+
+  for (const [chapterId, data] of samples) {
+    if (!data.chapterTitle) continue;
+    byChapter.set(chapterId, { chapterTitle: data.chapterTitle, cards: data.sample || [] });
+  }
+
+  if (!complete) {
     const db = getFirestoreClient();
     const snap = await db
       .collection("curriculum_chunks")
       .where("subject", "==", subject)
       .get();
 
-    const flashcards: Flashcard[] = [];
-    const seenTerms = new Set<string>();
-    const seenChapters = new Set<string>();
-
     for (const doc of snap.docs) {
       const data = doc.data() as { 
         chapterId: string; 
@@ -41,49 +65,49 @@ export async function GET(request: NextRequest) {
       const content = data.content;
 
       if (!content) continue;
-      if (seenChapters.has(data.chapterId)) continue;
+      if (samples.has(data.chapterId) || byChapter.has(data.chapterId)) continue;
 
       const chapterId = data.chapterId;
       const chapterTitle = data.chapterTitle;
 
       if (!chapterTitle) continue;
 
-      if (content.keyTerms && Object.keys(content.keyTerms).length > 0) {
-        for (const [term, definition] of Object.entries(content.keyTerms)) {
-          const termKey = term.toLowerCase().trim();
-          if (!seenTerms.has(termKey)) {
-            seenTerms.add(termKey);
-            flashcards.push({
-              id: `${chapterId}-${termKey}`,
-              chapterId,
-              chapterTitle,
-              term,
-              definition,
-            });
-          }
-        }
-      }
-
-      if (content.keyConcepts && content.keyConcepts.length > 0) {
-        for (const concept of content.keyConcepts) {
-          const conceptKey = concept.toLowerCase().trim().substring(0, 50);
-          if (!seenTerms.has(conceptKey)) {
-            seenTerms.add(conceptKey);
-            flashcards.push({
-              id: `${chapterId}-concept-${conceptKey}`,
-              chapterId,
-              chapterTitle,
-              term: concept,
-              definition: `Learn more about ${concept} in the chapter ${chapterTitle}`,
-            });
-          }
-        }
-      }
-
-      seenChapters.add(chapterId);
-      if (flashcards.length >= 10) break;
+      byChapter.set(chapterId, { chapterTitle, cards: chunkCards(chapterId, chapterTitle, content) });
+    }
+  }
+
+  const flashcards: Flashcard[] = [];
+  const seenTerms = new Set<string>();
+
+  for (const chapterId of Array.from(byChapter.keys()).sort(byChapterId)) {
+    const { chapterTitle, cards } = byChapter.get(chapterId) as { chapterTitle: string; cards: CardSample[] };
+    for (const card of cards) {
+      // Concept keys are truncated to 50 characters, term keys are not.
+      const termKey = card.id.startsWith(`${chapterId}-concept-`)
+        ? card.term.toLowerCase().trim().substring(0, 50)
+        : card.term.toLowerCase().trim();
+      if (seenTerms.has(termKey)) continue;
+      seenTerms.add(termKey);
+      flashcards.push({ id: card.id, chapterId, chapterTitle, term: card.term, definition: card.definition });
     }
+    if (flashcards.length >= 10) break;
+  }
+
+  return flashcards;
+}
 
+// GET /api/quick-revision/flashcards - fetch flashcards
+export async function GET(request: NextRequest) {
+  const subject = request.nextUrl.searchParams.get("subject");
+  if (!subject || !isValidSubject(subject)) {
+    return NextResponse.json(
+      { error: "Subject query param must be Science or Maths" },
+      { status: 400 }
+    );
+  }
+
+  try {
+    const flashcards = await loadFlashcards(subject);
     return NextResponse.json({ flashcards });
   } catch (err) {
     const details = err instanceof Error ? err.message : String(err);
@@ -2,6 +2,7 @@ import { NextRequest, NextResponse } from "next/server";
 import { getFirestoreClient } from "@/lib/firebase-admin";
 import { getRequestUserId, isValidSubject } from "@/lib/api/shared";
 import { withServerCache } from "@/lib/server-cache";
+import { byChapterId, getPoolSamples } from "@/lib/curriculum-pools";
 import type { QuestionItem, SubtopicKnowledge } from "@/lib/learning-types";
 
 interface QuestionData {
@@ -10,42 +11,53 @@ interface QuestionData {
   question: QuestionItem;
 }
 
+type QuestionSample = { topicId: string; subtopicId: string; question: QuestionItem };
+
 const fetchQuestionsFromDb = async (subject: string): Promise<QuestionData[]> => {
-  const db = getFirestoreClient();
-  const snap = await db
-    .collection("curriculum_chunks")
-    .where("subject", "==", subject)
-    .get();
-
-  const questions: QuestionData[] = [];
-  const seenChapters = new Set<string>();
-
-  for (const doc of snap.docs) {
-    const data = doc.data() as { chapterId: string; chapterTitle?: string; topicId: string; subtopicId: string; content?: SubtopicKnowledge };
-    const content = data.content;
-
-    if (!content?.questionBank) continue;
-    if (seenChapters.has(data.chapterId)) continue;
-
-    const chapterId = data.chapterId;
-    const chapterTitle = data.chapterTitle;
-
-    if (!chapterTitle) continue;
-
-    const mcq = content.questionBank.find((q: QuestionItem) => q.type === "mcq");
-    if (mcq) {
-      seenChapters.add(chapterId);
-      questions.push({
-        chapterId,
-        chapterTitle,
-        question: mcq,
-      });
-    }
+  // One MCQ per chapter: from the pool sample where the seeder wrote one,
+  // otherwise the first MCQ a chunk scan finds.
+  const { samples, complete } = await getPoolSamples<QuestionSample>(subject, "questions");
+  const byChapter = new Map<string, QuestionData>();
+
+  for (const [chapterId, data] of samples) {
+    if (!data.chapterTitle || !data.sample) continue;
+    byChapter.set(chapterId, { chapterId, chapterTitle: data.chapterTitle, question: data.sample.question });
+  }
+
+  if (!complete) {
+    const db = getFirestoreClient();
+    const snap = await db
+      .collection("curriculum_chunks")
+      .where("subject", "==", subject)
+      .get();
 
-    if (questions.length >= 5) break;
+    for (const doc of snap.docs) {
+      const data = doc.data() as { chapterId: string; chapterTitle?: string; topicId: string; subtopicId: string; content?: SubtopicKnowledge };
+      const content = data.content;
+
+      if (!content?.questionBank) continue;
+      if (samples.has(data.chapterId) || byChapter.has(data.chapterId)) continue;
+
+      const chapterId = data.chapterId;
+      const chapterTitle = data.chapterTitle;
+
+      if (!chapterTitle) continue;
+
+      const mcq = content.questionBank.find((q: QuestionItem) => q.type === "mcq");
+      if (mcq) {
+        byChapter.set(chapterId, {
+          chapterId,
+          chapterTitle,
+          question: mcq,
+        });
+      }
+    }
   }
 
-  return questions;
+  return Array.from(byChapter.keys())
+    .sort(byChapterId)
+    .slice(0, 5)
+    .map((chapterId) => byChapter.get(chapterId) as QuestionData);
 };
 
 const getCachedQuestions = withServerCache(
@@ -0,0 +1,51 @@
+/**
+ * Per-chapter samples from the seeder's curriculum_pools documents.
+ */
+
+import { getFirestoreClient } from "./firebase-admin";
+
+export type PoolKind = "questions" | "flashcards";
+
+export type ChapterSample<T> = {
+  chapterId: string;
+  chapterTitle?: string;
+  sample?: T | null;
+};
+
+export type PoolSamples<T> = {
+  samples: Map<string, ChapterSample<T>>;
+  // False while some catalog chapter has no pool yet; callers then scan
+  // curriculum_chunks for the chapters missing from samples.
+  complete: boolean;
+};
+
+// Reads only the sample field of each chapter's first pool part, never the pool items.
+export async function getPoolSamples<T>(subject: string, kind: PoolKind): Promise<PoolSamples<T>> {
+  const db = getFirestoreClient();
+  const snap = await db
+    .collection("curriculum_pools")
+    .where("subject", "==", subject)
+    .where("kind", "==", kind)
+    .where("part", "==", 0)
+    .select("chapterId", "chapterTitle", "sample")
+    .get();
+
+  const samples = new Map<string, ChapterSample<T>>();
+  for (const doc of snap.docs) {
+    const data = doc.data() as ChapterSample<T>;
+    if (data.chapterId) samples.set(data.chapterId, data);
+  }
+  if (samples.size === 0) return { samples, complete: false };
+
+  const catalogSnap = await db.collection("curriculum_catalog").doc(subject).get();
+  const catalog = catalogSnap.exists
+    ? (catalogSnap.data() as { chapters?: Record<string, unknown> } | undefined)
+    : undefined;
+  const complete = !!catalog && Object.keys(catalog.chapters || {}).every((id) => samples.has(id));
+  return { samples, complete };
+}
+
+// Chunk doc ids start with the chapter id, so a chunk scan visits chapters in this order.
+export function byChapterId(a: string, b: string): number {
+  return a < b ? -1 : a > b ? 1 : 0;
+}
@@ -17,6 +17,28 @@ type CurriculumChunkDoc = {
   content: SubtopicKnowledge;
 };
 
+// Per-subject catalog written by the seeder alongside curriculum_chunks.
+type CurriculumCatalogDoc = {
+  subject: SubjectName;
+  chapters?: Record<
+    string,
+    {
+      id: string;
+      title?: string;
+      topics?: { id: string; title?: string; subtopics?: { id: string; title?: string }[] }[];
+    }
+  >;
+};
+
+type CatalogRow = {
+  chapterId: string;
+  chapterTitle?: string;
+  topicId: string;
+  topicTitle?: string;
+  subtopicId: string;
+  subtopicTitle?: string;
+};
+
 // Deterministic doc ID shared by seed scripts and lookup.
 export function makeDocId(subject: string, chapterId: string, topicId: string, subtopicId: string): string {
   return `${subject}__${chapterId}__${topicId}__${subtopicId}`;
@@ -81,70 +103,108 @@ export async function getSubtopicFromDBCached(
   return getCachedSubtopic(subject, chapterId, topicId, subtopicId);
 }
 
+function buildCatalog(subj: SubjectName, rows: Iterable<CatalogRow>): CurriculumCatalog {
+  const chapterMap = new Map<
+    string,
+    {
+      chapter: ChapterSummary;
+      topicMap: Map<string, { id: string; title: string; subtopics: { id: string; title: string }[] }>;
+    }
+  >();
+
+  for (const row of rows) {
+    const { chapterId, topicId, subtopicId } = row;
+
+    if (!chapterId || !topicId || !subtopicId) continue;
+
+    const chapterTitle = isPlaceholderChapterTitle(row.chapterTitle)
+      ? humanizeId(chapterId)
+      : (row.chapterTitle as string);
+    const topicTitle = row.topicTitle || humanizeId(topicId);
+    const subtopicTitle = row.subtopicTitle || humanizeId(subtopicId);
+
+    let chapterEntry = chapterMap.get(chapterId);
+    if (!chapterEntry) {
+      chapterEntry = {
+        chapter: { id: chapterId, title: chapterTitle, topics: [] },
+        topicMap: new Map(),
+      };
+      chapterMap.set(chapterId, chapterEntry);
+    }
+
+    let topicEntry = chapterEntry.topicMap.get(topicId);
+    if (!topicEntry) {
+      topicEntry = { id: topicId, title: topicTitle, subtopics: [] };
+      chapterEntry.topicMap.set(topicId, topicEntry);
+      chapterEntry.chapter.topics.push(topicEntry);
+    }
+
+    if (!topicEntry.subtopics.some((subtopic) => subtopic.id === subtopicId)) {
+      topicEntry.subtopics.push({ id: subtopicId, title: subtopicTitle });
+    }
+  }
+
+  const chapters = Array.from(chapterMap.values()).map((entry) => ({
+    ...entry.chapter,
+    topics: entry.chapter.topics.map((topic) => ({
+      ...topic,
+      subtopics: [...topic.subtopics].sort((a, b) => a.title.localeCompare(b.title)),
+    })),
+  }));
+
+  chapters.sort((a, b) => a.title.localeCompare(b.title));
+  chapters.forEach((chapter) => chapter.topics.sort((a, b) => a.title.localeCompare(b.title)));
+
+  return { subject: subj, chapters };
+}
+
+function* catalogDocRows(data: CurriculumCatalogDoc): Generator<CatalogRow> {
+  for (const chapter of Object.values(data.chapters || {})) {
+    for (const topic of chapter.topics || []) {
+      for (const subtopic of topic.subtopics || []) {
+        yield {
+          chapterId: chapter.id,
+          chapterTitle: chapter.title,
+          topicId: topic.id,
+          topicTitle: topic.title,
+          subtopicId: subtopic.id,
+          subtopicTitle: subtopic.title,
+        };
+      }
+    }
+  }
+}
+
 // Cache catalog reads for one hour to reduce repeated Firestore queries.
 const getCachedCatalog = unstable_cache(
   async (subj: SubjectName): Promise<CurriculumCatalog> => {
     const db = getFirestoreClient();
+
+    // One small read of the seeder-maintained catalog.
+    const catalogSnap = await db.collection("curriculum_catalog").doc(subj).get();
+    const catalogDoc = catalogSnap.exists ? (catalogSnap.data() as CurriculumCatalogDoc | undefined) : undefined;
+    if (catalogDoc && Object.keys(catalogDoc.chapters || {}).length > 0) {
+      return buildCatalog(subj, catalogDocRows(catalogDoc));
+    }
+
+    // Subjects published before the catalog existed: scan the chunks.
     const snap = await db
       .collection("curriculum_chunks")
       .where("subject", "==", subj)
       .get();
 
-    const chapterMap = new Map<
-      string,
-      {
-        chapter: ChapterSummary;
-        topicMap: Map<string, { id: string; title: string; subtopics: { id: string; title: string }[] }>;
-      }
-    >();
-
-    for (const doc of snap.docs) {
+    const rows = snap.docs.map((doc) => {
       const data = doc.data() as CurriculumChunkDoc;
-      const chapterId = data.chapterId;
-      const topicId = data.topicId;
-      const subtopicId = data.subtopicId;
-
-      if (!chapterId || !topicId || !subtopicId) continue;
-
-      const chapterTitle = isPlaceholderChapterTitle(data.chapterTitle)
-        ? humanizeId(chapterId)
-        : (data.chapterTitle as string);
-      const topicTitle = data.topicTitle || humanizeId(topicId);
-      const subtopicTitle = data.content?.title || data.subtopicTitle || humanizeId(subtopicId);
-
-      let chapterEntry = chapterMap.get(chapterId);
-      if (!chapterEntry) {
-        chapterEntry = {
-          chapter: { id: chapterId, title: chapterTitle, topics: [] },
-          topicMap: new Map(),
-        };
-        chapterMap.set(chapterId, chapterEntry);
-      }
-
-      let topicEntry = chapterEntry.topicMap.get(topicId);
-      if (!topicEntry) {
-        topicEntry = { id: topicId, title: topicTitle, subtopics: [] };
-        chapterEntry.topicMap.set(topicId, topicEntry);
-        chapterEntry.chapter.topics.push(topicEntry);
-      }
-
-      if (!topicEntry.subtopics.some((subtopic) => subtopic.id === subtopicId)) {
-        topicEntry.subtopics.push({ id: subtopicId, title: subtopicTitle });
-      }
-    }
-
-    const chapters = Array.from(chapterMap.values()).map((entry) => ({
-      ...entry.chapter,
-      topics: entry.chapter.topics.map((topic) => ({
-        ...topic,
-        subtopics: [...topic.subtopics].sort((a, b) => a.title.localeCompare(b.title)),
-      })),
-    }));
-
-    chapters.sort((a, b) => a.title.localeCompare(b.title));
-    chapters.forEach((chapter) => chapter.topics.sort((a, b) => a.title.localeCompare(b.title)));
-
-    return { subject: subj, chapters };
+      return {
+        chapterId: data.chapterId,
+        chapterTitle: data.chapterTitle,
+        topicId: data.topicId,
+        topicTitle: data.topicTitle,
+        subtopicId: data.subtopicId,
+        subtopicTitle: data.content?.title || data.subtopicTitle,
+      };
+    });
+    return buildCatalog(subj, rows);
   },
   ["catalog"],
   { revalidate: 3600 }
@@ -0,0 +1,119 @@
+# Benchmark: offset-based chunker vs. the previous paragraph recounting chunker
+"""
+Compare chunker.chunk_text against the earlier paragraph-based implementation
+on synthetic chapter text of ~100k tokens.
+
+Usage (from scripts/ncert-seeder):
+    python benchmarks/bench_chunker.py [--tokens 100000] [--max-tokens 1500]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chunker import DEFAULT_ENCODING, chunk_text, count_tokens, get_encoder  # noqa: E402
+
+WORDS = (
+    "force friction surface motion energy heat light matter particles cell "
+    "tissue organism acid base salt reaction current circuit magnet field "
+    "pressure temperature water air soil plant animal the of and to is in"
+).split()
+
+
+def legacy_count_tokens(text: str) -> int:
+    """Previous per-call counting (encoder reused so only the algorithm differs)."""
+    enc = get_encoder(DEFAULT_ENCODING)
+    if enc is None:
+        return len(text) // 4
+    return len(enc.encode(text))
+
+
+def legacy_chunk_text(text: str, max_tokens: int = 1500, overlap: int = 100) -> List[str]:
+    """Paragraph splitter that re-tokenizes every paragraph and overlap window."""
+    if not text:
+        return []
+    if legacy_count_tokens(text) <= max_tokens:
+        return [text]
+
+    paragraphs = text.split("\n\n")
+    chunks = []
+    current_chunk = []
+    current_tokens = 0
+
+    for para in paragraphs:
+        para_tokens = legacy_count_tokens(para)
+        if current_tokens + para_tokens > max_tokens and current_chunk:
+            chunks.append("\n\n".join(current_chunk))
+            if overlap > 0 and len(current_chunk) > 1:
+                overlap_text = "\n\n".join(current_chunk[-2:])
+                overlap_tokens = legacy_count_tokens(overlap_text)
+                if overlap_tokens < overlap:
+                    current_chunk = [overlap_text]
+                    current_tokens = overlap_tokens
+                else:
+                    current_chunk = []
+                    current_tokens = 0
+            else:
+                current_chunk = []
+                current_tokens = 0
+        current_chunk.append(para)
+        current_tokens += para_tokens
+
+    if current_chunk:
+        chunks.append("\n\n".join(current_chunk))
+    return chunks
+
+
+def make_text(target_tokens: int, seed: int = 7) -> str:
+    """Build chapter-like text: paragraphs of sentences, roughly target_tokens long."""
+    rng = random.Random(seed)
+    paragraphs = []
+    approx = 0
+    while approx < target_tokens:
+        sentences = []
+        for _ in range(rng.randint(2, 9)):
+            words = [rng.choice(WORDS) for _ in range(rng.randint(6, 24))]
+            sentences.append(" ".join(words).capitalize() + ".")
+        paragraph = " ".join(sentences)
+        paragraphs.append(paragraph)
+        approx += len(paragraph) // 4
+    return "\n\n".join(paragraphs)
+
+
+def timed(fn, *args, repeat: int = 3):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=100_000)
+    parser.add_argument("--max-tokens", type=int, default=1500)
+    parser.add_argument("--overlap", type=int, default=100)
+    args = parser.parse_args()
+
+    counter = DEFAULT_ENCODING if get_encoder() else "len/4 fallback (encoder unavailable)"
+    text = make_text(args.tokens)
+    print(f"Input: {len(text):,} chars, ~{count_tokens(text):,} tokens [{counter}]")
+
+    legacy_time, legacy_chunks = timed(legacy_chunk_text, text, args.max_tokens, args.overlap)
+    new_time, new_chunks = timed(chunk_text, text, args.max_tokens, args.overlap)
+
+    legacy_max = max(legacy_count_tokens(c) for c in legacy_chunks)
+    new_max = max(count_tokens(c) for c in new_chunks)
+    print(f"legacy chunk_text: {legacy_time * 1000:8.1f} ms  {len(legacy_chunks)} chunks, max {legacy_max} tokens")
+    print(f"offset chunk_text: {new_time * 1000:8.1f} ms  {len(new_chunks)} chunks, max {new_max} tokens")
+    print(f"speedup: {legacy_time / new_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# Benchmark: reading order from the gutter segmenter vs. the two-bucket heuristic
+"""
+Build pages with one, two and three columns and full-width blocks between
+them. Every block is labelled with its true reading position, so the script
+can score the previous two-bucket ordering against _reading_order, and it
+times both per page.
+
+Usage (from scripts/ncert-seeder):
+    python benchmarks/bench_columns.py [--pages 300]
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import fitz  # noqa: E402
+
+from extractor import _extract_blocks_with_layout, _reading_order, ExtractedPage  # noqa: E402
+
+WORDS = "force friction surface motion energy heat light matter cell tissue".split()
+WIDTH, HEIGHT, MARGIN = 595, 842, 50
+
+
+def _paragraph(rng: random.Random, chars: int) -> str:
+    words = []
+    while sum(len(w) + 1 for w in words) < chars:
+        words.append(rng.choice(WORDS))
+    return " ".join(words)
+
+
+def make_column_pdf(path: Path, pages: int, seed: int = 5) -> Path:
+    """Pages cycle through 1, 2 and 3 columns with spanning bands in between."""
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for pno in range(pages):
+        page = doc.new_page(width=WIDTH, height=HEIGHT)
+        columns = pno % 3 + 1
+        gutter = 24
+        col_width = (WIDTH - 2 * MARGIN - gutter * (columns - 1)) / columns
+        label = 0
+        y = 80
+        for band in range(2):
+            title = fitz.Rect(MARGIN, y, WIDTH - MARGIN, y + 30)
+            page.insert_textbox(title, f"[{label}] Spanning title {_paragraph(rng, 60)}", fontsize=11)
+            label += 1
+            y += 40
+            for col in range(columns):
+                x = MARGIN + col * (col_width + gutter)
+                cy = y
+                for _ in range(3):
+                    rect = fitz.Rect(x, cy, x + col_width, cy + 70)
+                    page.insert_textbox(rect, f"[{label}] {_paragraph(rng, 120)}", fontsize=9)
+                    label += 1
+                    cy += 80
+            y += 250
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def legacy_order(page: ExtractedPage) -> list:
+    """The previous ordering: two buckets split at 45%/55% of the width."""
+    blocks = page.blocks
+    width = page.width
+    left = [b for b in blocks if b.x0 < width * 0.45]
+    right = [b for b in blocks if b.x0 > width * 0.55]
+    if len(left) >= 3 and len(right) >= 3:
+        mid = width / 2.0
+        blocks.sort(key=lambda b: (0 if b.x0 < mid else 1, b.y0))
+    else:
+        blocks.sort(key=lambda b: (b.y0, b.x0))
+    return [b.text for b in blocks]
+
+
+def labels(texts: list) -> list:
+    return [int(t[1:t.index("]")]) for t in texts]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=300)
+    args = parser.parse_args()
+
+    pdf_path = make_column_pdf(Path(tempfile.mkdtemp()) / "columns.pdf", args.pages)
+    pages = []
+    with fitz.open(pdf_path) as doc:
+        for fitz_page in doc:
+            blocks = _extract_blocks_with_layout(fitz_page)
+            pages.append(ExtractedPage(
+                fitz_page.number + 1, fitz_page.rect.width, fitz_page.rect.height, blocks
+            ))
+
+    start = time.perf_counter()
+    legacy = [legacy_order(p) for p in pages]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    orders = [_reading_order(p) for p in pages]
+    new_time = time.perf_counter() - start
+    segmented = [[p.block_texts()[i] for i in order] for p, order in zip(pages, orders)]
+
+    for name, result in (("two-bucket", legacy), ("gutters", segmented)):
+        by_columns = {1: [0, 0], 2: [0, 0], 3: [0, 0]}
+        for pno, texts in enumerate(result):
+            found = labels(texts)
+            tally = by_columns[pno % 3 + 1]
+            tally[0] += found == sorted(found)
+            tally[1] += 1
+        summary = ", ".join(f"{c} col {ok}/{n}" for c, (ok, n) in by_columns.items())
+        print(f"{name:<11} pages in correct order: {summary}")
+    print(f"ordering time: two-bucket {legacy_time * 1e3:.1f} ms, gutters {new_time * 1e3:.1f} ms "
+          f"({len(pages)} pages)")
+
+
+if __name__ == "__main__":
+    main()
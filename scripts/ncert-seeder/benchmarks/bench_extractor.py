@@ -0,0 +1,57 @@
+# Benchmark: serial vs. process-pool PDF extraction
+"""
+Time extract_pdf serially and with a process pool, and check the outputs match.
+
+Usage (from scripts/ncert-seeder):
+    python benchmarks/bench_extractor.py [path/to/book.pdf] [--workers 4]
+Without a PDF path a 300-page synthetic chapter is generated.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from extractor import extract_pdf  # noqa: E402
+from sample_pdf import make_sample_pdf  # noqa: E402
+
+
+def page_signature(extracted) -> list:
+    return [
+        (p.page_num, p.width, p.height, p.raw_text,
+         [(b.text, b.x0, b.y0, b.x1, b.y1, b.font_size, b.font_name, b.is_bold) for b in p.blocks])
+        for p in extracted.pages
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("pdf", nargs="?", help="PDF to extract (default: synthetic)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    if args.pdf:
+        pdf_path = Path(args.pdf)
+    else:
+        pdf_path = make_sample_pdf(Path(tempfile.mkdtemp()) / "sample.pdf")
+
+    start = time.perf_counter()
+    serial = extract_pdf(pdf_path)
+    serial_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel = extract_pdf(pdf_path, workers=args.workers)
+    parallel_time = time.perf_counter() - start
+
+    print(f"PDF: {pdf_path.name}, {len(serial.pages)} pages, {os.cpu_count()} CPUs")
+    print(f"serial:              {serial_time:6.2f} s")
+    print(f"workers={args.workers:<2}          {parallel_time:6.2f} s")
+    print(f"speedup: {serial_time / parallel_time:.2f}x")
+    print(f"identical output: {page_signature(serial) == page_signature(parallel)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+# Benchmark: compiled heading classifier vs. the previous per-block checks
+"""
+Times detector._classify_heading against the per-block checks it replaced
+(_is_header_line, two _parse_numeric_heading calls and the findall-based
+table/single-word filters, kept below) over a document of at least 10k
+blocks, and checks that both give the same heading decision for every block
+and for randomized heading-like inputs.
+
+Usage (from scripts/ncert-seeder):
+    python benchmarks/bench_headings.py [path/to/book.pdf] [--blocks 10000] [--fuzz 200000]
+Without a PDF path a 300-page synthetic chapter is generated.
+"""
+import argparse
+import random
+import re
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from typing import Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from detector import (  # noqa: E402
+    _classify_heading,
+    _detect_font_threshold,
+    _is_table_like_heading,
+    detect_structure,
+)
+from extractor import extract_pdf  # noqa: E402
+from sample_pdf import make_sample_pdf  # noqa: E402
+
+
+def legacy_parse_numeric_heading(text: str) -> Tuple[int, str]:
+    match = re.match(r"^(\d+(?:\.\d+){1,4})\b", text.strip())
+    if not match:
+        return 0, ""
+    prefix = match.group(1)
+    return len(prefix.split(".")), prefix
+
+
+def legacy_is_non_topic_heading(text: str) -> bool:
+    normalized = text.strip().lower()
+    skip_prefixes = (
+        "activity ",
+        "table ",
+        "fig.",
+        "figure ",
+        "science and society",
+        "know a scientist",
+        "in a nutshell",
+        "let us enhance our learning",
+        "exploratory projects",
+    )
+    return any(normalized.startswith(prefix) for prefix in skip_prefixes)
+
+
+def legacy_is_header_line(text: str, font_size: float, is_bold: bool,
+                          threshold: float) -> Tuple[bool, str]:
+    text = text.strip()
+    if not text:
+        return False, ""
+    if not re.search(r"[A-Za-z0-9]", text):
+        return False, ""
+    if legacy_is_non_topic_heading(text):
+        return False, ""
+    chapter_patterns = [
+        r"^(chapter|unit)\s+(\d+|[ivxlcdm]+)",
+        r"^(\d+)\s+(chapter|unit)",
+        r"^chapter\s+\d+\s*[:\.]",
+    ]
+    for pattern in chapter_patterns:
+        if re.match(pattern, text, re.IGNORECASE):
+            return True, "chapter"
+    level, _ = legacy_parse_numeric_heading(text)
+    if level == 2:
+        return True, "topic"
+    if level >= 3:
+        return True, "subtopic"
+    is_large = font_size > threshold or is_bold
+    if is_large and len(text) < 90 and not text.endswith("."):
+        return True, "topic"
+    return False, ""
+
+
+def legacy_is_table_like_heading(text: str) -> bool:
+    level, _ = legacy_parse_numeric_heading(text)
+    if level > 0:
+        return False
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    if len(lines) < 2:
+        return False
+    return all(len(re.findall(r"[A-Za-z]+", line)) <= 4 for line in lines)
+
+
+def legacy_decide(text: str, font_size: float, is_bold: bool, threshold: float,
+                  saw_numeric_topic: bool) -> Tuple[str, int, str]:
+    """Heading decision as the old _StructureBuilder.feed made it."""
+    _, header_type = legacy_is_header_line(text, font_size, is_bold, threshold)
+    level, prefix = legacy_parse_numeric_heading(text)
+    if header_type == "topic":
+        if saw_numeric_topic and level == 0:
+            header_type = ""
+        if legacy_is_table_like_heading(text):
+            header_type = ""
+        alpha_words = re.findall(r"[A-Za-z]+", text)
+        if saw_numeric_topic and level == 0 and len(alpha_words) <= 1:
+            header_type = ""
+    if not header_type:
+        return "", 0, ""
+    return header_type, level, prefix
+
+
+def decide(text: str, font_size: float, is_bold: bool, threshold: float,
+           saw_numeric_topic: bool) -> Tuple[str, int, str]:
+    """Heading decision as _StructureBuilder.feed now makes it."""
+    header_type, level, prefix = _classify_heading(text, font_size, is_bold, threshold)
+    if header_type == "topic" and level == 0:
+        if saw_numeric_topic or _is_table_like_heading(text):
+            header_type = ""
+    if not header_type:
+        return "", 0, ""
+    return header_type, level, prefix
+
+
+FUZZ_TOKENS = (
+    ["Chapter", "chapter", "CHAPTER", "Unit", "unit", "IV", "xii", "6", "12", "6.1", "6.4.2",
+     "1.2.3.4.5.6", ".", ":", " ", "  ", "\n", "\t", "-", "Activity ", "Table ", "Fig.",
+     "Figure ", "In a nutshell", "Know a Scientist", "activity", "friction", "force and",
+     "a", "b c", "7", "–", "(", ")", "é"]
+)
+
+
+def fuzz_block(rng: random.Random) -> tuple:
+    text = "".join(rng.choice(FUZZ_TOKENS) for _ in range(rng.randint(0, 10)))
+    return text, rng.choice((9.0, 11.0, 12.0, 14.0, 20.0)), rng.random() < 0.3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("pdf", nargs="?", help="PDF to take blocks from (default: synthetic)")
+    parser.add_argument("--blocks", type=int, default=10_000, help="Minimum blocks per document")
+    parser.add_argument("--fuzz", type=int, default=200_000, help="Randomized parity cases")
+    args = parser.parse_args()
+
+    if args.pdf:
+        pdf_path = Path(args.pdf)
+    else:
+        pdf_path = make_sample_pdf(Path(tempfile.mkdtemp()) / "sample.pdf")
+
+    extracted = extract_pdf(pdf_path)
+    threshold = _detect_font_threshold(extracted.pages)
+    blocks = [
+        (text, size, bold)
+        for page in extracted.pages
+        for text, size, bold in zip(
+            page.block_texts(), page.font_size.tolist(), page.table["is_bold"].tolist()
+        )
+    ]
+    # Repeat the book's blocks until the document is large enough.
+    repeats = -(-args.blocks // max(len(blocks), 1))
+    document = blocks * repeats
+
+    ok = True
+    for saw_numeric_topic in (False, True):
+        old = [legacy_decide(*b, threshold, saw_numeric_topic) for b in document]
+        new = [decide(*b, threshold, saw_numeric_topic) for b in document]
+        same = old == new
+        old_time = min(timeit.repeat(
+            lambda: [legacy_decide(*b, threshold, saw_numeric_topic) for b in document],
+            number=1, repeat=5,
+        ))
+        new_time = min(timeit.repeat(
+            lambda: [decide(*b, threshold, saw_numeric_topic) for b in document],
+            number=1, repeat=5,
+        ))
+        print(f"{len(document)} blocks, numbered flow={saw_numeric_topic!s:<5}  "
+              f"{old_time * 1e3:7.1f} ms -> {new_time * 1e3:6.1f} ms "
+              f"({old_time / new_time:4.1f}x)  identical: {same}")
+        ok &= same
+
+    detect_time = min(timeit.repeat(lambda: detect_structure(extracted), number=1, repeat=5))
+    print(f"detect_structure over {len(extracted.pages)} pages: {detect_time * 1e3:.1f} ms")
+
+    rng = random.Random(18)
+    mismatches = 0
+    for _ in range(args.fuzz):
+        block = fuzz_block(rng)
+        for saw_numeric_topic in (False, True):
+            mismatches += decide(*block, 12.0, saw_numeric_topic) != legacy_decide(
+                *block, 12.0, saw_numeric_topic
+            )
+    print(f"fuzz parity: {args.fuzz} inputs, {mismatches} mismatches")
+    ok &= mismatches == 0
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# Benchmark: layout extraction with and without image payloads
+"""
+Time and measure peak allocation of the layout pass with PyMuPDF's default
+dict flags (images decoded) versus LAYOUT_TEXT_FLAGS, and check blocks match.
+
+Usage (from scripts/ncert-seeder):
+    python benchmarks/bench_layout_flags.py [path/to/book.pdf]
+Without a PDF path a 300-page synthetic chapter with a figure on every other page is generated.
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import fitz  # noqa: E402
+
+import extractor  # noqa: E402
+from sample_pdf import make_sample_pdf  # noqa: E402
+
+
+def run(pdf_path: Path, flags: int) -> tuple:
+    """Return (seconds, peak bytes per page, block signature) for one flag set."""
+    extractor.LAYOUT_TEXT_FLAGS = flags
+    signature = []
+    peak = 0
+    elapsed = 0.0
+    with fitz.open(pdf_path) as doc:
+        for page in doc:
+            tracemalloc.start()
+            start = time.perf_counter()
+            blocks = extractor._extract_blocks_with_layout(page)
+            elapsed += time.perf_counter() - start
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            signature.append([(b.text, b.x0, b.y0, b.x1, b.y1, b.font_size, b.font_name) for b in blocks])
+    return elapsed, peak, signature
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("pdf", nargs="?", help="PDF to extract (default: synthetic)")
+    args = parser.parse_args()
+
+    if args.pdf:
+        pdf_path = Path(args.pdf)
+    else:
+        pdf_path = make_sample_pdf(Path(tempfile.mkdtemp()) / "sample.pdf")
+
+    text_flags = extractor.LAYOUT_TEXT_FLAGS
+    default_time, default_peak, default_sig = run(pdf_path, fitz.TEXTFLAGS_DICT)
+    text_time, text_peak, text_sig = run(pdf_path, text_flags)
+    extractor.LAYOUT_TEXT_FLAGS = text_flags
+
+    print(f"PDF: {pdf_path.name}, {len(default_sig)} pages")
+    print(f"default flags:  {default_time:6.2f} s, peak {default_peak / 1024:9.1f} KiB/page")
+    print(f"text-only:      {text_time:6.2f} s, peak {text_peak / 1024:9.1f} KiB/page")
+    print(f"speedup: {default_time / text_time:.2f}x, peak memory: {default_peak / max(text_peak, 1):.1f}x lower")
+    print(f"identical blocks: {default_sig == text_sig}")
+
+    start = time.perf_counter()
+    figures = extractor.extract_figure_index(pdf_path)
+    print(f"figure index:   {time.perf_counter() - start:6.2f} s, {len(figures)} figures, "
+          f"{sum(1 for f in figures if f.caption)} captioned")
+
+
+if __name__ == "__main__":
+    main()
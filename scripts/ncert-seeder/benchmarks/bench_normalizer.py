@@ -0,0 +1,153 @@
+# Benchmark: normalizer engine vs. the previous multi-pass cleaners
+"""
+Micro-benchmarks for normalizer.py against the multi-pass functions it
+replaced (kept below), plus byte-identical parity checks on extracted text
+and on randomized inputs built from the characters the rules react to.
+
+Usage (from scripts/ncert-seeder):
+    python benchmarks/bench_normalizer.py [path/to/book.pdf] [--fuzz 200000]
+Without a PDF path a 300-page synthetic chapter is generated.
+"""
+import argparse
+import random
+import re
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import fitz  # noqa: E402
+
+from extractor import LAYOUT_TEXT_FLAGS  # noqa: E402
+from normalizer import (  # noqa: E402
+    clean_content_text,
+    merge_hyphenated_lines,
+    normalize_text,
+    tighten_math_line,
+)
+from sample_pdf import make_sample_pdf  # noqa: E402
+
+
+def legacy_normalize_text(text: str) -> str:
+    if not text:
+        return ""
+    text = text.replace(" ", " ")
+    text = text.replace(" ", " ")
+    text = text.replace("‑", "-")
+    text = re.sub(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]", "", text)
+    return text
+
+
+def legacy_merge_hyphenated_lines(lines: List[str]) -> str:
+    if not lines:
+        return ""
+    merged = []
+    i = 0
+    while i < len(lines):
+        line = legacy_normalize_text(lines[i])
+        if line.endswith("-") and i + 1 < len(lines):
+            next_line = legacy_normalize_text(lines[i + 1]).lstrip()
+            if next_line and next_line[0].islower():
+                merged.append(line[:-1] + next_line)
+                i += 2
+                continue
+        merged.append(line)
+        i += 1
+    return "\n".join(merged)
+
+
+def legacy_tighten_math_line(line: str) -> str:
+    if not re.search(r"[=<>±×÷*/^]", line):
+        return line
+    line = re.sub(r"\s+([,.;:%])", r"\1", line)
+    line = re.sub(r"([(\[{])\s+", r"\1", line)
+    line = re.sub(r"\s+([)\]}])", r"\1", line)
+    line = re.sub(r"(?<=\w)\s*([=<>±×÷*/^])\s*(?=\w)", r"\1", line)
+    line = re.sub(r"(?<=\d)\s*/\s*(?=\d)", r"/", line)
+    return line
+
+
+def legacy_clean_content_text(text: str) -> str:
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = re.sub(r" {2,}", " ", text)
+    for pattern in (r"fig\.\s*\d+", r"figure\s*\d+", r"page\s*\d+"):
+        text = re.sub(pattern, "", text, flags=re.IGNORECASE)
+    return text.strip()
+
+
+FUZZ_ALPHABET = (
+    list("ab x1 2 ") + list("=<>±×÷*/^") + list("()[]{},.;:%") + ["\n", "\t", "  "]
+    + [" ", " ", "‑", "\x01", "\x0b", "\x7f", "-"]
+    + ["fig.", "Fig. ", "figure", "page ", "pa", "ge", "3", "12"]
+    + ["FIG.", "PaGe", "FIGURE", "f", "i", "\u0130", "\u0131", "\u212a", "\u0660"]
+)
+
+
+def fuzz_text(rng: random.Random) -> str:
+    return "".join(rng.choice(FUZZ_ALPHABET) for _ in range(rng.randint(0, 24)))
+
+
+def corpus(pdf_path: Path) -> tuple:
+    """Spans, block line lists and math-looking lines from a PDF."""
+    spans, blocks, lines = [], [], []
+    with fitz.open(pdf_path) as doc:
+        for page in doc:
+            for b in page.get_text("dict", flags=LAYOUT_TEXT_FLAGS)["blocks"]:
+                block_lines = []
+                for line in b.get("lines", []):
+                    texts = [s["text"] for s in line["spans"]]
+                    spans.extend(texts)
+                    block_lines.append(normalize_text("".join(texts)).strip())
+                blocks.append(block_lines)
+            lines.extend(page.get_text("text").split("\n"))
+    return spans, blocks, lines
+
+
+def compare(name: str, new, old, inputs: list, number: int = 3) -> bool:
+    same = all(new(x) == old(x) for x in inputs)
+    old_time = min(timeit.repeat(lambda: [old(x) for x in inputs], number=1, repeat=number))
+    new_time = min(timeit.repeat(lambda: [new(x) for x in inputs], number=1, repeat=number))
+    print(f"{name:<24} {len(inputs):>7} inputs  {old_time * 1e3:8.1f} ms -> {new_time * 1e3:7.1f} ms "
+          f"({old_time / new_time:4.1f}x)  identical: {same}")
+    return same
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("pdf", nargs="?", help="PDF to sample text from (default: synthetic)")
+    parser.add_argument("--fuzz", type=int, default=200_000, help="Randomized parity cases")
+    args = parser.parse_args()
+
+    if args.pdf:
+        pdf_path = Path(args.pdf)
+    else:
+        pdf_path = make_sample_pdf(Path(tempfile.mkdtemp()) / "sample.pdf")
+
+    spans, blocks, lines = corpus(pdf_path)
+    contents = ["\n\n".join("\n".join(b) for b in blocks[i:i + 40]) for i in range(0, len(blocks), 40)]
+
+    print(f"PDF: {pdf_path.name}")
+    ok = compare("normalize_text", normalize_text, legacy_normalize_text, spans)
+    ok &= compare("merge_hyphenated_lines", merge_hyphenated_lines, legacy_merge_hyphenated_lines, blocks)
+    ok &= compare("tighten_math_line", tighten_math_line, legacy_tighten_math_line, lines)
+    ok &= compare("clean_content_text", clean_content_text, legacy_clean_content_text, contents)
+
+    rng = random.Random(17)
+    cases = [fuzz_text(rng) for _ in range(args.fuzz)]
+    mismatches = 0
+    for text in cases:
+        mismatches += normalize_text(text) != legacy_normalize_text(text)
+        mismatches += tighten_math_line(text) != legacy_tighten_math_line(text)
+        mismatches += clean_content_text(text) != legacy_clean_content_text(text)
+        normalized = [normalize_text(part) for part in text.split("\n")]
+        mismatches += merge_hyphenated_lines(normalized) != legacy_merge_hyphenated_lines(normalized)
+    print(f"fuzz parity: {len(cases)} inputs, {mismatches} mismatches")
+    ok &= mismatches == 0
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
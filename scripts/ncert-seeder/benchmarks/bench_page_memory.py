@@ -0,0 +1,120 @@
+# Benchmark: memory held by extracted pages, columnar vs. per-block objects
+"""
+Measure memory retained by a full extract_pdf result with the columnar
+ExtractedPage, against the previous layout (one dataclass per block, no
+__slots__, raw_text stored beside every block's text) built from the same data.
+
+Usage (from scripts/ncert-seeder):
+    python benchmarks/bench_page_memory.py [path/to/book.pdf]
+Without a PDF path a 300-page synthetic chapter is generated.
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from detector import _detect_font_threshold  # noqa: E402
+from extractor import extract_pdf  # noqa: E402
+from sample_pdf import make_sample_pdf  # noqa: E402
+
+
+@dataclass
+class LegacyTextBlock:
+    text: str
+    x0: float
+    y0: float
+    x1: float
+    y1: float
+    font_size: float
+    font_name: str
+    is_bold: bool = False
+    page_num: int = 0
+
+
+@dataclass
+class LegacyPage:
+    page_num: int
+    width: float
+    height: float
+    blocks: List[LegacyTextBlock] = field(default_factory=list)
+    raw_text: str = ""
+
+
+def legacy_pages(pages) -> list:
+    """Rebuild the old representation with fresh objects, as PyMuPDF would hand them over."""
+    result = []
+    for page in pages:
+        blocks = [
+            LegacyTextBlock(
+                "".join(b.text), float(b.x0), float(b.y0), float(b.x1), float(b.y1),
+                float(b.font_size), "".join(b.font_name), b.is_bold, page.page_num,
+            )
+            for b in page.blocks
+        ]
+        raw_text = "\n\n".join(b.text for b in blocks) if blocks else page.raw_text
+        result.append(LegacyPage(page.page_num, page.width, page.height, blocks, "".join(raw_text)))
+    return result
+
+
+def legacy_threshold(pages) -> float:
+    sizes = sorted({b.font_size for p in pages for b in p.blocks if b.font_size > 0}, reverse=True)
+    if len(sizes) >= 3:
+        return sizes[2]
+    if len(sizes) >= 2:
+        return sizes[1]
+    return sizes[0] * 1.2 if sizes else 12.0
+
+
+def retained(build) -> tuple:
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("pdf", nargs="?", help="PDF to extract (default: synthetic)")
+    args = parser.parse_args()
+
+    if args.pdf:
+        pdf_path = Path(args.pdf)
+    else:
+        pdf_path = make_sample_pdf(Path(tempfile.mkdtemp()) / "sample.pdf")
+
+    extracted, columnar_bytes = retained(lambda: extract_pdf(pdf_path))
+    legacy, legacy_bytes = retained(lambda: legacy_pages(extracted.pages))
+    block_count = sum(p.block_count for p in extracted.pages)
+    text_bytes = sum(len(p.raw_text) for p in extracted.pages)
+
+    print(f"PDF: {pdf_path.name}, {len(extracted.pages)} pages, {block_count} blocks, "
+          f"{text_bytes / 1024:.0f} KiB text")
+    print(f"per-block objects: {legacy_bytes / 1024:8.0f} KiB")
+    print(f"columnar:          {columnar_bytes / 1024:8.0f} KiB "
+          f"({legacy_bytes / columnar_bytes:.1f}x smaller)")
+    non_text = columnar_bytes - text_bytes
+    legacy_non_text = legacy_bytes - 2 * text_bytes
+    print(f"excluding text:    {legacy_non_text / 1024:8.0f} KiB -> {non_text / 1024:.0f} KiB "
+          f"({legacy_non_text / max(non_text, 1):.1f}x smaller)")
+
+    start = time.perf_counter()
+    for _ in range(20):
+        old = legacy_threshold(legacy)
+    legacy_time = (time.perf_counter() - start) / 20
+    start = time.perf_counter()
+    for _ in range(20):
+        new = _detect_font_threshold(extracted.pages)
+    columnar_time = (time.perf_counter() - start) / 20
+    print(f"font threshold:    {legacy_time * 1000:.2f} ms -> {columnar_time * 1000:.2f} ms, "
+          f"same value: {old == new}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Benchmark: full span-level extraction vs. tiered extraction
+"""
+Time extract_pdf with and without tiered=True and check that detected
+subtopics (and block text) are identical.
+
+Usage (from scripts/ncert-seeder):
+    python benchmarks/bench_tiered.py [path/to/book.pdf ...]
+Without PDF paths three synthetic chapters are generated: the default
+math-dense one (a heading and formula on every page), a prose-heavy one and
+one with printed-textbook layout (wrapped paragraphs, mixed font sizes).
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from detector import extract_all_subtopics  # noqa: E402
+from extractor import extract_pdf  # noqa: E402
+from sample_pdf import make_sample_pdf, make_textbook_pdf  # noqa: E402
+
+
+def best_of(runs: int, fn):
+    best = None
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("pdfs", nargs="*", help="PDFs to extract (default: synthetic)")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.pdfs:
+        pdf_paths = [Path(p) for p in args.pdfs]
+    else:
+        tmp = Path(tempfile.mkdtemp())
+        pdf_paths = [
+            make_sample_pdf(tmp / "math_dense.pdf", figures=False),
+            make_sample_pdf(tmp / "prose.pdf", figures=False, math_lines=False, subtopic_every=3),
+            make_textbook_pdf(tmp / "textbook.pdf", pages=300),
+        ]
+
+    for pdf_path in pdf_paths:
+        full_time, full = best_of(args.runs, lambda: extract_pdf(pdf_path))
+        tiered_time, tiered = best_of(args.runs, lambda: extract_pdf(pdf_path, tiered=True))
+        same_subtopics = extract_all_subtopics(full) == extract_all_subtopics(tiered)
+        same_text = [p.raw_text for p in full.pages] == [p.raw_text for p in tiered.pages]
+
+        print(f"PDF: {pdf_path.name}, {len(full.pages)} pages")
+        print(f"  span-level: {full_time:6.2f} s")
+        print(f"  tiered:     {tiered_time:6.2f} s ({full_time / tiered_time:.2f}x)")
+        print(f"  identical subtopics: {same_subtopics}, identical text: {same_text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# Synthetic NCERT-style PDF for extractor benchmarks
+"""
+Build a chapter-like PDF with numbered headings, body text, math lines,
+running headers/footers and figures, for benchmarks when no real book is at hand.
+"""
+import random
+from pathlib import Path
+
+import fitz
+
+WORDS = (
+    "force friction surface motion energy heat light matter particles cell "
+    "tissue organism acid base salt reaction current circuit magnet field"
+).split()
+
+
+def make_sample_pdf(
+    path: Path,
+    pages: int = 300,
+    figures: bool = True,
+    seed: int = 3,
+    math_lines: bool = True,
+    subtopic_every: int = 1,
+    outline: bool = False,
+) -> Path:
+    """
+    Write a synthetic chapter PDF to path and return it.
+    math_lines=False and subtopic_every > 1 give prose-heavy pages.
+    outline=True embeds a chapter/topic/subtopic outline pointing at the headings.
+    """
+    rng = random.Random(seed)
+    doc = fitz.open()
+    subtopic = 1
+    toc = []
+
+    def bookmark(depth: int, title: str, pno: int, y: float) -> None:
+        toc.append([depth, title, pno + 1, {"kind": fitz.LINK_GOTO, "page": pno, "to": fitz.Point(50, y)}])
+
+    for pno in range(pages):
+        page = doc.new_page(width=595, height=842)
+        page.insert_text((50, 40), "Reprint 2024-25", fontsize=8)
+        page.insert_text((280, 820), str(pno + 1), fontsize=9)
+        y = 90
+        if pno == 0:
+            page.insert_text((50, y), "Chapter 6", fontsize=20, fontname="hebo")
+            bookmark(1, "Chapter 6", pno, y - 20)
+            y += 30
+        topic = pno // 5 + 1
+        if pno % 5 == 0:
+            page.insert_text((50, y), f"6.{topic} Topic number {topic}", fontsize=14, fontname="hebo")
+            bookmark(2, f"6.{topic} Topic number {topic}", pno, y - 14)
+            y += 25
+        for block in range(6):
+            if block == 2 and pno % subtopic_every == 0:
+                page.insert_text(
+                    (50, y), f"6.{topic}.{subtopic} Subtopic {subtopic}", fontsize=12, fontname="hebo"
+                )
+                bookmark(3, f"6.{topic}.{subtopic} Subtopic {subtopic}", pno, y - 12)
+                y += 20
+                subtopic += 1
+            for line in range(4):
+                text = " ".join(rng.choice(WORDS) for _ in range(10))
+                if math_lines and line == 1:
+                    text += " x = y + 2"
+                page.insert_text((50, y), text, fontsize=10)
+                y += 13
+            y += 12
+        if figures and pno % 2 == 0:
+            pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 600, 600), 0)
+            page.insert_image(fitz.Rect(300, 600, 500, 780), pixmap=pixmap)
+            page.insert_text((300, 795), "Fig. 6.1 A figure", fontsize=9)
+    if outline:
+        doc.set_toc(toc)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+SENTENCES = (
+    "A force can change the speed of an object or the direction in which it moves.",
+    "Friction always acts opposite to the direction of motion between two surfaces.",
+    "When a ball rolls on sand it stops sooner than when it rolls on a smooth floor.",
+    "The speed of a moving object is the distance it covers divided by the time taken.",
+    "Heat flows from a hotter object to a colder one until both reach the same temperature.",
+    "Plants make their food in the leaves using sunlight, water and carbon dioxide.",
+    "An electric circuit is complete only when the switch closes the conducting path.",
+    "Magnets attract objects made of iron, nickel and cobalt but not wood or plastic.",
+)
+
+
+def _paragraph(rng: random.Random, sentences: int) -> str:
+    return " ".join(rng.choice(SENTENCES) for _ in range(sentences))
+
+
+def make_textbook_pdf(path: Path, pages: int = 24, seed: int = 5) -> Path:
+    """
+    Write a chapter PDF laid out more like a printed NCERT chapter and return it.
+    Body text is set as wrapped, sentence-terminated paragraphs, so pages
+    without headings, labels, captions or equations need no span-level pass
+    in tiered mode. It mixes font sizes: a large
+    chapter opener, bold topic and subtopic headings, activity boxes, notes
+    and captions in their own sizes, two-column pages, equations and figures.
+    """
+    rng = random.Random(seed)
+    doc = fitz.open()
+    subtopic = 1
+    for pno in range(pages):
+        page = doc.new_page(width=595, height=842)
+        page.insert_text((50, 40), "Science", fontsize=8)
+        page.insert_text((470, 40), "Reprint 2024-25", fontsize=8)
+        page.insert_text((290, 820), str(pno + 1), fontsize=9)
+        y = 90.0
+
+        def block(text: str, size: float, font: str = "helv", x0: float = 50, x1: float = 545) -> None:
+            nonlocal y
+            rect = fitz.Rect(x0, y, x1, y + 400)
+            spare = page.insert_textbox(rect, text, fontsize=size, fontname=font)
+            y += 400 - spare + size
+
+        topic = pno // 6 + 1
+        if pno == 0:
+            block("Chapter 6", 22, "hebo")
+            block("Force and Pressure", 20, "hebo")
+            block(_paragraph(rng, 3), 12.5)
+        if pno % 6 == 0:
+            block(f"6.{topic} Topic number {topic}", 14, "hebo")
+        if pno % 2 == 0:
+            block(f"6.{topic}.{subtopic} Subtopic {subtopic}", 12, "hebo")
+            subtopic += 1
+        if pno % 3 == 1:
+            # Two columns of body text.
+            top = y
+            block(_paragraph(rng, 4), 10.5, x1=290)
+            left_end, y = y, top
+            block(_paragraph(rng, 4), 10.5, x0=305)
+            y = max(y, left_end)
+        else:
+            block(_paragraph(rng, 5), 10.5)
+        if pno % 4 == 1:
+            block(f"Activity 6.{pno // 4 + 1}", 11, "hebo")
+            block(_paragraph(rng, 2), 9.5)
+        if pno % 3 == 0:
+            block(_paragraph(rng, 2) + " For example, v = u + a × t when the force stays constant.", 10.5)
+        if pno % 5 == 3:
+            block("Think and answer: " + _paragraph(rng, 2), 11.5, "heit")
+        block(_paragraph(rng, 4), 10.5)
+        if pno % 6 == 2 and y < 600:
+            pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 300, 300), 0)
+            page.insert_image(fitz.Rect(180, 620, 400, 770), pixmap=pixmap)
+            page.insert_text((180, 785), f"Fig. 6.{pno // 3 + 1} A ball rolling on sand", fontsize=9)
+    doc.save(str(path))
+    doc.close()
+    return path
@@ -0,0 +1,119 @@
+# Cross-page running header/footer/watermark removal
+"""
+Boilerplate - Drop text that repeats at the same place on many pages.
+Running titles, "Reprint" watermarks and side labels that sit inside the
+margins get past _is_header_footer and would be sent with every subtopic
+prompt. Short blocks in the outer band of the page are fingerprinted by
+normalized text and position over a sample of pages; fingerprints seen on
+enough of them are dropped everywhere. Repeated labels in the body area
+("Activity", "Think and answer") are never candidates.
+"""
+import math
+import re
+from collections import Counter
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from chunker import count_tokens_batch
+from extractor import ExtractedPage
+
+# Pages buffered to learn running text before the first page is released.
+SAMPLE_PAGES = 32
+# A fingerprint is running text once it appears on this share of sampled pages.
+MIN_PAGE_RATIO = 0.4
+MIN_PAGES = 3
+# Longer blocks are body text and never dropped.
+MAX_RUNNING_CHARS = 80
+# Position grid as a fraction of page width/height.
+POSITION_GRID = 0.02
+# Only blocks wholly inside this outer share of the page (top, bottom, left
+# or right) can be running text. _is_header_footer already drops the outer 8%
+# vertically, so this catches titles and side labels just inside it.
+MARGIN_BAND = 0.15
+
+_DIGITS = re.compile(r"\d+")
+_SPACES = re.compile(r"\s+")
+_NUMBERED_HEADING = re.compile(r"^\d+(?:\.\d+)+\b")
+
+
+def _fingerprints(page: ExtractedPage) -> List[Optional[Tuple[str, int, int]]]:
+    """(normalized text, x cell, y cell) per block, or None if it cannot repeat."""
+    if page.block_count == 0:
+        return []
+    x_cells = np.rint(page.x0 / max(page.width * POSITION_GRID, 1.0)).astype(int).tolist()
+    y_cells = np.rint(page.y0 / max(page.height * POSITION_GRID, 1.0)).astype(int).tolist()
+    in_band = (
+        (page.y1 <= page.height * MARGIN_BAND)
+        | (page.y0 >= page.height * (1 - MARGIN_BAND))
+        | (page.x1 <= page.width * MARGIN_BAND)
+        | (page.x0 >= page.width * (1 - MARGIN_BAND))
+    ).tolist()
+    result = []
+    for text, x_cell, y_cell, band in zip(page.block_texts(), x_cells, y_cells, in_band):
+        text = text.strip()
+        if not band or len(text) > MAX_RUNNING_CHARS or _NUMBERED_HEADING.match(text):
+            result.append(None)
+            continue
+        # Page numbers and years inside running titles vary from page to page.
+        normalized = _SPACES.sub(" ", _DIGITS.sub("#", text.lower()))
+        result.append((normalized, x_cell, y_cell))
+    return result
+
+
+class RunningTextFilter:
+    """Learns running text from the first pages and strips it from all pages."""
+
+    def __init__(self, sample_pages: int = SAMPLE_PAGES, min_ratio: float = MIN_PAGE_RATIO):
+        self.sample_pages = sample_pages
+        self.min_ratio = min_ratio
+        self.running: set = set()
+        self.dropped: Counter = Counter()
+
+    def learn(self, pages: List[ExtractedPage]) -> None:
+        """Mark fingerprints repeated on enough of the given pages."""
+        seen = Counter()
+        for page in pages:
+            seen.update({fp for fp in _fingerprints(page) if fp is not None})
+        needed = max(MIN_PAGES, math.ceil(self.min_ratio * len(pages)))
+        self.running = {fp for fp, count in seen.items() if count >= needed}
+
+    def strip(self, page: ExtractedPage) -> ExtractedPage:
+        """Remove running-text blocks from a page in place."""
+        if not self.running:
+            return page
+        texts = None
+        keep = []
+        for i, fp in enumerate(_fingerprints(page)):
+            if fp in self.running:
+                texts = texts or page.block_texts()
+                self.dropped[texts[i].strip()] += 1
+            else:
+                keep.append(i)
+        if len(keep) < page.block_count:
+            page.take(np.array(keep, dtype=np.intp))
+        return page
+
+    def __call__(self, pages: Iterable[ExtractedPage]) -> Iterator[ExtractedPage]:
+        page_iter = iter(pages)
+        buffered: List[ExtractedPage] = []
+        for page in page_iter:
+            buffered.append(page)
+            if len(buffered) >= self.sample_pages:
+                break
+        self.learn(buffered)
+        for page in buffered:
+            yield self.strip(page)
+        buffered = []
+        for page in page_iter:
+            yield self.strip(page)
+
+    @property
+    def dropped_blocks(self) -> int:
+        return sum(self.dropped.values())
+
+    def tokens_saved(self) -> int:
+        """Tokens of source text removed across all pages."""
+        texts = list(self.dropped)
+        counts = count_tokens_batch(texts)
+        return sum(tokens * self.dropped[text] for text, tokens in zip(texts, counts))
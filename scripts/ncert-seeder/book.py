@@ -0,0 +1,193 @@
+# Whole-book PDF splitting into per-chapter jobs
+"""
+Book - Find chapter boundaries in a full-textbook PDF and split it into one
+PDF per chapter, so each chapter runs through the normal single-chapter
+pipeline and writes its own output JSON.
+
+Boundaries come from the book outline when it lists chapters, otherwise from
+chapter opener headings ("Chapter 3", "Unit IV") found in numeric order.
+"""
+import hashlib
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import fitz
+
+from config import CACHE_DIR
+from extraction_cache import open_extraction
+
+BOOK_SHARD_DIR = CACHE_DIR / "books"
+
+# "Chapter 3", "Unit IV" or "3 Chemical Reactions" at the start of a title.
+_CHAPTER_TITLE = re.compile(
+    r"^(?:(?:chapter|unit)\s+(?P<label>\d+|[ivxlcdm]+)\b|(?P<number>\d+)[.:]?\s+[A-Za-z])",
+    re.IGNORECASE,
+)
+_CHAPTER_OPENER = re.compile(r"^(?:chapter|unit)\s+(\d+|[ivxlcdm]+)\b", re.IGNORECASE)
+_ROMAN = {"i": 1, "v": 5, "x": 10, "l": 50, "c": 100, "d": 500, "m": 1000}
+# Chapter openers sit below the running header and in the upper part of the page.
+OPENER_TOP_MARGIN = 0.08
+OPENER_MAX_Y = 0.5
+
+
+@dataclass
+class BookChapter:
+    """One chapter of a book: 1-based inclusive page range and its split PDF."""
+    number: str
+    title: str
+    page_start: int
+    page_end: int
+    outline_depth: int = 0
+    pdf_path: Optional[Path] = None
+
+
+def _label_number(label: str) -> int:
+    """Chapter label to an integer: '12' -> 12, 'IV' -> 4."""
+    if label.isdigit():
+        return int(label)
+    values = [_ROMAN[c] for c in label.lower()]
+    return sum(-v if i + 1 < len(values) and v < values[i + 1] else v for i, v in enumerate(values))
+
+
+def _title_number(title: str) -> Optional[int]:
+    match = _CHAPTER_TITLE.match(title.strip())
+    if not match:
+        return None
+    return _label_number(match.group("label") or match.group("number"))
+
+
+def _chapters_from_outline(toc: List[list], page_count: int) -> List[BookChapter]:
+    """Chapters listed at the shallowest outline depth that names at least two."""
+    for depth in sorted({row[0] for row in toc}):
+        entries = [
+            (i, row) for i, row in enumerate(toc)
+            if row[0] == depth and _title_number(row[1]) is not None and row[2] >= 1
+        ]
+        if len(entries) < 2:
+            continue
+        chapters = []
+        for i, (_, title, page, *_) in entries:
+            # A chapter runs until the next outline entry at its depth or above.
+            end = page_count
+            for row in toc[i + 1:]:
+                if row[0] <= depth and row[2] >= 1:
+                    end = max(page, row[2] - 1)
+                    break
+            number = str(_title_number(title))
+            chapters.append(BookChapter(number, " ".join(title.split()), page, end, depth))
+        return chapters
+    return []
+
+
+def _chapters_from_headings(doc: fitz.Document) -> List[BookChapter]:
+    """Pages opening with "Chapter N" / "Unit N", taking numbers in sequence only."""
+    starts = []
+    last = 0
+    for page in doc:
+        height = page.rect.height
+        for x0, y0, x1, y1, text, *_ in page.get_text("blocks", sort=True):
+            if y0 < height * OPENER_TOP_MARGIN:
+                continue
+            if y0 > height * OPENER_MAX_Y:
+                break
+            match = _CHAPTER_OPENER.match(text.strip())
+            if not match:
+                continue
+            number = _label_number(match.group(1))
+            # Running headers repeat the current number and body text cites other
+            # chapters; only the next number in sequence opens a chapter.
+            if (not starts and number >= 1) or number == last + 1:
+                starts.append((number, " ".join(text.split()), page.number + 1))
+                last = number
+            break
+
+    chapters = []
+    for i, (number, title, page) in enumerate(starts):
+        end = starts[i + 1][2] - 1 if i + 1 < len(starts) else len(doc)
+        chapters.append(BookChapter(str(number), title, page, max(page, end)))
+    return chapters
+
+
+def find_book_chapters(pdf_path: str | Path) -> List[BookChapter]:
+    """Chapter page ranges of a full-textbook PDF, outline first."""
+    with fitz.open(pdf_path) as doc:
+        chapters = _chapters_from_outline(doc.get_toc(), len(doc))
+        if not chapters:
+            chapters = _chapters_from_headings(doc)
+    return chapters
+
+
+def _chapter_toc(toc: List[list], chapter: BookChapter) -> List[list]:
+    """Outline rows inside a chapter, re-rooted at depth 1 and its first page."""
+    rows = [
+        row for row in toc
+        if chapter.page_start <= row[2] <= chapter.page_end and row[0] >= chapter.outline_depth
+    ]
+    if not rows:
+        return []
+    top = min(row[0] for row in rows)
+    shifted = []
+    for depth, title, page, dest in rows:
+        page = page - chapter.page_start + 1
+        entry = [depth - top + 1, title, page]
+        if dest.get("kind") == fitz.LINK_GOTO and dest.get("to") is not None:
+            # Keep the target point so headings can still be placed by position.
+            entry.append({"kind": fitz.LINK_GOTO, "page": page - 1, "to": dest["to"]})
+        shifted.append(entry)
+    return shifted
+
+
+def split_book(pdf_path: str | Path, chapters: List[BookChapter]) -> List[BookChapter]:
+    """
+    Write each chapter's pages (and its part of the outline) to its own PDF.
+    Files are keyed by the book's content hash and reused on later runs, so
+    the per-chapter extraction cache keeps hitting.
+    """
+    pdf_path = Path(pdf_path)
+    digest = hashlib.sha256(pdf_path.read_bytes()).hexdigest()[:12]
+    shard_dir = BOOK_SHARD_DIR / f"{pdf_path.stem}-{digest}"
+    shard_dir.mkdir(parents=True, exist_ok=True)
+
+    with fitz.open(pdf_path) as book:
+        toc = book.get_toc(simple=False)
+        for chapter in chapters:
+            chapter.pdf_path = shard_dir / f"chapter{chapter.number}.pdf"
+            if chapter.pdf_path.exists():
+                continue
+            with fitz.open() as shard:
+                shard.insert_pdf(book, from_page=chapter.page_start - 1, to_page=chapter.page_end - 1)
+                try:
+                    shard.set_toc(_chapter_toc(toc, chapter))
+                except ValueError:
+                    # Uneven nesting inside the chapter; detection falls back to headings.
+                    shard.set_toc([])
+                temp_path = chapter.pdf_path.with_suffix(".pdf.tmp")
+                shard.save(str(temp_path), garbage=3, deflate=True)
+            temp_path.replace(chapter.pdf_path)
+    return chapters
+
+
+def _extract_chapter(pdf_path: str, tiered: bool) -> int:
+    """Process-pool worker: fill the extraction cache for one chapter PDF."""
+    metadata, pages, _ = open_extraction(pdf_path, tiered=tiered)
+    for _ in pages:
+        pass
+    return metadata["page_count"]
+
+
+def extract_chapters(chapters: List[BookChapter], workers: int, tiered: bool = False) -> None:
+    """
+    Extract chapter PDFs into the extraction cache, several chapters at once.
+    PyMuPDF is not thread-safe, so this runs in processes before chapter jobs
+    start; the jobs then read their pages from the cache.
+    """
+    paths = [str(chapter.pdf_path) for chapter in chapters]
+    if workers <= 1:
+        for path in paths:
+            _extract_chapter(path, tiered)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        list(pool.map(_extract_chapter, paths, [tiered] * len(paths)))
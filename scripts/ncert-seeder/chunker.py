@@ -2,65 +2,201 @@
 """
 Chunker - Split text into token-based chunks for LLM processing.
 """
+import re
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from typing import List, Optional, Sequence, Tuple
+
 import tiktoken
-from typing import List
 
+DEFAULT_ENCODING = "cl100k_base"
 
-def count_tokens(text: str, model: str = "cl100k_base") -> int:
-    """Count tokens in text using tiktoken."""
+# Counts for short, frequently repeated strings (system prompts, paragraphs).
+COUNT_CACHE_SIZE = 8192
+# Longer texts are counted directly so the cache does not pin whole chapters.
+COUNT_CACHE_MAX_CHARS = 4000
+
+
+@lru_cache(maxsize=None)
+def get_encoder(model: str = DEFAULT_ENCODING) -> Optional[tiktoken.Encoding]:
+    """Build each tiktoken encoder once. None when it cannot be loaded (e.g. offline)."""
     try:
-        enc = tiktoken.get_encoding(model)
-        return len(enc.encode(text))
+        return tiktoken.get_encoding(model)
     except Exception:
+        return None
+
+
+def _count_uncached(text: str, model: str) -> int:
+    enc = get_encoder(model)
+    if enc is None:
         return len(text) // 4
+    return len(enc.encode_ordinary(text))
 
 
-def chunk_text(text: str, max_tokens: int = 1500, overlap: int = 100) -> List[str]:
+@lru_cache(maxsize=COUNT_CACHE_SIZE)
+def _count_cached(text: str, model: str) -> int:
+    return _count_uncached(text, model)
+
+
+def count_tokens(text: str, model: str = DEFAULT_ENCODING) -> int:
+    """Count tokens in text using tiktoken."""
+    if len(text) <= COUNT_CACHE_MAX_CHARS:
+        return _count_cached(text, model)
+    return _count_uncached(text, model)
+
+
+def count_tokens_batch(
+    texts: Sequence[str],
+    model: str = DEFAULT_ENCODING,
+    num_threads: int = 8,
+) -> List[int]:
+    """Count tokens for many texts at once, encoding across threads."""
+    enc = get_encoder(model)
+    if enc is None:
+        return [len(text) // 4 for text in texts]
+    encoded = enc.encode_ordinary_batch(list(texts), num_threads=num_threads)
+    return [len(tokens) for tokens in encoded]
+
+
+# Preferred cut points, strongest first: paragraph break, sentence end, line break.
+_BOUNDARY_PATTERNS = (
+    re.compile(r"\n\s*\n\s*"),
+    re.compile(r"(?<=[.!?])[\"')\]]*\s+"),
+    re.compile(r"\n\s*"),
+)
+
+# Never snap a cut back further than this share of max_tokens.
+_MIN_FILL_RATIO = 0.5
+
+
+class _TokenByteLengths(dict):
+    """token id -> byte length, filled lazily so hot lookups stay in C."""
+
+    def __init__(self, enc: tiktoken.Encoding):
+        super().__init__()
+        self.enc = enc
+
+    def __missing__(self, token: int) -> int:
+        length = len(self.enc.decode_single_token_bytes(token))
+        self[token] = length
+        return length
+
+
+@lru_cache(maxsize=None)
+def _token_byte_lengths(model: str) -> Optional[_TokenByteLengths]:
+    enc = get_encoder(model)
+    return _TokenByteLengths(enc) if enc is not None else None
+
+
+def _token_offsets(text: str, model: str = DEFAULT_ENCODING) -> List[int]:
+    """Encode text once and return the character offset where each token starts."""
+    enc = get_encoder(model)
+    if enc is None:
+        # Same 4-chars-per-token estimate count_tokens falls back to.
+        return list(range(0, len(text), 4))
+    tokens = enc.encode_ordinary(text)
+    if not text.isascii():
+        _, offsets = enc.decode_with_offsets(tokens)
+        return offsets
+    # ASCII: byte offsets are character offsets.
+    lengths = _token_byte_lengths(model)
+    offsets = list(accumulate(map(lengths.__getitem__, tokens), initial=0))
+    offsets.pop()
+    return offsets
+
+
+def _boundary_tokens(text: str, offsets: List[int]) -> List[List[int]]:
+    """Token indexes where a chunk may start, one sorted list per boundary strength."""
+    levels = []
+    for pattern in _BOUNDARY_PATTERNS:
+        indexes = []
+        for match in pattern.finditer(text):
+            idx = bisect_left(offsets, match.end())
+            # Only keep cuts that land exactly on a token start.
+            if idx < len(offsets) and offsets[idx] == match.end():
+                indexes.append(idx)
+        levels.append(indexes)
+    return levels
+
+
+def _best_cut(levels: List[List[int]], low: int, high: int) -> int:
+    """Pick the strongest boundary in (low, high], preferring the latest one."""
+    for indexes in levels:
+        pos = bisect_right(indexes, high) - 1
+        if pos >= 0 and indexes[pos] > low:
+            return indexes[pos]
+    return high
+
+
+def _snap_forward(levels: List[List[int]], low: int, high: int) -> int:
+    """Move an overlap start to the first boundary in [low, high), else keep low."""
+    for indexes in levels[:2]:
+        pos = bisect_left(indexes, low)
+        if pos < len(indexes) and indexes[pos] < high:
+            return indexes[pos]
+    return low
+
+
+def plan_chunks(
+    text: str,
+    max_tokens: int = 1500,
+    overlap: int = 100,
+    model: str = DEFAULT_ENCODING,
+) -> List[Tuple[int, int, int]]:
     """
-    Split text into chunks of approximately max_tokens.
-    Uses simple paragraph-based splitting with overlap for context.
+    Plan chunk boundaries over a single encoding of text.
+    Returns (char_start, char_end, token_count) spans. Cuts snap to paragraph,
+    then sentence, then line boundaries; paragraphs longer than max_tokens are
+    split mid-paragraph. Overlap is measured in tokens.
     """
-    if not text:
+    if not text or not text.strip():
         return []
-    
-    token_count = count_tokens(text)
-    if token_count <= max_tokens:
-        return [text]
-    
-    paragraphs = text.split("\n\n")
-    chunks = []
-    current_chunk = []
-    current_tokens = 0
-    
-    for para in paragraphs:
-        para_tokens = count_tokens(para)
-        
-        if current_tokens + para_tokens > max_tokens and current_chunk:
-            chunks.append("\n\n".join(current_chunk))
-            
-            if overlap > 0 and len(current_chunk) > 1:
-                overlap_text = "\n\n".join(current_chunk[-2:])
-                overlap_tokens = count_tokens(overlap_text)
-                if overlap_tokens < overlap:
-                    current_chunk = [overlap_text]
-                    current_tokens = overlap_tokens
-                else:
-                    current_chunk = []
-                    current_tokens = 0
-            else:
-                current_chunk = []
-                current_tokens = 0
-        
-        current_chunk.append(para)
-        current_tokens += para_tokens
-    
-    if current_chunk:
-        chunks.append("\n\n".join(current_chunk))
-    
-    return chunks
+
+    offsets = _token_offsets(text, model)
+    total = len(offsets)
+    if total <= max_tokens:
+        return [(0, len(text), total)]
+
+    overlap = max(0, min(overlap, max_tokens // 2))
+    levels = _boundary_tokens(text, offsets)
+    min_fill = max(1, int(max_tokens * _MIN_FILL_RATIO))
+
+    def char_at(token_idx: int) -> int:
+        return offsets[token_idx] if token_idx < total else len(text)
+
+    spans: List[Tuple[int, int, int]] = []
+    start = 0
+    while start < total:
+        limit = start + max_tokens
+        end = total if limit >= total else _best_cut(levels, start + min_fill, limit)
+
+        char_start, char_end = char_at(start), char_at(end)
+        # Trim boundary whitespace without re-encoding anything.
+        while char_start < char_end and text[char_start].isspace():
+            char_start += 1
+        while char_end > char_start and text[char_end - 1].isspace():
+            char_end -= 1
+        if char_end > char_start:
+            spans.append((char_start, char_end, end - start))
+
+        if end >= total:
+            break
+        next_start = _snap_forward(levels, end - overlap, end) if overlap else end
+        start = max(next_start, start + 1)
+
+    return spans
+
+
+def chunk_text(text: str, max_tokens: int = 1500, overlap: int = 100) -> List[str]:
+    """
+    Split text into chunks of at most max_tokens.
+    Encodes once and cuts on token offsets snapped to paragraph/sentence boundaries.
+    """
+    return [text[start:end] for start, end, _ in plan_chunks(text, max_tokens, overlap)]
 
 
-def chunk_subtopic(subtopic: dict, max_tokens: int = 1500) -> List[dict]:
+def chunk_subtopic(subtopic: dict, max_tokens: int = 1500, overlap: int = 100) -> List[dict]:
     """
     Chunk a subtopic's content while preserving metadata.
     Returns list of chunk dicts with subtopic context.
@@ -69,10 +205,10 @@ def chunk_subtopic(subtopic: dict, max_tokens: int = 1500) -> List[dict]:
     if not content:
         return []
     
-    chunks = chunk_text(content, max_tokens)
+    spans = plan_chunks(content, max_tokens, overlap)
     
     result = []
-    for i, chunk in enumerate(chunks):
+    for i, (start, end, tokens) in enumerate(spans):
         result.append({
             "chapter_id": subtopic.get("chapter_id"),
             "chapter_title": subtopic.get("chapter_title"),
@@ -81,9 +217,9 @@ def chunk_subtopic(subtopic: dict, max_tokens: int = 1500) -> List[dict]:
             "subtopic_id": subtopic.get("subtopic_id"),
             "subtopic_title": subtopic.get("subtopic_title"),
             "chunk_index": i,
-            "total_chunks": len(chunks),
-            "content": chunk,
-            "content_tokens": count_tokens(chunk),
+            "total_chunks": len(spans),
+            "content": content[start:end],
+            "content_tokens": tokens,
         })
     
     return result
@@ -6,6 +6,7 @@ BASE_DIR = Path(__file__).parent
 PDF_DIR = BASE_DIR / "pdf"
 OUTPUT_DIR = BASE_DIR / "output"
 ARCHIVE_DIR = BASE_DIR / "archive"
+CACHE_DIR = BASE_DIR / "cache"
 
 SERVICE_ACCOUNT_PATH = BASE_DIR.parent.parent / "service-account.json"
 
@@ -20,6 +21,58 @@ GEMINI_MODEL_FALLBACKS = [
 ]
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", GEMINI_MODEL_FALLBACKS[0])
 
+# Client-side pacing per model as (requests per minute, input tokens per minute).
+# Match these to the project's quota tier; override with GEMINI_RATE_LIMITS,
+# e.g. "gemini-2.5-pro=150:2000000,gemini-2.5-flash=1000:1000000".
+GEMINI_RATE_LIMITS = {
+    "gemini-2.5-pro": (150, 2_000_000),
+    "gemini-2.5-flash": (1000, 1_000_000),
+    "gemini-2.0-flash": (2000, 4_000_000),
+    "gemini-1.5-pro": (1000, 4_000_000),
+    "gemini-1.5-flash": (2000, 4_000_000),
+}
+DEFAULT_RATE_LIMIT = (60, 1_000_000)
+
+# Source-text token budget per model for the Phase 1 prompt. Phase 2 gets
+# PHASE2_SOURCE_BUDGET_RATIO of it. Subtopics above the Phase 1 budget are
+# split into chunks, extracted in parallel and merged (map-reduce).
+GEMINI_SOURCE_TOKEN_BUDGETS = {
+    "gemini-2.5-pro": 6000,
+    "gemini-2.5-flash": 6000,
+    "gemini-2.0-flash": 4000,
+    "gemini-1.5-pro": 4000,
+    "gemini-1.5-flash": 3000,
+}
+DEFAULT_SOURCE_TOKEN_BUDGET = 3000
+PHASE2_SOURCE_BUDGET_RATIO = 0.5
+MAP_REDUCE_MAX_WORKERS = 4
+
+# Gemini responses keyed by request content; pruned by age, then LRU by size.
+RESPONSE_CACHE_PATH = CACHE_DIR / "responses.sqlite3"
+RESPONSE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+RESPONSE_CACHE_MAX_AGE_DAYS = 90
+
+# Extracted pages keyed by PDF content hash + extractor version.
+EXTRACTION_CACHE_DIR = CACHE_DIR / "extraction"
+
+# Progress journal: fsync after this many appended subtopics, and fold the
+# journal into the chapter JSON after this many.
+JOURNAL_FSYNC_EVERY = 8
+JOURNAL_COMPACT_EVERY = 25
+
+# Firestore publishing through one BulkWriter. It starts at the initial rate
+# and ramps up by 50% every 5 minutes (Firestore's 500/50/5 rule) to the max.
+FIRESTORE_INITIAL_OPS_PER_SECOND = 500
+FIRESTORE_MAX_OPS_PER_SECOND = 10_000
+FIRESTORE_WRITE_ATTEMPTS = 10
+# Writes lost with a failed batch RPC are resent after RETRY_DELAY * 2**round
+# seconds, capped, for this many rounds before they count as failed.
+FIRESTORE_BATCH_RETRY_ROUNDS = 5
+FIRESTORE_BACKOFF_MAX_SECONDS = 30
+# Question-pool and flashcard documents are split into parts of at most this
+# many encoded bytes, leaving headroom under Firestore's 1 MiB document limit.
+FIRESTORE_POOL_DOC_MAX_BYTES = 900_000
+
 MAX_TOKENS_PER_CHUNK = 1500
 MAX_RETRIES = 3
 RETRY_DELAY = 2
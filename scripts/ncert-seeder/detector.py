@@ -5,9 +5,19 @@ Uses pattern matching and font analysis to identify section hierarchies.
 """
 import re
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
 
-from extractor import ExtractedPDF, TextBlock
+import numpy as np
+
+from extractor import ExtractedPage, ExtractedPDF
+from normalizer import clean_content_text
+
+# Pages buffered to estimate the header font threshold when streaming.
+# Covers a whole NCERT chapter PDF, so single-chapter runs match detect_structure.
+# Longer PDFs deliberately keep this sample instead of scanning every page
+# first: the threshold can then differ from detect_structure's whole-document
+# one, but detection no longer has to hold or read ahead the full book.
+THRESHOLD_SAMPLE_PAGES = 32
 
 
 @dataclass
@@ -57,273 +67,478 @@ def _slugify(text: str) -> str:
     return text.strip("-")
 
 
-def _detect_font_threshold(blocks: List[TextBlock]) -> float:
-    """Detect font size threshold for headers."""
-    if not blocks:
+def _detect_font_threshold(pages: Sequence[ExtractedPage]) -> float:
+    """Detect font size threshold for headers from the pages' font-size columns."""
+    if not pages:
         return 12.0
     
-    font_sizes = [b.font_size for b in blocks if b.font_size > 0]
-    if not font_sizes:
+    font_sizes = np.concatenate([page.font_size for page in pages])
+    # Size 0 means unknown: tiered extraction's cheap block pass has no font
+    # info, so those blocks stay out of the sample instead of adding a size.
+    # np.unique sorts ascending, so the largest distinct sizes are at the end.
+    sizes = np.unique(font_sizes[font_sizes > 0])
+    if len(sizes) == 0:
         return 12.0
     
-    sorted_sizes = sorted(set(font_sizes), reverse=True)
-    if len(sorted_sizes) >= 3:
-        return sorted_sizes[2]
-    elif len(sorted_sizes) >= 2:
-        return sorted_sizes[1]
-    return sorted_sizes[0] * 1.2
-
-
-def _parse_numeric_heading(text: str) -> Tuple[int, str]:
-    """Return numeric heading depth and prefix, e.g. 6.4.1 -> (3, '6.4.1')."""
-    match = re.match(r"^(\d+(?:\.\d+){1,4})\b", text.strip())
-    if not match:
-        return 0, ""
-    prefix = match.group(1)
-    return len(prefix.split(".")), prefix
+    if len(sizes) >= 3:
+        return float(sizes[-3])
+    elif len(sizes) >= 2:
+        return float(sizes[-2])
+    return float(sizes[-1]) * 1.2
+
+
+class Heading(NamedTuple):
+    """Classification of one block: kind is 'chapter', 'topic', 'subtopic' or ''."""
+    kind: str
+    level: int
+    prefix: str
+
+
+_NOT_HEADING = Heading("", 0, "")
+
+# Textbook labels that should not create topic boundaries.
+_NON_TOPIC_PREFIXES = (
+    "activity ",
+    "table ",
+    "fig.",
+    "figure ",
+    "science and society",
+    "know a scientist",
+    "in a nutshell",
+    "let us enhance our learning",
+    "exploratory projects",
+)
+_NON_TOPIC_PREFIX_LEN = max(len(prefix) for prefix in _NON_TOPIC_PREFIXES)
+
+# Chapter openers ("Chapter 6", "Unit IV", "6 Chapter") or a numeric heading
+# prefix such as 6.4.1. The two alternatives never match the same text.
+_HEADING_START = re.compile(
+    r"(?P<chapter>(?:chapter|unit)\s+(?:\d+|[ivxlcdm]+)|\d+\s+(?:chapter|unit))"
+    r"|(?P<prefix>\d+(?:\.\d+){1,4})\b",
+    re.IGNORECASE,
+)
+_ALNUM = re.compile(r"[A-Za-z0-9]")
+# Matches when a single line holds five or more alphabetic words.
+_FIVE_WORD_LINE = re.compile(r"[A-Za-z]+(?:[^A-Za-z\n]+[A-Za-z]+){4}")
 
 
 def _is_non_topic_heading(text: str) -> bool:
     """Filter known textbook labels that should not create topic boundaries."""
-    normalized = text.strip().lower()
-    skip_prefixes = (
-        "activity ",
-        "table ",
-        "fig.",
-        "figure ",
-        "science and society",
-        "know a scientist",
-        "in a nutshell",
-        "let us enhance our learning",
-        "exploratory projects",
-    )
-    return any(normalized.startswith(prefix) for prefix in skip_prefixes)
-
-
-def _is_header_line(text: str, font_size: float, is_bold: bool, 
-                    threshold: float) -> Tuple[bool, str]:
+    head = text.lstrip()[:_NON_TOPIC_PREFIX_LEN].lower()
+    return head.startswith(_NON_TOPIC_PREFIXES)
+
+
+def _classify_heading(text: str, font_size: float, is_bold: bool,
+                      threshold: float) -> Heading:
     """
-    Determine if a line is a header.
-    Returns (is_header, header_type) where type is 'chapter', 'topic', or 'subtopic'
+    Classify a block as a chapter, topic or subtopic heading in one pass.
+    Numbered headings set the type from their depth; otherwise large or bold
+    short lines are topic candidates. Body blocks cost a single regex match.
     """
     text = text.strip()
-    if not text:
-        return False, ""
-    if not re.search(r"[A-Za-z0-9]", text):
-        return False, ""
-    if _is_non_topic_heading(text):
-        return False, ""
-    
-    chapter_patterns = [
-        r"^(chapter|unit)\s+(\d+|[ivxlcdm]+)",
-        r"^(\d+)\s+(chapter|unit)",
-        r"^chapter\s+\d+\s*[:\.]",
-    ]
-    
-    for pattern in chapter_patterns:
-        if re.match(pattern, text, re.IGNORECASE):
-            return True, "chapter"
-
-    level, _ = _parse_numeric_heading(text)
-    if level == 2:
-        return True, "topic"
-    if level >= 3:
-        return True, "subtopic"
-    
-    is_large = font_size > threshold or is_bold
+    match = _HEADING_START.match(text)
+    if match is None:
+        is_large = font_size > threshold or is_bold
+        if not (is_large and len(text) < 90 and not text.endswith(".")):
+            return _NOT_HEADING
+        if not _ALNUM.search(text) or _is_non_topic_heading(text):
+            return _NOT_HEADING
+        return Heading("topic", 0, "")
 
-    if is_large and len(text) < 90 and not text.endswith("."):
-        return True, "topic"
-    
-    return False, ""
+    if _is_non_topic_heading(text):
+        return _NOT_HEADING
+    prefix = match.group("prefix")
+    if prefix is None:
+        return Heading("chapter", 0, "")
+    level = prefix.count(".") + 1
+    return Heading("topic" if level == 2 else "subtopic", level, prefix)
 
 
 def _is_table_like_heading(text: str) -> bool:
     """Detect compact multi-line labels usually from table headers."""
-    level, _ = _parse_numeric_heading(text)
-    if level > 0:
-        return False
-    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    lines = [line for line in text.splitlines() if line.strip()]
     if len(lines) < 2:
         return False
     # Table header labels are usually short on each line.
-    return all(len(re.findall(r"[A-Za-z]+", line)) <= 4 for line in lines)
+    return not any(_FIVE_WORD_LINE.search(line) for line in lines)
 
 
-def _clean_content_text(text: str) -> str:
-    """Clean extracted content text."""
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    text = re.sub(r" {2,}", " ", text)
-    
-    noise_patterns = [
-        r"fig\.\s*\d+",
-        r"figure\s*\d+",
-        r"page\s*\d+",
-    ]
-    for pattern in noise_patterns:
-        text = re.sub(pattern, "", text, flags=re.IGNORECASE)
-    
-    return text.strip()
+class OutlineEntry(NamedTuple):
+    """A PDF outline entry mapped to the section it opens."""
+    kind: str
+    title: str
+    level: int
+    prefix: str
+    page_num: int
+    y: Optional[float]
+
 
+# Numeric prefix ignored when an unnumbered outline title is matched to a block.
+_NUMBER_PREFIX = re.compile(r"^\d+(?:\.\d+)*\.?\s+")
 
-def detect_structure(extracted: ExtractedPDF) -> DetectedStructure:
+
+def outline_sections(outline: Optional[Sequence], page_count: int = 0) -> Optional[List[OutlineEntry]]:
     """
-    Detect chapter, topic, and subtopic structure from extracted PDF.
+    Map outline rows [depth, title, page_num, y] to chapter/topic/subtopic entries.
+    A single top-level entry is the chapter and its children are topics;
+    otherwise top-level entries are topics. Deeper entries stay body text.
+    Returns None when the outline is missing, out of page order or has no topics.
+    """
+    rows = [row for row in outline or [] if str(row[1]).strip()]
+    if not rows:
+        return None
+    top = min(row[0] for row in rows)
+    roots = sum(1 for row in rows if row[0] == top)
+    kinds = ("chapter", "topic", "subtopic") if roots == 1 else ("topic", "subtopic")
+
+    entries = []
+    last_page = 1
+    for depth, title, page_num, y in rows:
+        if page_num < last_page or (page_count and page_num > page_count):
+            return None
+        last_page = page_num
+        if depth - top >= len(kinds):
+            continue
+        title = " ".join(str(title).split())
+        match = _HEADING_START.match(title)
+        prefix = (match.group("prefix") or "") if match else ""
+        level = prefix.count(".") + 1 if prefix else 0
+        entries.append(OutlineEntry(kinds[depth - top], title, level, prefix, page_num, y))
+
+    if not any(entry.kind == "topic" for entry in entries):
+        return None
+    return entries
+
+
+def _title_key(text: str) -> str:
+    return " ".join(text[:200].lower().split())
+
+
+def _locate_entry(entry: OutlineEntry, keys: List[str], y1: np.ndarray,
+                  start: int) -> Tuple[int, bool]:
+    """
+    Block index at which an outline entry's section starts on its page, and
+    whether that block is the heading itself. The title is matched first;
+    failing that, the first block reaching below the outline's target point.
+    """
+    title = _title_key(entry.title)
+    for i in range(start, len(keys)):
+        key = keys[i] if entry.prefix else _NUMBER_PREFIX.sub("", keys[i], count=1)
+        if key == title:
+            return i, True
+        if key.startswith(title + " "):
+            # Heading merged with body text: cut here but keep the block as content.
+            return i, False
+    if entry.y is None:
+        return start, False
+    for i in range(start, len(keys)):
+        if y1[i] > entry.y:
+            return i, False
+    return len(keys), False
+
+
+class _StructureBuilder:
+    """
+    Incremental chapter/topic/subtopic state machine fed one page at a time.
+    Finalized subtopics are returned from feed()/finish() as soon as they close.
+    With an outline, sections open at outline entries and fonts are ignored;
+    outline topics without subtopic entries still split at numbered subtopic
+    headings found in their text.
+    With retain=False, closed sections are not kept, so memory stays bounded.
     """
-    all_blocks: List[TextBlock] = []
-    for page in extracted.pages:
-        all_blocks.extend(page.blocks)
-    
-    threshold = _detect_font_threshold(all_blocks)
-    
-    chapter: Optional[Chapter] = None
-    current_topic: Optional[Topic] = None
-    current_subtopic: Optional[Subtopic] = None
-    saw_numeric_topic = False
-    
-    chapter_content_parts: List[str] = []
-    topic_content_parts: List[str] = []
-    subtopic_content_parts: List[str] = []
 
-    def ensure_chapter(page_num: int, fallback_title: str = "") -> None:
-        nonlocal chapter
-        if chapter:
+    def __init__(
+        self,
+        threshold: float,
+        retain: bool = True,
+        outline: Optional[List[OutlineEntry]] = None,
+    ):
+        self.threshold = threshold
+        self.retain = retain
+        self.outline = outline
+        self.outline_pos = 0
+        # Outline topics with no subtopic entries under them. Inside those,
+        # numbered subtopic headings are still detected from the text.
+        self.childless_topics = {
+            pos for pos, entry in enumerate(outline or [])
+            if entry.kind == "topic"
+            and (pos + 1 == len(outline) or outline[pos + 1].kind != "subtopic")
+        }
+        self.detect_in_section = False
+        self.section_prefix = ""
+        self.chapter: Optional[Chapter] = None
+        self.current_topic: Optional[Topic] = None
+        self.current_subtopic: Optional[Subtopic] = None
+        self.saw_numeric_topic = False
+        self.chapter_content_parts: List[str] = []
+        self.topic_content_parts: List[str] = []
+        self.subtopic_content_parts: List[str] = []
+        self.topic_subtopic_count = 0
+        self.first_page_num: Optional[int] = None
+        self.last_page_num: Optional[int] = None
+        self._ready: List[dict] = []
+
+    def _record(self, topic: Topic, subtopic: Subtopic) -> None:
+        chapter = self.chapter
+        self._ready.append({
+            "chapter_id": chapter.id if chapter else "",
+            "chapter_title": chapter.title if chapter else "",
+            "topic_id": topic.id,
+            "topic_title": topic.title,
+            "subtopic_id": subtopic.id,
+            "subtopic_title": subtopic.title,
+            "content": subtopic.content,
+            "page_start": subtopic.page_start,
+            "page_end": subtopic.page_end,
+        })
+
+    def _drain(self) -> List[dict]:
+        ready, self._ready = self._ready, []
+        return ready
+
+    def ensure_chapter(self, page_num: int, fallback_title: str = "") -> None:
+        if self.chapter:
             return
         title = fallback_title.strip() if fallback_title else "Detected Chapter"
-        chapter = Chapter(
+        self.chapter = Chapter(
             id=_slugify(title) or "detected-chapter",
             title=title,
             page_start=page_num,
         )
 
-    def finalize_subtopic(page_num: int) -> None:
-        nonlocal current_subtopic, subtopic_content_parts, current_topic
-        if not current_subtopic:
+    def finalize_subtopic(self, page_num: int) -> None:
+        if not self.current_subtopic:
             return
-        current_subtopic.content = _clean_content_text("\n\n".join(subtopic_content_parts))
-        current_subtopic.page_end = page_num
-        if current_topic:
-            current_topic.subtopics.append(current_subtopic)
-        current_subtopic = None
-        subtopic_content_parts = []
-
-    def finalize_topic(page_num: int) -> None:
-        nonlocal current_topic, topic_content_parts, chapter
-        if not current_topic:
+        subtopic = self.current_subtopic
+        subtopic.content = clean_content_text("\n\n".join(self.subtopic_content_parts))
+        subtopic.page_end = page_num
+        if self.current_topic:
+            if self.retain:
+                self.current_topic.subtopics.append(subtopic)
+            self.topic_subtopic_count += 1
+            self._record(self.current_topic, subtopic)
+        self.current_subtopic = None
+        self.subtopic_content_parts = []
+
+    def finalize_topic(self, page_num: int) -> None:
+        if not self.current_topic:
             return
-        current_topic.content = _clean_content_text("\n\n".join(topic_content_parts))
-        current_topic.page_end = page_num
+        topic = self.current_topic
+        topic.content = clean_content_text("\n\n".join(self.topic_content_parts))
+        topic.page_end = page_num
         # Ensure each topic has at least one usable subtopic for downstream pipeline.
-        if not current_topic.subtopics and current_topic.content:
-            current_topic.subtopics.append(
-                Subtopic(
-                    id=f"{current_topic.id}-overview",
-                    title=current_topic.title,
-                    content=current_topic.content,
-                    page_start=current_topic.page_start,
-                    page_end=current_topic.page_end,
-                )
+        if not self.topic_subtopic_count and topic.content:
+            overview = Subtopic(
+                id=f"{topic.id}-overview",
+                title=topic.title,
+                content=topic.content,
+                page_start=topic.page_start,
+                page_end=topic.page_end,
             )
-        if chapter:
-            chapter.topics.append(current_topic)
-        current_topic = None
-        topic_content_parts = []
-    
-    for page in extracted.pages:
-        for block in page.blocks:
-            is_header, header_type = _is_header_line(
-                block.text, block.font_size, block.is_bold, threshold
+            if self.retain:
+                topic.subtopics.append(overview)
+            self._record(topic, overview)
+        if self.chapter and self.retain:
+            self.chapter.topics.append(topic)
+        self.current_topic = None
+        self.topic_content_parts = []
+        self.topic_subtopic_count = 0
+
+    def open_chapter(self, title: str, page_num: int) -> None:
+        if self.chapter:
+            return
+        self.chapter = Chapter(
+            id=_slugify(title.strip()) or "chapter",
+            title=title.strip(),
+            page_start=page_num
+        )
+
+    def open_topic(self, title: str, level: int, page_num: int) -> None:
+        self.ensure_chapter(page_num, "Detected Chapter")
+        self.finalize_subtopic(page_num)
+        self.finalize_topic(page_num)
+        if level == 2:
+            self.saw_numeric_topic = True
+        
+        topic_id = _slugify(title)
+        self.current_topic = Topic(
+            id=topic_id,
+            title=title.strip(),
+            page_start=page_num
+        )
+        self.topic_content_parts = []
+
+    def open_subtopic(self, title: str, level: int, prefix: str, page_num: int) -> None:
+        self.ensure_chapter(page_num, "Detected Chapter")
+        if not self.current_topic:
+            # If subtopics appear before any explicit topic, create an implicit topic.
+            implicit = prefix.rsplit(".", 1)[0] if level >= 3 and "." in prefix else "topic"
+            self.current_topic = Topic(
+                id=_slugify(implicit) or "topic",
+                title=f"Topic {implicit}" if implicit != "topic" else "Detected Topic",
+                page_start=page_num,
             )
-            level, _ = _parse_numeric_heading(block.text)
 
-            if header_type == "topic":
-                # Once numbered topics begin, ignore non-numbered topic candidates.
-                # This avoids table/header noise being promoted to topic.
-                if saw_numeric_topic and level == 0:
-                    is_header, header_type = False, ""
-                if _is_table_like_heading(block.text):
-                    is_header, header_type = False, ""
-                # Ignore low-signal single-word headings after numbered flow starts.
-                alpha_words = re.findall(r"[A-Za-z]+", block.text)
-                if saw_numeric_topic and level == 0 and len(alpha_words) <= 1:
-                    is_header, header_type = False, ""
-            
-            if header_type == "chapter" and not chapter:
-                chapter = Chapter(
-                    id=_slugify(block.text.strip()) or "chapter",
-                    title=block.text.strip(),
-                    page_start=page.page_num
-                )
-                continue
-            
-            if header_type == "topic":
-                ensure_chapter(page.page_num, "Detected Chapter")
-                finalize_subtopic(page.page_num)
-                finalize_topic(page.page_num)
-                if level == 2:
-                    saw_numeric_topic = True
-                
-                topic_id = _slugify(block.text)
-                current_topic = Topic(
-                    id=topic_id,
-                    title=block.text.strip(),
-                    page_start=page.page_num
-                )
-                topic_content_parts = []
+        self.finalize_subtopic(page_num)
+        
+        subtopic_id = _slugify(title)
+        self.current_subtopic = Subtopic(
+            id=subtopic_id,
+            title=title.strip(),
+            page_start=page_num
+        )
+        self.subtopic_content_parts = []
+
+    def add_content(self, text: str) -> None:
+        if self.current_subtopic:
+            self.subtopic_content_parts.append(text)
+        elif self.current_topic:
+            self.topic_content_parts.append(text)
+        elif self.chapter:
+            self.chapter_content_parts.append(text)
+
+    def open_section(self, pos: int, page_num: int) -> None:
+        entry = self.outline[pos]
+        if entry.kind == "chapter":
+            self.open_chapter(entry.title, page_num)
+        elif entry.kind == "topic":
+            self.open_topic(entry.title, entry.level, page_num)
+            self.detect_in_section = pos in self.childless_topics
+            self.section_prefix = entry.prefix
+        else:
+            self.open_subtopic(entry.title, entry.level, entry.prefix, page_num)
+
+    def _section_subtopic(self, text: str) -> Optional[Heading]:
+        """A numbered subtopic heading under the current childless outline topic."""
+        heading = _classify_heading(text, 0.0, False, self.threshold)
+        if heading.kind != "subtopic":
+            return None
+        if self.section_prefix and not heading.prefix.startswith(self.section_prefix + "."):
+            return None
+        return heading
+
+    def _outline_cuts(self, page: ExtractedPage, texts: List[str]) -> List[Tuple[int, int, bool]]:
+        """(block index, outline position, block is heading) for entries up to this page."""
+        cuts = []
+        start = 0
+        keys = None
+        while self.outline_pos < len(self.outline):
+            pos = self.outline_pos
+            entry = self.outline[pos]
+            if entry.page_num > page.page_num:
+                break
+            self.outline_pos += 1
+            if entry.page_num < page.page_num:
+                # Its page was never fed; open the section where reading resumes.
+                cuts.append((start, pos, False))
                 continue
-            
-            if header_type == "subtopic":
-                ensure_chapter(page.page_num, "Detected Chapter")
-                if not current_topic:
-                    # If subtopics appear before any explicit topic, create an implicit topic.
-                    level, prefix = _parse_numeric_heading(block.text)
-                    implicit = prefix.rsplit(".", 1)[0] if level >= 3 and "." in prefix else "topic"
-                    current_topic = Topic(
-                        id=_slugify(implicit) or "topic",
-                        title=f"Topic {implicit}" if implicit != "topic" else "Detected Topic",
-                        page_start=page.page_num,
-                    )
-
-                finalize_subtopic(page.page_num)
-                
-                subtopic_id = _slugify(block.text)
-                current_subtopic = Subtopic(
-                    id=subtopic_id,
-                    title=block.text.strip(),
-                    page_start=page.page_num
-                )
-                subtopic_content_parts = []
+            if keys is None:
+                keys = [_title_key(text) for text in texts]
+            index, is_heading = _locate_entry(entry, keys, page.y1, start)
+            cuts.append((index, pos, is_heading))
+            start = index + 1 if is_heading else index
+        return cuts
+
+    def _feed_outline(self, page: ExtractedPage) -> None:
+        texts = page.block_texts()
+        cuts = self._outline_cuts(page, texts)
+        next_cut = 0
+        for i, text in enumerate(texts):
+            is_heading = False
+            while next_cut < len(cuts) and cuts[next_cut][0] == i:
+                _, pos, is_heading = cuts[next_cut]
+                self.open_section(pos, page.page_num)
+                next_cut += 1
+            if is_heading:
                 continue
-            
-            if current_subtopic:
-                subtopic_content_parts.append(block.text)
-            elif current_topic:
-                topic_content_parts.append(block.text)
-            elif chapter:
-                chapter_content_parts.append(block.text)
-    
-    if extracted.pages:
-        ensure_chapter(extracted.pages[0].page_num, "Detected Chapter")
-    if extracted.pages:
-        finalize_subtopic(extracted.pages[-1].page_num)
-        finalize_topic(extracted.pages[-1].page_num)
-    
-    if chapter and chapter_content_parts and not chapter.content:
-        chapter.content = _clean_content_text(
-            "\n\n".join(chapter_content_parts)
+            heading = self._section_subtopic(text) if self.detect_in_section else None
+            if heading is not None:
+                self.open_subtopic(text, heading.level, heading.prefix, page.page_num)
+            else:
+                self.add_content(text)
+        for _, pos, _ in cuts[next_cut:]:
+            self.open_section(pos, page.page_num)
+
+    def feed(self, page: ExtractedPage) -> List[dict]:
+        """Consume one page. Returns subtopics finalized while reading it."""
+        if self.first_page_num is None:
+            self.first_page_num = page.page_num
+        self.last_page_num = page.page_num
+
+        if self.outline is not None:
+            self._feed_outline(page)
+            return self._drain()
+
+        # Classify from the block table's columns instead of building TextBlocks.
+        features = zip(
+            page.block_texts(), page.font_size.tolist(), page.table["is_bold"].tolist()
         )
-    
-    if chapter and chapter.topics:
-        chapter.page_end = chapter.topics[-1].page_end or extracted.metadata.get("page_count", 0)
-    elif chapter:
-        chapter.page_end = extracted.metadata.get("page_count", 0)
-        chapter.id = chapter.id or "detected-chapter"
-        chapter.title = chapter.title or "Detected Chapter"
+        for text, font_size, is_bold in features:
+            header_type, level, prefix = _classify_heading(
+                text, font_size, is_bold, self.threshold
+            )
 
-    return DetectedStructure(
-        chapter=chapter,
-        page_count=extracted.metadata.get("page_count", 0)
-    )
+            if header_type == "topic" and level == 0:
+                # Once numbered topics begin, ignore non-numbered topic candidates.
+                # This avoids table/header noise being promoted to topic.
+                if self.saw_numeric_topic or _is_table_like_heading(text):
+                    header_type = ""
+            
+            if header_type == "chapter" and not self.chapter:
+                self.open_chapter(text, page.page_num)
+            elif header_type == "topic":
+                self.open_topic(text, level, page.page_num)
+            elif header_type == "subtopic":
+                self.open_subtopic(text, level, prefix, page.page_num)
+            else:
+                self.add_content(text)
+
+        return self._drain()
+
+    def finish(self) -> List[dict]:
+        """Close open sections after the last page. Returns remaining subtopics."""
+        if self.first_page_num is not None:
+            self.ensure_chapter(self.first_page_num, "Detected Chapter")
+            self.finalize_subtopic(self.last_page_num)
+            self.finalize_topic(self.last_page_num)
+        return self._drain()
+
+    def structure(self, page_count: int) -> DetectedStructure:
+        """Build the DetectedStructure once finish() has run."""
+        chapter = self.chapter
+        if chapter and self.chapter_content_parts and not chapter.content:
+            chapter.content = clean_content_text(
+                "\n\n".join(self.chapter_content_parts)
+            )
+        
+        if chapter and chapter.topics:
+            chapter.page_end = chapter.topics[-1].page_end or page_count
+        elif chapter:
+            chapter.page_end = page_count
+            chapter.id = chapter.id or "detected-chapter"
+            chapter.title = chapter.title or "Detected Chapter"
+
+        return DetectedStructure(chapter=chapter, page_count=page_count)
+
+
+def detect_structure(extracted: ExtractedPDF, use_outline: bool = True) -> DetectedStructure:
+    """
+    Detect chapter, topic, and subtopic structure from extracted PDF.
+    A usable embedded outline sets the boundaries directly; otherwise headings
+    are found from numbering and font size.
+    """
+    page_count = extracted.metadata.get("page_count", 0)
+    outline = None
+    if use_outline:
+        outline = outline_sections(extracted.metadata.get("outline"), page_count)
+    if outline is not None:
+        builder = _StructureBuilder(0.0, outline=outline)
+    else:
+        builder = _StructureBuilder(_detect_font_threshold(extracted.pages))
+    for page in extracted.pages:
+        builder.feed(page)
+    builder.finish()
+    return builder.structure(page_count)
 
 
 def extract_all_subtopics(extracted: ExtractedPDF) -> List[dict]:
@@ -353,6 +568,47 @@ def extract_all_subtopics(extracted: ExtractedPDF) -> List[dict]:
     return result
 
 
+def iter_subtopics(
+    pages: Iterable[ExtractedPage],
+    threshold: Optional[float] = None,
+    sample_pages: int = THRESHOLD_SAMPLE_PAGES,
+    outline: Optional[List[OutlineEntry]] = None,
+) -> Iterator[dict]:
+    """
+    Streaming variant of extract_all_subtopics over a page iterator.
+    Yields each subtopic dict as soon as the next heading closes it; pages are
+    not retained. Given outline_sections() entries, boundaries come from the
+    outline and nothing is buffered. Otherwise, without an explicit threshold,
+    the header font threshold is estimated from the first sample_pages pages,
+    which are buffered until then. For PDFs longer than sample_pages this is
+    intentionally a prefix estimate, not the whole-document threshold that
+    extract_all_subtopics uses; pass threshold to pin it.
+    """
+    if outline is not None:
+        builder = _StructureBuilder(0.0, retain=False, outline=outline)
+        for page in pages:
+            yield from builder.feed(page)
+        yield from builder.finish()
+        return
+
+    page_iter = iter(pages)
+    buffered: List[ExtractedPage] = []
+    if threshold is None:
+        for page in page_iter:
+            buffered.append(page)
+            if len(buffered) >= sample_pages:
+                break
+        threshold = _detect_font_threshold(buffered)
+
+    builder = _StructureBuilder(threshold, retain=False)
+    for page in buffered:
+        yield from builder.feed(page)
+    buffered = []
+    for page in page_iter:
+        yield from builder.feed(page)
+    yield from builder.finish()
+
+
 if __name__ == "__main__":
     import sys
     from extractor import extract_pdf
@@ -0,0 +1,244 @@
+# On-disk cache of extracted PDF pages
+"""
+Extraction Cache - Store extracted pages in a compact columnar binary file.
+Files are keyed by a hash of the PDF bytes plus EXTRACTOR_VERSION, so resumes
+and retries skip PyMuPDF entirely when neither the PDF nor the extractor changed.
+
+Layout: MAGIC | format, header length (u32) | JSON header | block table | text.
+The block table is every page's BLOCK_DTYPE table back to back, read with
+np.frombuffer straight out of an mmap; page text buffers follow as one UTF-8
+region.
+"""
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import struct
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from config import EXTRACTION_CACHE_DIR
+from extractor import (
+    BLOCK_DTYPE,
+    EXTRACTOR_VERSION,
+    ExtractedPage,
+    iter_pages,
+    read_pdf_metadata,
+)
+
+MAGIC = b"NCXC"
+FORMAT_VERSION = 2
+
+
+def pdf_cache_key(pdf_path: Path, tiered: bool = False) -> str:
+    """Hash of the PDF bytes plus extractor/format versions and mode."""
+    digest = hashlib.sha256()
+    with open(pdf_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    digest.update(f"|extractor={EXTRACTOR_VERSION}|format={FORMAT_VERSION}".encode())
+    if tiered:
+        digest.update(b"|tiered")
+    return digest.hexdigest()[:32]
+
+
+def cache_path_for(pdf_path: Path, tiered: bool = False) -> Path:
+    return EXTRACTION_CACHE_DIR / f"{pdf_cache_key(pdf_path, tiered)}.ncx"
+
+
+def _dtype_descr() -> list:
+    return [list(item) for item in BLOCK_DTYPE.descr]
+
+
+class _TableWriter:
+    """
+    Spools page block tables and text to part files next to the cache file
+    as pages stream past, so only the per-page index is held in memory.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.pages: List[list] = []
+        self.block_count = 0
+        self.text_size = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._table_path = path.with_suffix(f"{path.suffix}.blocks.tmp")
+        self._text_path = path.with_suffix(f"{path.suffix}.text.tmp")
+        self._table_file = open(self._table_path, "wb")
+        self._text_file = open(self._text_path, "wb")
+
+    def add(self, page: ExtractedPage) -> None:
+        # Font ids and text offsets in the table stay page-local.
+        self._table_file.write(page.table.tobytes())
+        text = page.text.encode("utf-8")
+        self._text_file.write(text)
+        # Hand each page to the OS now rather than holding it in file buffers.
+        self._table_file.flush()
+        self._text_file.flush()
+        self.pages.append([
+            page.page_num, page.width, page.height,
+            self.block_count, page.block_count, self.text_size, self.text_size + len(text), page.fonts,
+        ])
+        self.block_count += page.block_count
+        self.text_size += len(text)
+
+    def write(self, metadata: dict) -> None:
+        """Assemble header, block table and text into the cache file."""
+        self._table_file.close()
+        self._text_file.close()
+        header = json.dumps({
+            "extractor_version": EXTRACTOR_VERSION,
+            "metadata": metadata,
+            "pages": self.pages,
+            "dtype": _dtype_descr(),
+            "blocks": self.block_count,
+        }).encode("utf-8")
+        prefix = MAGIC + struct.pack("<II", FORMAT_VERSION, len(header)) + header
+        prefix += b"\0" * (-len(prefix) % 8)
+
+        temp_path = self.path.with_suffix(f"{self.path.suffix}.tmp")
+        with open(temp_path, "wb") as f:
+            f.write(prefix)
+            for part_path in (self._table_path, self._text_path):
+                with open(part_path, "rb") as part:
+                    shutil.copyfileobj(part, f, 1 << 20)
+        temp_path.replace(self.path)
+
+    def discard(self) -> None:
+        """Close and delete the part files."""
+        for handle, part_path in (
+            (self._table_file, self._table_path),
+            (self._text_file, self._text_path),
+        ):
+            handle.close()
+            if part_path.exists():
+                part_path.unlink()
+
+
+class CachedExtraction:
+    """Memory-mapped view over a cache file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.table: Optional[np.ndarray] = None
+        self.text: Optional[memoryview] = None
+        if self._mm[:4] != MAGIC:
+            self.close()
+            raise ValueError(f"Not an extraction cache file: {path}")
+        version, header_len = struct.unpack_from("<II", self._mm, 4)
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported extraction cache format {version}")
+        header_end = 12 + header_len
+        self.header = json.loads(self._mm[12:header_end])
+        if self.header["dtype"] != _dtype_descr():
+            self.close()
+            raise ValueError(f"Extraction cache block layout changed: {path}")
+        base = header_end + (-header_end % 8)
+        count = self.header["blocks"]
+        self.table = np.frombuffer(self._mm, dtype=BLOCK_DTYPE, count=count, offset=base)
+        self.text = memoryview(self._mm)[base + self.table.nbytes:]
+        self.metadata = self.header["metadata"]
+
+    def iter_pages(self) -> Iterator[ExtractedPage]:
+        """
+        Yield pages whose block tables are read-only views into the mapped
+        file. ExtractedPage.take() builds a new table rather than writing to
+        the view, so running-text stripping still works on them.
+        """
+        for page_num, width, height, start, count, text_start, text_end, fonts in self.header["pages"]:
+            yield ExtractedPage.from_table(
+                page_num,
+                width,
+                height,
+                self.table[start:start + count],
+                fonts,
+                str(self.text[text_start:text_end], "utf-8"),
+            )
+
+    def close(self) -> None:
+        # Drop our views first; mmap refuses to close while any exist.
+        if self.text is not None:
+            self.text.release()
+        self.table = None
+        self.text = None
+        try:
+            self._mm.close()
+        except BufferError:
+            # Pages still hold table views (e.g. a consumer kept the last
+            # page). The mapping is unmapped once the last of them is freed.
+            pass
+        self._file.close()
+
+
+def _write_through(
+    pages: Iterator[ExtractedPage],
+    path: Path,
+    metadata: dict,
+) -> Iterator[ExtractedPage]:
+    """
+    Pass pages through while spooling them to disk; write the file once
+    exhausted. A partly consumed iterator leaves no cache file behind.
+    """
+    writer = _TableWriter(path)
+    try:
+        for page in pages:
+            writer.add(page)
+            yield page
+        writer.write(metadata)
+    finally:
+        writer.discard()
+
+
+def _iter_cached(cached: CachedExtraction) -> Iterator[ExtractedPage]:
+    try:
+        yield from cached.iter_pages()
+    finally:
+        cached.close()
+
+
+def open_extraction(
+    pdf_path: str | Path,
+    workers: int = 1,
+    use_cache: bool = True,
+    tiered: bool = False,
+) -> Tuple[dict, Iterator[ExtractedPage], bool]:
+    """
+    Return (metadata, page iterator, cache_hit) for a PDF.
+    On a miss the pages are extracted with PyMuPDF and cached as they stream.
+    """
+    pdf_path = Path(pdf_path)
+    if not pdf_path.exists():
+        raise FileNotFoundError(f"PDF not found: {pdf_path}")
+
+    if not use_cache:
+        return read_pdf_metadata(pdf_path), iter_pages(pdf_path, workers, tiered), False
+
+    path = cache_path_for(pdf_path, tiered)
+    cached: Optional[CachedExtraction] = None
+    if path.exists():
+        try:
+            cached = CachedExtraction(path)
+        except (OSError, ValueError, KeyError):
+            cached = None
+    if cached is not None:
+        return cached.metadata, _iter_cached(cached), True
+
+    metadata = read_pdf_metadata(pdf_path)
+    pages = iter_pages(pdf_path, workers, tiered)
+    return metadata, _write_through(pages, path, metadata), False
+
+
+def clear_extraction_cache() -> int:
+    """Delete all cached extractions. Returns files removed."""
+    removed = 0
+    if EXTRACTION_CACHE_DIR.exists():
+        for path in EXTRACTION_CACHE_DIR.glob("*.ncx"):
+            os.remove(path)
+            removed += 1
+    return removed
@@ -4,14 +4,42 @@ PDF Extractor - Extract raw text with layout information from PDF files.
 Improved column detection and layout preservation.
 """
 import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 
 import fitz
+import numpy as np
 
+from normalizer import merge_hyphenated_lines, normalize_text, tighten_math_line
 
-@dataclass
+# Bump whenever a change alters extracted pages; it invalidates the extraction cache.
+EXTRACTOR_VERSION = 3
+
+# get_text("dict") defaults include TEXT_PRESERVE_IMAGES, which decodes and copies
+# every image payload only for the layout pass to discard it.
+LAYOUT_TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+# Column segmentation: x-coverage histogram resolution and gutter rules.
+COLUMN_BIN_WIDTH = 2.0
+MIN_GUTTER_RATIO = 0.015
+SPANNING_WIDTH_RATIO = 0.6
+MIN_COLUMN_BLOCKS = 3
+MAX_COLUMNS = 3
+
+# Tiered extraction: blocks that cannot be headings use the cheap block pass.
+# Lines with digits, operators or non-ASCII text may be split into spans whose
+# joining depends on gaps (superscripts, formulas), so they stay span-level.
+TIERED_MIN_BODY_CHARS = 110
+_HEADING_START = re.compile(r"^(\d|chapter\b|unit\b|section\b)", re.IGNORECASE)
+_SPAN_SENSITIVE = re.compile(r"[^A-Za-z ,.;:'\"()!?]")
+
+CAPTION_PATTERN = re.compile(r"^\s*(fig(ure)?|table)\.?\s*\d", re.IGNORECASE)
+CAPTION_MAX_GAP = 40.0
+
+
+@dataclass(slots=True)
 class TextBlock:
     """Represents a text block with position info."""
     text: str
@@ -25,14 +53,144 @@ class TextBlock:
     page_num: int = 0
 
 
-@dataclass
+# One row per block. Text offsets index the page's shared text buffer.
+BLOCK_DTYPE = np.dtype([
+    ("x0", np.float64),
+    ("y0", np.float64),
+    ("x1", np.float64),
+    ("y1", np.float64),
+    ("font_size", np.float64),
+    ("text_start", np.int32),
+    ("text_end", np.int32),
+    ("font_id", np.int32),
+    ("is_bold", np.bool_),
+])
+
+
 class ExtractedPage:
-    """Extracted content from a single page."""
+    """
+    Extracted content from a single page, stored as one block table.
+    Geometry and font attributes are NumPy columns of a structured array; all
+    block text lives in one buffer joined by blank lines, which doubles as
+    raw_text. TextBlock objects are only built when `blocks` is read.
+    """
+    __slots__ = ("page_num", "width", "height", "table", "fonts", "text")
+
+    def __init__(
+        self,
+        page_num: int,
+        width: float,
+        height: float,
+        blocks: Optional[List[TextBlock]] = None,
+        raw_text: str = "",
+    ):
+        blocks = blocks or []
+        fonts: dict = {}
+        self.page_num = page_num
+        self.width = width
+        self.height = height
+        self.table = np.array(
+            [
+                (b.x0, b.y0, b.x1, b.y1, b.font_size, 0, 0,
+                 fonts.setdefault(b.font_name, len(fonts)), b.is_bold)
+                for b in blocks
+            ],
+            dtype=BLOCK_DTYPE,
+        )
+        self.fonts = list(fonts)
+        self._set_text([b.text for b in blocks], raw_text)
+
+    def _set_text(self, texts: List[str], raw_text: str = "") -> None:
+        """Pack block texts into one buffer; raw_text is kept only without blocks."""
+        if not texts:
+            self.text = raw_text
+            return
+        lengths = np.array([len(t) for t in texts], dtype=np.int32)
+        self.table["text_end"] = np.cumsum(lengths + 2) - 2
+        self.table["text_start"] = self.table["text_end"] - lengths
+        self.text = "\n\n".join(texts)
+
+    @property
+    def x0(self) -> np.ndarray:
+        return self.table["x0"]
+
+    @property
+    def y0(self) -> np.ndarray:
+        return self.table["y0"]
+
+    @property
+    def x1(self) -> np.ndarray:
+        return self.table["x1"]
+
+    @property
+    def y1(self) -> np.ndarray:
+        return self.table["y1"]
+
+    @property
+    def font_size(self) -> np.ndarray:
+        return self.table["font_size"]
+
+    @property
+    def block_count(self) -> int:
+        return len(self.table)
+
+    @property
+    def raw_text(self) -> str:
+        return self.text
+
+    def block_texts(self) -> List[str]:
+        text = self.text
+        return [
+            text[s:e]
+            for s, e in zip(self.table["text_start"].tolist(), self.table["text_end"].tolist())
+        ]
+
+    @property
+    def blocks(self) -> List[TextBlock]:
+        """Materialize TextBlock views of the block table."""
+        fonts = self.fonts
+        page_num = self.page_num
+        return [
+            TextBlock(text, x0, y0, x1, y1, size, fonts[font], bold, page_num)
+            for text, (x0, y0, x1, y1, size, _, _, font, bold) in zip(
+                self.block_texts(), self.table.tolist()
+            )
+        ]
+
+    def take(self, order: np.ndarray) -> "ExtractedPage":
+        """Reorder blocks in place by an index array (e.g. reading order)."""
+        texts = self.block_texts()
+        self.table = self.table[order]
+        self._set_text([texts[i] for i in order.tolist()])
+        return self
+
+    @classmethod
+    def from_table(
+        cls,
+        page_num: int,
+        width: float,
+        height: float,
+        table: np.ndarray,
+        fonts: List[str],
+        text: str,
+    ) -> "ExtractedPage":
+        """Build a page from a BLOCK_DTYPE table and its text buffer."""
+        page = cls.__new__(cls)
+        page.page_num = page_num
+        page.width = width
+        page.height = height
+        page.table = table
+        page.fonts = list(fonts)
+        page.text = text
+        return page
+
+
+@dataclass
+class FigureRef:
+    """Position of an image on a page and its caption, without image data."""
     page_num: int
-    width: float
-    height: float
-    blocks: List[TextBlock] = field(default_factory=list)
-    raw_text: str = ""
+    bbox: Tuple[float, float, float, float]
+    caption: str = ""
 
 
 @dataclass 
@@ -67,18 +225,6 @@ def _needs_space(prev_text: str, next_text: str, gap: float,
     return False
 
 
-def _normalize_text(text: str) -> str:
-    """Normalize extracted span text for stable downstream parsing."""
-    if not text:
-        return ""
-    text = text.replace("\u00a0", " ")  # non-breaking space
-    text = text.replace("\u2009", " ")  # thin space
-    text = text.replace("\u2011", "-")  # non-breaking hyphen
-    # Drop control chars except whitespace controls used for layout.
-    text = re.sub(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]", "", text)
-    return text
-
-
 def _join_spans(spans: List[dict]) -> str:
     """Join text spans with proper spacing."""
     parts = []
@@ -87,7 +233,7 @@ def _join_spans(spans: List[dict]) -> str:
     prev_size = None
     
     for span in spans:
-        text = _normalize_text(span.get("text", ""))
+        text = normalize_text(span.get("text", ""))
         if not text:
             continue
         bbox = span.get("bbox")
@@ -108,44 +254,71 @@ def _join_spans(spans: List[dict]) -> str:
     return "".join(parts).strip()
 
 
-def _merge_hyphenated_lines(lines: List[str]) -> str:
-    """Merge hyphenated line breaks."""
-    if not lines:
-        return ""
-    merged = []
-    i = 0
-    while i < len(lines):
-        line = _normalize_text(lines[i])
-        if line.endswith("-") and i + 1 < len(lines):
-            next_line = _normalize_text(lines[i + 1]).lstrip()
-            if next_line and next_line[0].islower():
-                merged.append(line[:-1] + next_line)
-                i += 2
-                continue
-        merged.append(line)
-        i += 1
-    return "\n".join(merged)
-
-
-def _tighten_math_line(line: str) -> str:
-    """Clean up math expressions."""
-    if not re.search(r"[=<>±×÷*/^]", line):
-        return line
-    line = re.sub(r"\s+([,.;:%])", r"\1", line)
-    line = re.sub(r"([(\[{])\s+", r"\1", line)
-    line = re.sub(r"\s+([)\]}])", r"\1", line)
-    line = re.sub(r"(?<=\w)\s*([=<>±×÷*/^])\s*(?=\w)", r"\1", line)
-    line = re.sub(r"(?<=\d)\s*/\s*(?=\d)", r"/", line)
-    return line
-
-
-def _detect_columns(blocks: List[dict], page_width: float) -> bool:
-    """Detect if page has two columns based on block positions."""
-    if page_width <= 0:
-        return False
-    left = [b for b in blocks if b.get("x0", 0) < page_width * 0.45]
-    right = [b for b in blocks if b.get("x0", 0) > page_width * 0.55]
-    return len(left) >= 3 and len(right) >= 3
+def _find_gutters(x0: np.ndarray, x1: np.ndarray, page_width: float) -> np.ndarray:
+    """
+    Column gutters as (start, end) x-ranges, left to right, at most
+    MAX_COLUMNS - 1 of them. A gutter is a run of COLUMN_BIN_WIDTH bins that no
+    ordinary block covers; blocks wider than SPANNING_WIDTH_RATIO of the text
+    width are left out of the histogram so full-width titles cannot fill it.
+    """
+    empty = np.empty((0, 2))
+    if page_width <= 0 or len(x0) < 2 * MIN_COLUMN_BLOCKS:
+        return empty
+    left, right = x0.min(), x1.max()
+    narrow = (x1 - x0) <= (right - left) * SPANNING_WIDTH_RATIO
+    if np.count_nonzero(narrow) < 2 * MIN_COLUMN_BLOCKS:
+        return empty
+
+    bins = int(np.ceil((right - left) / COLUMN_BIN_WIDTH)) + 1
+    first = np.floor((x0[narrow] - left) / COLUMN_BIN_WIDTH).astype(np.intp)
+    last = np.ceil((x1[narrow] - left) / COLUMN_BIN_WIDTH).astype(np.intp)
+    # Difference array: +1 where a block starts covering, -1 after it stops.
+    delta = np.bincount(first, minlength=bins + 1) - np.bincount(
+        np.minimum(last, bins), minlength=bins + 1
+    )
+    covered = np.cumsum(delta[:bins]) > 0
+
+    # Runs of uncovered bins, ignoring any that touch the text edges.
+    edges = np.diff(np.concatenate(([1], covered.astype(np.int8), [1])))
+    starts = np.flatnonzero(edges == -1)
+    ends = np.flatnonzero(edges == 1)
+    inner = (starts > 0) & (ends < bins)
+    widths = (ends - starts) * COLUMN_BIN_WIDTH
+    keep = inner & (widths >= page_width * MIN_GUTTER_RATIO)
+    starts, ends, widths = starts[keep], ends[keep], widths[keep]
+
+    # Widest gutters first; drop any that leave a column too thin to be real.
+    gutters = []
+    centers = (x0 + x1) / 2.0
+    for i in np.argsort(-widths, kind="stable")[:MAX_COLUMNS - 1]:
+        candidate = sorted(gutters + [(left + starts[i] * COLUMN_BIN_WIDTH,
+                                       left + ends[i] * COLUMN_BIN_WIDTH)])
+        bounds = np.array([(a + b) / 2.0 for a, b in candidate])
+        counts = np.bincount(np.searchsorted(bounds, centers[narrow]), minlength=len(bounds) + 1)
+        if counts.min() >= MIN_COLUMN_BLOCKS:
+            gutters = candidate
+    return np.array(gutters) if gutters else empty
+
+
+def _reading_order(page: ExtractedPage) -> np.ndarray:
+    """
+    Block indices in reading order. Blocks that cross a gutter span the page
+    and split it into horizontal bands; within a band, columns are read left
+    to right and top to bottom. Without gutters this is plain (y0, x0) order.
+    """
+    x0, y0, x1 = page.x0, page.y0, page.x1
+    gutters = _find_gutters(x0, x1, page.width)
+    if len(gutters) == 0:
+        # lexsort is stable and sorts by the last key first.
+        return np.lexsort((x0, y0))
+
+    spanning = ((x0[:, None] < gutters[:, 0]) & (x1[:, None] > gutters[:, 1])).any(axis=1)
+    column = np.searchsorted(gutters.mean(axis=1), (x0 + x1) / 2.0)
+    column[spanning] = -1
+    # A spanning block opens the band below it; everything under it reads after.
+    span_tops = np.sort(y0[spanning])
+    band = np.searchsorted(span_tops, y0, side="right")
+    return np.lexsort((x0, y0, column, band))
 
 
 def _is_header_footer(text: str, page_height: float, y0: float, 
@@ -173,121 +346,333 @@ def _is_header_footer(text: str, page_height: float, y0: float,
     return False
 
 
+def _layout_block(
+    b: dict,
+    page_num: int,
+    page_height: float,
+    total_pages: int,
+    lines: Optional[List[str]] = None,
+) -> Optional[TextBlock]:
+    """Build a TextBlock from a dict-mode block; lines may be pre-joined."""
+    if lines is None:
+        lines = []
+        for line in b.get("lines", []):
+            line_text = _join_spans(line.get("spans", []))
+            if line_text:
+                lines.append(line_text)
+    
+    text = merge_hyphenated_lines(lines)
+    if not text.strip():
+        return None
+    
+    x0, y0, x1, y1 = b.get("bbox", (0, 0, 0, 0))
+    
+    spans = []
+    for line in b.get("lines", []):
+        spans.extend(line.get("spans", []))
+    
+    font_size = max((s.get("size", 0) for s in spans), default=0)
+    font_name = spans[0].get("font", "") if spans else ""
+    is_bold = "bold" in font_name.lower() or "bd" in font_name.lower()
+    
+    if _is_header_footer(text, page_height, y0, page_num, total_pages):
+        return None
+    
+    return TextBlock(
+        text=text,
+        x0=x0,
+        y0=y0,
+        x1=x1,
+        y1=y1,
+        font_size=font_size,
+        font_name=font_name,
+        is_bold=is_bold,
+        page_num=page_num
+    )
+
+
 def _extract_blocks_with_layout(page: fitz.Page) -> List[TextBlock]:
     """Extract blocks with layout information."""
-    blocks = []
-    data = page.get_text("dict")
-    page_width = page.rect.width
+    data = page.get_text("dict", flags=LAYOUT_TEXT_FLAGS)
+    page_num = page.number + 1
     page_height = page.rect.height
+    total_pages = len(page.parent)
     
+    blocks = []
     for b in data.get("blocks", []):
         if b.get("type") != 0:
             continue
-            
-        lines = []
-        for line in b.get("lines", []):
-            line_text = _join_spans(line.get("spans", []))
-            if line_text:
-                lines.append(line_text)
-        
-        text = _merge_hyphenated_lines(lines)
-        if not text.strip():
+        block = _layout_block(b, page_num, page_height, total_pages)
+        if block is not None:
+            blocks.append(block)
+    
+    return blocks
+
+
+def _is_body_block(text: str) -> bool:
+    """
+    True for blocks the detector can never treat as a heading or running
+    header: sentence-terminated or long, and not opening like a numbered or
+    chapter heading. Lengths carry slack for span-joining differences.
+    """
+    if _HEADING_START.match(text):
+        return False
+    return text.endswith(".") or len(text) >= TIERED_MIN_BODY_CHARS
+
+
+def _extract_blocks_tiered(page: fitz.Page) -> List[TextBlock]:
+    """
+    Two-tier variant of _extract_blocks_with_layout sharing one TextPage.
+    A cheap block pass takes body text as-is; the span-level dict is built only
+    when the page has heading candidates or span-sensitive (math) lines, and
+    then only those are joined span by span.
+    Body blocks on pages that never needed the dict carry no font info
+    (font_size 0), which _detect_font_threshold already ignores.
+    """
+    textpage = page.get_textpage(flags=LAYOUT_TEXT_FLAGS)
+    page_num = page.number + 1
+    page_height = page.rect.height
+    total_pages = len(page.parent)
+    margin = page_height * 0.08
+    
+    plans = []
+    needs_dict = False
+    for x0, y0, x1, y1, text, number, kind in textpage.extractBLOCKS():
+        if kind != 0:
             continue
-        
-        x0, y0, x1, y1 = b.get("bbox", (0, 0, 0, 0))
-        
-        spans = []
-        for line in b.get("lines", []):
-            spans.extend(line.get("spans", []))
-        
-        font_size = max((s.get("size", 0) for s in spans), default=0)
-        font_name = spans[0].get("font", "") if spans else ""
-        is_bold = "bold" in font_name.lower() or "bd" in font_name.lower()
-        
-        if _is_header_footer(text, page_height, y0, page.number + 1, len(page.parent)):
+        if y0 < margin or y0 > page_height - margin:
+            # Dropped as header/footer whatever its text says.
             continue
-        
-        blocks.append(TextBlock(
-            text=text,
-            x0=x0,
-            y0=y0,
-            x1=x1,
-            y1=y1,
-            font_size=font_size,
-            font_name=font_name,
-            is_bold=is_bold,
-            page_num=page.number + 1
-        ))
+        if not _is_body_block(text.strip()):
+            plans.append((number, None, None))
+            needs_dict = True
+            continue
+        lines = text[:-1].split("\n") if text.endswith("\n") else text.split("\n")
+        sensitive = [bool(_SPAN_SENSITIVE.search(line)) for line in lines]
+        needs_dict = needs_dict or any(sensitive)
+        plans.append((number, (x0, y0, x1, y1), (lines, sensitive)))
+    
+    dict_blocks = {}
+    if needs_dict:
+        for b in textpage.extractDICT()["blocks"]:
+            if b.get("type") == 0:
+                dict_blocks[b["number"]] = b
+    
+    blocks = []
+    for number, bbox, body in plans:
+        b = dict_blocks.get(number)
+        if body is None:
+            block = _layout_block(b, page_num, page_height, total_pages)
+        else:
+            lines, sensitive = body
+            dict_lines = b.get("lines", []) if b is not None else None
+            if dict_lines is not None and len(dict_lines) != len(lines):
+                block = _layout_block(b, page_num, page_height, total_pages)
+            else:
+                joined = []
+                for i, line in enumerate(lines):
+                    if sensitive[i]:
+                        line_text = _join_spans(dict_lines[i].get("spans", []))
+                    else:
+                        line_text = normalize_text(line).strip()
+                    if line_text:
+                        joined.append(line_text)
+                if b is not None:
+                    block = _layout_block(b, page_num, page_height, total_pages, joined)
+                else:
+                    block = _cheap_block(joined, bbox, page_num, page_height, total_pages)
+        if block is not None:
+            blocks.append(block)
     
     return blocks
 
 
+def _cheap_block(
+    lines: List[str],
+    bbox: Tuple[float, float, float, float],
+    page_num: int,
+    page_height: float,
+    total_pages: int,
+) -> Optional[TextBlock]:
+    """TextBlock from block-pass text only; font fields are unknown."""
+    text = merge_hyphenated_lines(lines)
+    if not text.strip():
+        return None
+    x0, y0, x1, y1 = bbox
+    if _is_header_footer(text, page_height, y0, page_num, total_pages):
+        return None
+    return TextBlock(
+        text=text, x0=x0, y0=y0, x1=x1, y1=y1,
+        font_size=0.0, font_name="", is_bold=False, page_num=page_num,
+    )
+
+
+def _find_caption(bbox: Tuple[float, float, float, float], text_blocks: list) -> str:
+    """Closest caption-like text block just below (or else above) a figure."""
+    x0, y0, x1, y1 = bbox
+    best = ""
+    best_gap = CAPTION_MAX_GAP
+    for bx0, by0, bx1, by1, text, *_ in text_blocks:
+        if bx1 < x0 or bx0 > x1 or not CAPTION_PATTERN.match(text):
+            continue
+        gap = by0 - y1 if by0 >= y1 else y0 - by1
+        if 0 <= gap < best_gap:
+            best, best_gap = " ".join(text.split()), gap
+    return best
+
+
+def _index_figures(page: fitz.Page) -> List[FigureRef]:
+    """Image bboxes and captions for one page; image bytes are never decoded."""
+    images = page.get_image_info()
+    if not images:
+        return []
+    text_blocks = page.get_text("blocks", flags=fitz.TEXTFLAGS_BLOCKS)
+    figures = []
+    for image in images:
+        bbox = tuple(round(v, 2) for v in image["bbox"])
+        figures.append(FigureRef(
+            page_num=page.number + 1,
+            bbox=bbox,
+            caption=_find_caption(bbox, text_blocks),
+        ))
+    return figures
+
+
+def extract_figure_index(pdf_path: str | Path) -> List[FigureRef]:
+    """Lightweight figure index (bbox + caption) for a whole PDF."""
+    pdf_path = Path(pdf_path)
+    if not pdf_path.exists():
+        raise FileNotFoundError(f"PDF not found: {pdf_path}")
+    
+    with fitz.open(pdf_path) as doc:
+        return [figure for page in doc for figure in _index_figures(page)]
+
+
 def _extract_text_simple(page: fitz.Page) -> str:
     """Simple text extraction as fallback."""
     text = page.get_text("text")
     lines = text.split("\n")
     cleaned = []
     for line in lines:
-        line = _tighten_math_line(_normalize_text(line.strip()))
+        line = tighten_math_line(normalize_text(line.strip()))
         if line and not line.isdigit():
             cleaned.append(line)
     return "\n\n".join(cleaned)
 
 
-def extract_pdf(pdf_path: str | Path) -> ExtractedPDF:
-    """
-    Extract text and layout from PDF.
-    Returns structured data with position info for section detection.
-    """
-    pdf_path = Path(pdf_path)
-    if not pdf_path.exists():
-        raise FileNotFoundError(f"PDF not found: {pdf_path}")
+def _extract_page(page: fitz.Page, tiered: bool = False) -> ExtractedPage:
+    """Extract one page's ordered blocks (or fallback text)."""
+    page_num = page.number + 1
+    width = page.rect.width
+    height = page.rect.height
+    
+    if tiered:
+        blocks = _extract_blocks_tiered(page)
+    else:
+        blocks = _extract_blocks_with_layout(page)
     
-    extracted = ExtractedPDF(source_path=str(pdf_path))
+    if not blocks:
+        return ExtractedPage(
+            page_num=page_num,
+            width=width,
+            height=height,
+            raw_text=_extract_text_simple(page)
+        )
     
+    extracted = ExtractedPage(page_num=page_num, width=width, height=height, blocks=blocks)
+    order = _reading_order(extracted)
+    if np.any(order[1:] < order[:-1]):
+        extracted.take(order)
+    return extracted
+
+
+def _extract_page_range(
+    pdf_path: str,
+    start: int,
+    stop: int,
+    tiered: bool = False,
+) -> List[ExtractedPage]:
+    """Process-pool worker: open a private document and extract pages [start, stop)."""
+    with fitz.open(pdf_path) as doc:
+        return [_extract_page(doc[i], tiered) for i in range(start, stop)]
+
+
+def _page_ranges(page_count: int, workers: int) -> List[Tuple[int, int]]:
+    """Split pages into contiguous ranges, a few per worker to balance uneven pages."""
+    size = max(1, -(-page_count // (workers * 4)))
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+
+def _read_outline(doc: fitz.Document) -> List[list]:
+    """Outline rows as [depth, title, page_num, y], y being the target's top on the page."""
+    rows = []
+    for depth, title, page_num, dest in doc.get_toc(simple=False):
+        point = dest.get("to") if dest.get("kind") == fitz.LINK_GOTO else None
+        rows.append([depth, title, page_num, float(point.y) if point is not None else None])
+    return rows
+
+
+def read_pdf_metadata(pdf_path: str | Path) -> dict:
+    """Document metadata in the shape stored on ExtractedPDF.metadata."""
     with fitz.open(pdf_path) as doc:
-        extracted.metadata = {
+        return {
             "title": doc.metadata.get("title", ""),
             "author": doc.metadata.get("author", ""),
             "page_count": len(doc),
+            "outline": _read_outline(doc),
         }
-        
-        for page_num, page in enumerate(doc):
-            width = page.rect.width
-            height = page.rect.height
-            
-            blocks = _extract_blocks_with_layout(page)
-            
-            if not blocks:
-                raw_text = _extract_text_simple(page)
-                extracted.pages.append(ExtractedPage(
-                    page_num=page_num + 1,
-                    width=width,
-                    height=height,
-                    raw_text=raw_text
-                ))
-                continue
-            
-            if _detect_columns([{"x0": b.x0, "x1": b.x1} for b in blocks], width):
-                mid = width / 2.0
-                blocks.sort(key=lambda b: (
-                    0 if b.x0 < mid else 1,
-                    b.y0
-                ))
-            else:
-                blocks.sort(key=lambda b: (b.y0, b.x0))
-            
-            raw_text = "\n\n".join(b.text for b in blocks)
-            
-            extracted.pages.append(ExtractedPage(
-                page_num=page_num + 1,
-                width=width,
-                height=height,
-                blocks=blocks,
-                raw_text=raw_text
-            ))
+
+
+def iter_pages(
+    pdf_path: str | Path,
+    workers: int = 1,
+    tiered: bool = False,
+) -> Iterator[ExtractedPage]:
+    """
+    Yield extracted pages in page order without holding the whole document.
+    workers > 1 extracts page ranges in a process pool; output matches the serial path.
+    tiered=True parses spans only where headings or math can occur.
+    """
+    pdf_path = Path(pdf_path)
+    if not pdf_path.exists():
+        raise FileNotFoundError(f"PDF not found: {pdf_path}")
     
-    return extracted
+    with fitz.open(pdf_path) as doc:
+        page_count = len(doc)
+        if workers <= 1 or page_count < 2:
+            for page in doc:
+                yield _extract_page(page, tiered)
+            return
+    
+    ranges = _page_ranges(page_count, workers)
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+        # map() yields in submission order, so pages come back in page order.
+        for pages in pool.map(
+            _extract_page_range,
+            [str(pdf_path)] * len(ranges),
+            [start for start, _ in ranges],
+            [stop for _, stop in ranges],
+            [tiered] * len(ranges),
+        ):
+            yield from pages
+
+
+def extract_pdf(pdf_path: str | Path, workers: int = 1, tiered: bool = False) -> ExtractedPDF:
+    """
+    Extract text and layout from PDF.
+    Returns structured data with position info for section detection.
+    workers > 1 splits page ranges across processes; output matches the serial path.
+    tiered=True parses spans only where headings or math can occur.
+    """
+    pdf_path = Path(pdf_path)
+    if not pdf_path.exists():
+        raise FileNotFoundError(f"PDF not found: {pdf_path}")
+    
+    return ExtractedPDF(
+        source_path=str(pdf_path),
+        pages=list(iter_pages(pdf_path, workers, tiered)),
+        metadata=read_pdf_metadata(pdf_path),
+    )
 
 
 def extract_full_text(pdf_path: str | Path) -> str:
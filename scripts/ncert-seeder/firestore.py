@@ -2,21 +2,54 @@
 """
 Firestore Writer - Write processed curriculum data to Firestore.
 """
+import hashlib
 import json
+import re
 import shutil
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import firebase_admin
 from firebase_admin import credentials, firestore
+from google.cloud.firestore_v1.base_query import FieldFilter
+from google.cloud.firestore_v1.field_path import FieldPath
+from google.cloud.firestore_v1.bulk_writer import (
+    BulkRetry,
+    BulkWriteFailure,
+    BulkWriter,
+    BulkWriterOptions,
+)
 
 from config import (
     ARCHIVE_DIR,
     CLASS_MAPPING,
+    FIRESTORE_BACKOFF_MAX_SECONDS,
+    FIRESTORE_BATCH_RETRY_ROUNDS,
+    FIRESTORE_INITIAL_OPS_PER_SECOND,
+    FIRESTORE_MAX_OPS_PER_SECOND,
+    FIRESTORE_POOL_DOC_MAX_BYTES,
+    FIRESTORE_WRITE_ATTEMPTS,
     OUTPUT_DIR,
+    RETRY_DELAY,
     SERVICE_ACCOUNT_PATH,
     SUBJECT_MAPPING,
 )
+from publish_checkpoint import PublishCheckpoint
+
+# gRPC codes worth retrying: DEADLINE_EXCEEDED, RESOURCE_EXHAUSTED, ABORTED
+# (contention), INTERNAL and UNAVAILABLE.
+RETRYABLE_WRITE_CODES = {4, 8, 10, 13, 14}
+
+# One document per subject listing chapters, topics and subtopic ids/titles,
+# so the app loads its catalog with one small read.
+CATALOG_COLLECTION = "curriculum_catalog"
+# Per-chapter question and flashcard pools, split into parts under the
+# document size limit, so quiz and revision routes skip the full chunks.
+POOL_COLLECTION = "curriculum_pools"
+
+_OUTPUT_NAME = re.compile(r"^(?P<subject>[a-z]+)-class(?P<class_level>\d+)-chapter(?P<chapter>[A-Za-z0-9_-]+)\.json$")
 
 
 def get_firestore_client() -> firestore.Client:
@@ -44,6 +77,23 @@ def build_output_path(subject: str, class_level: str, chapter_num: str) -> Path:
     return OUTPUT_DIR / filename
 
 
+def parse_output_path(path: Path) -> Optional[Tuple[str, str, str]]:
+    """Inverse of build_output_path: (subject, class_level, chapter) or None."""
+    match = _OUTPUT_NAME.match(path.name)
+    if not match:
+        return None
+    subject = SUBJECT_MAPPING.get(match.group("subject"), match.group("subject"))
+    return subject, match.group("class_level"), match.group("chapter")
+
+
+def iter_output_chapters(output_dir: Path = OUTPUT_DIR) -> Iterator[Tuple[Path, str, str, str]]:
+    """Chapter JSON files in output_dir as (path, subject, class_level, chapter)."""
+    for path in sorted(output_dir.glob("*.json")):
+        parsed = parse_output_path(path)
+        if parsed:
+            yield (path, *parsed)
+
+
 def _atomic_write_json(path: Path, payload: Dict[str, Any]) -> None:
     """Write JSON atomically to avoid partial files on interruption."""
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -53,92 +103,591 @@ def _atomic_write_json(path: Path, payload: Dict[str, Any]) -> None:
     temp_path.replace(path)
 
 
-def write_chunks_to_firestore(
-    db: firestore.Client,
+def _chunk_documents(
     chapter_data: Dict[str, Any],
     subject: str,
     class_level: str,
     chapter_num: str,
-) -> Dict[str, str]:
+    counts: Dict[str, int],
+) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
     """
-    Write chapter subtopics into curriculum_chunks collection.
-    Returns the document paths written.
+    Yield (doc_id, document) for each subtopic, tallying counts. Failed
+    subtopics yield None: they are not written, but an already published
+    document for them is left in place.
     """
     normalized_subject = SUBJECT_MAPPING.get(subject.lower(), subject)
     class_id = CLASS_MAPPING.get(str(class_level), f"Class_{class_level}")
     chapter_id = chapter_data.get("id") or f"{normalized_subject.lower()}-{class_level}-{chapter_num}"
     chapter_title = chapter_data.get("title", "")
-
-    chunks_ref = db.collection("curriculum_chunks")
-    batch = db.batch()
-    batch_ops = 0
-    max_batch_ops = 400
-
-    topic_count = 0
-    subtopic_count = 0
-    skipped = 0
-    skipped_failed = 0
+    counts["chapter_id"] = chapter_id
 
     for topic in chapter_data.get("topics", []):
         topic_id = (topic.get("id") or "").strip()
         topic_title = topic.get("title", "")
         if not topic_id:
-            skipped += 1
+            counts["skipped"] += 1
             continue
 
-        topic_count += 1
+        counts["topics"] += 1
 
         for subtopic in topic.get("subtopics", []):
             subtopic_id = (subtopic.get("id") or "").strip()
             subtopic_title = subtopic.get("title", "")
             if not subtopic_id:
-                skipped += 1
+                counts["skipped"] += 1
                 continue
+            doc_id = make_doc_id(normalized_subject, chapter_id, topic_id, subtopic_id)
             if (subtopic.get("status") or "").strip().lower() == "failed":
-                skipped_failed += 1
+                counts["skipped_failed"] += 1
+                yield doc_id, None
                 continue
 
-            subtopic_count += 1
-            doc_id = make_doc_id(normalized_subject, chapter_id, topic_id, subtopic_id)
-            doc_ref = chunks_ref.document(doc_id)
-
-            batch.set(
-                doc_ref,
-                {
-                    "subject": normalized_subject,
-                    "classLevel": class_id,
-                    "chapterId": chapter_id,
-                    "chapterTitle": chapter_title,
-                    "chapterNumber": chapter_num,
-                    "topicId": topic_id,
-                    "topicTitle": topic_title,
-                    "subtopicId": subtopic_id,
-                    "subtopicTitle": subtopic_title,
-                    "content": subtopic,
-                    "updatedAt": firestore.SERVER_TIMESTAMP,
-                },
-                merge=True,
-            )
-            batch_ops += 1
+            counts["subtopics"] += 1
+            yield doc_id, {
+                "subject": normalized_subject,
+                "classLevel": class_id,
+                "chapterId": chapter_id,
+                "chapterTitle": chapter_title,
+                "chapterNumber": chapter_num,
+                "topicId": topic_id,
+                "topicTitle": topic_title,
+                "subtopicId": subtopic_id,
+                "subtopicTitle": subtopic_title,
+                "content": subtopic,
+                "updatedAt": firestore.SERVER_TIMESTAMP,
+            }
+
+
+def _split_by_size(items: List[Dict[str, Any]], max_bytes: int) -> List[List[Dict[str, Any]]]:
+    """Consecutive runs of items whose encoded size stays under max_bytes."""
+    parts: List[List[Dict[str, Any]]] = [[]]
+    size = 0
+    for item in items:
+        item_size = len(json.dumps(item, ensure_ascii=False, separators=(",", ":")).encode("utf-8")) + 1
+        if parts[-1] and size + item_size > max_bytes:
+            parts.append([])
+            size = 0
+        parts[-1].append(item)
+        size += item_size
+    return parts if parts[0] else []
+
+
+def _flashcards(chapter_id: str, chapter_title: str, content: Dict[str, Any], seen: set) -> List[Dict[str, Any]]:
+    """Cards from a subtopic's key terms, then its key concepts, skipping seen keys."""
+    cards = []
+    key_terms = content.get("keyTerms")
+    for term, definition in (key_terms.items() if isinstance(key_terms, dict) else []):
+        key = term.lower().strip()
+        if key and key not in seen:
+            seen.add(key)
+            cards.append({"id": f"{chapter_id}-{key}", "term": term, "definition": definition})
+    for concept in content.get("keyConcepts") or []:
+        if not isinstance(concept, str):
+            continue
+        key = concept.lower().strip()[:50]
+        if key and key not in seen:
+            seen.add(key)
+            cards.append({
+                "id": f"{chapter_id}-concept-{key}",
+                "term": concept,
+                "definition": f"Learn more about {concept} in the chapter {chapter_title}",
+            })
+    return cards
+
+
+def _pool_documents(
+    subject: str,
+    chapter_id: str,
+    chapter_title: str,
+    chapter_num: str,
+    class_id: str,
+    chunks: Dict[str, Dict[str, Any]],
+    max_bytes: int = FIRESTORE_POOL_DOC_MAX_BYTES,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Question-pool and flashcard documents for one chapter, built from its
+    chunk documents (doc id -> document) in chapter order. Each pool is
+    split into parts that stay under max_bytes. Part 0 always exists and
+    carries a small sample the routes read on their own: the first MCQ, and
+    the cards of the first subtopic, in doc id order as a chunk scan sees them.
+    """
+    questions: List[Dict[str, Any]] = []
+    flashcards: List[Dict[str, Any]] = []
+    seen_terms: set = set()
+    for chunk in chunks.values():
+        content = chunk["content"]
+        for question in content.get("questionBank") or []:
+            questions.append({"topicId": chunk["topicId"], "subtopicId": chunk["subtopicId"], "question": question})
+        flashcards.extend(_flashcards(chapter_id, chapter_title, content, seen_terms))
+
+    first_mcq = None
+    for doc_id in sorted(chunks):
+        chunk = chunks[doc_id]
+        mcq = next((q for q in chunk["content"].get("questionBank") or [] if q.get("type") == "mcq"), None)
+        if mcq is not None:
+            first_mcq = {"topicId": chunk["topicId"], "subtopicId": chunk["subtopicId"], "question": mcq}
+            break
+    first_cards = _flashcards(chapter_id, chapter_title, chunks[min(chunks)]["content"], set()) if chunks else []
+    samples = {"questions": first_mcq, "flashcards": first_cards}
+
+    pools: Dict[str, Dict[str, Any]] = {}
+    for kind, items in (("questions", questions), ("flashcards", flashcards)):
+        parts = _split_by_size(items, max_bytes) or [[]]
+        for part, part_items in enumerate(parts):
+            pools[f"{subject}__{chapter_id}__{kind}__{part}"] = {
+                "subject": subject,
+                "classLevel": class_id,
+                "chapterId": chapter_id,
+                "chapterTitle": chapter_title,
+                "chapterNumber": chapter_num,
+                "kind": kind,
+                "part": part,
+                "parts": len(parts),
+                "items": part_items,
+                "updatedAt": firestore.SERVER_TIMESTAMP,
+            }
+        pools[f"{subject}__{chapter_id}__{kind}__0"]["sample"] = samples[kind]
+    return pools
+
+
+def _catalog_chapter(
+    chapter_data: Dict[str, Any],
+    subject: str,
+    chapter_id: str,
+    chapter_num: str,
+    class_id: str,
+    listed: set,
+) -> Dict[str, Any]:
+    """Catalog entry for one chapter, keeping subtopics whose doc id is listed."""
+    topics = []
+    for topic in chapter_data.get("topics", []):
+        topic_id = (topic.get("id") or "").strip()
+        if not topic_id:
+            continue
+        subtopics = []
+        for subtopic in topic.get("subtopics", []):
+            subtopic_id = (subtopic.get("id") or "").strip()
+            if subtopic_id and make_doc_id(subject, chapter_id, topic_id, subtopic_id) in listed:
+                subtopics.append({"id": subtopic_id, "title": subtopic.get("title", "")})
+        if subtopics:
+            topics.append({"id": topic_id, "title": topic.get("title", ""), "subtopics": subtopics})
+    return {
+        "id": chapter_id,
+        "title": chapter_data.get("title", ""),
+        "number": chapter_num,
+        "classLevel": class_id,
+        "topics": topics,
+    }
 
-            if batch_ops >= max_batch_ops:
-                batch.commit()
-                batch = db.batch()
-                batch_ops = 0
 
-    if batch_ops > 0:
-        batch.commit()
+def _without_failed(entry: Dict[str, Any], subject: str, failed_ids: set) -> Dict[str, Any]:
+    """Copy of a catalog entry without subtopics whose write failed."""
+    topics = []
+    for topic in entry["topics"]:
+        subtopics = [
+            subtopic for subtopic in topic["subtopics"]
+            if make_doc_id(subject, entry["id"], topic["id"], subtopic["id"]) not in failed_ids
+        ]
+        if subtopics:
+            topics.append({**topic, "subtopics": subtopics})
+    return {**entry, "topics": topics}
+
+
+def _catalog_from_chunks(db: firestore.Client, subject: str) -> Dict[str, Dict[str, Any]]:
+    """Catalog entries for every chapter already in curriculum_chunks, read without payloads."""
+    query = (
+        db.collection("curriculum_chunks")
+        .where(filter=FieldFilter("subject", "==", subject))
+        .select(["chapterId", "chapterTitle", "chapterNumber", "classLevel",
+                 "topicId", "topicTitle", "subtopicId", "subtopicTitle"])
+    )
+    chapters: Dict[str, Dict[str, Any]] = {}
+    topics: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for snapshot in query.stream():
+        data = snapshot.to_dict() or {}
+        chapter_id, topic_id, subtopic_id = data.get("chapterId"), data.get("topicId"), data.get("subtopicId")
+        if not chapter_id or not topic_id or not subtopic_id:
+            continue
+        chapter = chapters.setdefault(chapter_id, {
+            "id": chapter_id,
+            "title": data.get("chapterTitle", ""),
+            "number": data.get("chapterNumber", ""),
+            "classLevel": data.get("classLevel", ""),
+            "topics": [],
+        })
+        topic = topics.get((chapter_id, topic_id))
+        if topic is None:
+            topic = {"id": topic_id, "title": data.get("topicTitle", ""), "subtopics": []}
+            topics[(chapter_id, topic_id)] = topic
+            chapter["topics"].append(topic)
+        topic["subtopics"].append({"id": subtopic_id, "title": data.get("subtopicTitle", "")})
+    return chapters
+
+
+def update_catalog(db: firestore.Client, subject: str, chapters: Dict[str, Dict[str, Any]]) -> bool:
+    """
+    Merge chapter entries into a subject's catalog document in one
+    transaction; entries without topics remove their chapter. A subject
+    without a catalog yet starts from the chapters already published, so
+    the first catalog does not hide them. Returns whether the document changed.
+    """
+    catalog_ref = db.collection(CATALOG_COLLECTION).document(subject)
+    backfill: Dict[str, Dict[str, Any]] = {}
+    if not catalog_ref.get().exists:
+        backfill = _catalog_from_chunks(db, subject)
+
+    @firestore.transactional
+    def apply(transaction: Any) -> bool:
+        snapshot = catalog_ref.get(transaction=transaction)
+        current = (snapshot.to_dict() or {}).get("chapters", {}) if snapshot.exists else {}
+        merged = dict(current if snapshot.exists else backfill)
+        for chapter_id, entry in chapters.items():
+            if entry["topics"]:
+                merged[chapter_id] = entry
+            else:
+                merged.pop(chapter_id, None)
+        if snapshot.exists and merged == current:
+            return False
+        transaction.set(
+            catalog_ref,
+            {"subject": subject, "chapters": merged, "updatedAt": firestore.SERVER_TIMESTAMP},
+        )
+        return True
 
-    print(f"  Written to: curriculum_chunks ({subtopic_count} documents)")
+    return apply(db.transaction())
 
-    return {
-        "collection": "curriculum_chunks",
-        "chapter_id": chapter_id,
-        "topics_written": str(topic_count),
-        "subtopics_written": str(subtopic_count),
-        "skipped": str(skipped),
-        "skipped_failed": str(skipped_failed),
-    }
+
+def content_hash(document: Dict[str, Any]) -> str:
+    """Stable hash of a chunk document, ignoring the server timestamp."""
+    payload = {key: value for key, value in document.items() if key not in ("updatedAt", "contentHash")}
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:32]
+
+
+class ChunkPublisher:
+    """
+    Publishes curriculum_chunks documents for any number of chapters through
+    one Firestore BulkWriter. Writes go out in parallel batches, throttled by
+    the writer's ramp-up limiter; contention and transient errors are retried
+    with exponential backoff, and writes that still fail are collected.
+    Each document carries a contentHash, so unchanged documents are skipped.
+
+    With a PublishCheckpoint, every committed write is logged as its result
+    arrives; a rerun after a failure skips the logged documents and only
+    sends what was never committed. A chapter whose writes all commit has
+    its checkpoint removed, so the next publish reads Firestore again.
+
+    Once the chunks are flushed, each subject's catalog document is updated
+    in a transaction, listing only subtopics whose chunk is in Firestore.
+    """
+
+    def __init__(
+        self,
+        db: firestore.Client,
+        initial_ops_per_second: int = FIRESTORE_INITIAL_OPS_PER_SECOND,
+        max_ops_per_second: int = FIRESTORE_MAX_OPS_PER_SECOND,
+        max_attempts: int = FIRESTORE_WRITE_ATTEMPTS,
+        force: bool = False,
+    ):
+        self.db = db
+        self.max_attempts = max_attempts
+        self.force = force
+        self.queued = 0
+        self.written = 0
+        self.unchanged = 0
+        self.deleted = 0
+        self.failures: List[Tuple[str, str]] = []
+        # Path -> (ref, document, checkpoint) for writes without a result yet.
+        # A batch whose RPC fails after the client's own retries reports
+        # nothing, so leftovers after a flush mark lost writes.
+        self._pending: Dict[str, Tuple[Any, Optional[Dict[str, Any]], Optional[PublishCheckpoint]]] = {}
+        self._checkpoints: List[PublishCheckpoint] = []
+        # Checkpoints with a write that failed; they are kept for the rerun.
+        self._incomplete: List[PublishCheckpoint] = []
+        # (subject, chapter id, catalog entry) for every published chapter.
+        self._catalog_chapters: List[Tuple[str, str, Dict[str, Any]]] = []
+        self.catalogs_updated = 0
+        self._lock = threading.Lock()
+        self._options = BulkWriterOptions(
+            initial_ops_per_second=initial_ops_per_second,
+            max_ops_per_second=max_ops_per_second,
+            retry=BulkRetry.exponential,
+        )
+        self._writer = self._open_writer()
+
+    def _open_writer(self) -> BulkWriter:
+        writer = self.db.bulk_writer(self._options)
+        writer.on_write_result(self._on_write_result)
+        writer.on_write_error(self._on_write_error)
+        return writer
+
+    def _drain(self) -> None:
+        """
+        Send everything queued and shut the writer down. A flushed BulkWriter
+        has stopped its executor and ignores later flushes, so writes queued
+        after this need a new writer.
+        """
+        # BulkWriter.close() stops accepting operations before it flushes, which
+        # rejects pending retries; flush first so they can still go out.
+        self._writer.flush()
+        self._writer.close()
+
+    def _on_write_result(self, reference: Any, result: Any, writer: BulkWriter) -> None:
+        with self._lock:
+            self.written += 1
+            _, document, checkpoint = self._pending.pop(reference.path, (None, None, None))
+        if checkpoint is not None:
+            checkpoint.record(reference.id, document["contentHash"] if document else None)
+
+    def _on_write_error(self, failure: BulkWriteFailure, writer: BulkWriter) -> bool:
+        if failure.code in RETRYABLE_WRITE_CODES and failure.attempts < self.max_attempts:
+            return True
+        path = failure.operation.reference.path
+        with self._lock:
+            self.failures.append((path, failure.message or f"gRPC code {failure.code}"))
+            _, _, checkpoint = self._pending.pop(path, (None, None, None))
+            if checkpoint is not None:
+                self._incomplete.append(checkpoint)
+        return False
+
+    def _existing_hashes(self, refs: List[Any]) -> Dict[str, Optional[str]]:
+        """contentHash of each existing document, read in one get_all call."""
+        hashes: Dict[str, Optional[str]] = {}
+        if not refs:
+            return hashes
+        for snapshot in self.db.get_all(refs, field_paths=["contentHash"]):
+            if snapshot.exists:
+                data = snapshot.to_dict() or {}
+                hashes[snapshot.id] = data.get("contentHash")
+        return hashes
+
+    def _published_ids(
+        self, subject: str, chapter_id: str, collection: str = "curriculum_chunks"
+    ) -> List[str]:
+        """Ids of every document published for a chapter, from a keys-only query."""
+        query = (
+            self.db.collection(collection)
+            .where(filter=FieldFilter("chapterId", "==", chapter_id))
+            # An empty projection returns every field; project the name only.
+            .select([FieldPath.document_id()])
+        )
+        prefix = f"{subject}__{chapter_id}__"
+        return [snapshot.id for snapshot in query.stream() if snapshot.id.startswith(prefix)]
+
+    def publish(
+        self,
+        chapter_data: Dict[str, Any],
+        subject: str,
+        class_level: str,
+        chapter_num: str,
+        checkpoint: Optional[PublishCheckpoint] = None,
+    ) -> Dict[str, str]:
+        """
+        Sync one chapter's subtopic documents and its question and flashcard
+        pools. Only documents whose content hash changed are written, and
+        documents for subtopics (or pool parts) no longer in the chapter are
+        deleted. Documents the checkpoint already lists at the same hash are
+        not read back. With force=True every document is written, stale ones
+        are still deleted, and the checkpoint starts over.
+        """
+        counts = {"topics": 0, "subtopics": 0, "skipped": 0, "skipped_failed": 0}
+        documents: Dict[str, Dict[str, Any]] = {}
+        retained = set()
+        for doc_id, document in _chunk_documents(
+            chapter_data, subject, class_level, chapter_num, counts
+        ):
+            retained.add(doc_id)
+            if document is not None:
+                document["contentHash"] = content_hash(document)
+                documents[doc_id] = document
+
+        normalized_subject = SUBJECT_MAPPING.get(subject.lower(), subject)
+        chapter_id = str(counts.get("chapter_id", ""))
+        class_id = CLASS_MAPPING.get(str(class_level), f"Class_{class_level}")
+        pools = _pool_documents(
+            normalized_subject, chapter_id, chapter_data.get("title", ""), chapter_num, class_id,
+            documents,
+        )
+        for document in pools.values():
+            document["contentHash"] = content_hash(document)
+
+        # Listed even with force, which only skips the hash comparison, so
+        # a forced republish still deletes removed subtopics and pool parts.
+        published = self._published_ids(normalized_subject, chapter_id)
+        published_pools = self._published_ids(normalized_subject, chapter_id, POOL_COLLECTION)
+
+        if checkpoint is not None:
+            # Registered only once the chapter's writes get queued, so a
+            # publish that fails above leaves its checkpoint untouched.
+            with self._lock:
+                self._checkpoints.append(checkpoint)
+            if self.force:
+                checkpoint.reset()
+
+        changed, unchanged, deleted = self._sync(
+            "curriculum_chunks", documents, [doc_id for doc_id in published if doc_id not in retained], checkpoint
+        )
+        pools_changed, _, pools_deleted = self._sync(
+            POOL_COLLECTION, pools, [doc_id for doc_id in published_pools if doc_id not in pools], checkpoint
+        )
+
+        # Failed subtopics stay listed only if an earlier publish wrote them.
+        listed = set(documents) | (retained & set(published))
+        entry = _catalog_chapter(chapter_data, normalized_subject, chapter_id, chapter_num, class_id, listed)
+        with self._lock:
+            self._catalog_chapters.append((normalized_subject, chapter_id, entry))
+
+        return {
+            "collection": "curriculum_chunks",
+            "chapter_id": chapter_id,
+            "topics_written": str(counts["topics"]),
+            "subtopics_written": str(changed),
+            "unchanged": str(unchanged),
+            "deleted": str(deleted),
+            "pools_written": str(pools_changed + pools_deleted),
+            "skipped": str(counts["skipped"]),
+            "skipped_failed": str(counts["skipped_failed"]),
+        }
+
+    def _sync(
+        self,
+        collection: str,
+        documents: Dict[str, Dict[str, Any]],
+        stale: List[str],
+        checkpoint: Optional[PublishCheckpoint],
+    ) -> Tuple[int, int, int]:
+        """Queue changed documents and deletes for stale ids. Returns (changed, unchanged, deleted)."""
+        collection_ref = self.db.collection(collection)
+        existing: Dict[str, Optional[str]] = {}
+        if not self.force:
+            if checkpoint is not None:
+                existing = {
+                    doc_id: document["contentHash"] for doc_id, document in documents.items()
+                    if checkpoint.is_committed(doc_id, document["contentHash"])
+                }
+            unverified = [doc_id for doc_id in documents if doc_id not in existing]
+            existing.update(self._existing_hashes([collection_ref.document(doc_id) for doc_id in unverified]))
+
+        changed = 0
+        for doc_id, document in documents.items():
+            if doc_id in existing and existing[doc_id] == document["contentHash"]:
+                if checkpoint is not None and not checkpoint.is_committed(doc_id, document["contentHash"]):
+                    checkpoint.record(doc_id, document["contentHash"])
+                continue
+            self._queue(collection_ref.document(doc_id), document, checkpoint)
+            changed += 1
+        for doc_id in stale:
+            self._queue(collection_ref.document(doc_id), None, checkpoint)
+
+        unchanged = len(documents) - changed
+        with self._lock:
+            self.unchanged += unchanged
+            self.deleted += len(stale)
+        return changed, unchanged, len(stale)
+
+    def _queue(
+        self,
+        doc_ref: Any,
+        document: Optional[Dict[str, Any]],
+        checkpoint: Optional[PublishCheckpoint] = None,
+    ) -> None:
+        """Queue a merge-set, or a delete when document is None."""
+        with self._lock:
+            self._pending[doc_ref.path] = (doc_ref, document, checkpoint)
+        self._send(doc_ref, document)
+        self.queued += 1
+
+    def _send(self, doc_ref: Any, document: Optional[Dict[str, Any]]) -> None:
+        if document is None:
+            self._writer.delete(doc_ref)
+        else:
+            self._writer.set(doc_ref, document, merge=True)
+
+    def flush(self) -> None:
+        """Block until every queued write has succeeded or given up."""
+        self._drain()
+        self._writer = self._open_writer()
+
+    def close(self) -> List[Tuple[str, str]]:
+        """
+        Flush and shut down the writer. Writes lost with a failed batch are
+        sent again after an exponential backoff; sets are merges and deletes
+        are idempotent, so resending one that did land is harmless.
+        Returns (doc path, error) for writes that still failed.
+        """
+        self._drain()
+        for attempt in range(FIRESTORE_BATCH_RETRY_ROUNDS):
+            with self._lock:
+                lost = list(self._pending.values())
+            if not lost:
+                break
+            delay = min(FIRESTORE_BACKOFF_MAX_SECONDS, RETRY_DELAY * 2 ** attempt)
+            print(f"  {len(lost)} writes lost with a failed batch; retrying in {delay}s")
+            time.sleep(delay)
+            self._writer = self._open_writer()
+            for doc_ref, document, _ in lost:
+                self._send(doc_ref, document)
+            self._drain()
+        with self._lock:
+            self.failures.extend((path, "batch request failed") for path in sorted(self._pending))
+            self._incomplete.extend(checkpoint for _, _, checkpoint in self._pending.values() if checkpoint)
+            self._pending.clear()
+            checkpoints = list(self._checkpoints)
+        for checkpoint in checkpoints:
+            # A checkpoint is only a resume hint; once its chapter is fully
+            # committed it could go stale against edits made outside this run.
+            if any(checkpoint is incomplete for incomplete in self._incomplete):
+                checkpoint.compact()
+            else:
+                checkpoint.reset()
+        self._update_catalogs()
+        return self.failures
+
+    def _update_catalogs(self) -> None:
+        """Write each published subject's catalog, leaving out failed writes."""
+        failed_ids = {path.rsplit("/", 1)[-1] for path, _ in self.failures}
+        by_subject: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for subject, chapter_id, entry in self._catalog_chapters:
+            if failed_ids:
+                entry = _without_failed(entry, subject, failed_ids)
+            by_subject.setdefault(subject, {})[chapter_id] = entry
+        for subject, chapters in by_subject.items():
+            try:
+                self.catalogs_updated += update_catalog(self.db, subject, chapters)
+            except Exception as e:
+                self.failures.append((f"{CATALOG_COLLECTION}/{subject}", str(e)))
+        self._catalog_chapters.clear()
+
+
+def write_chunks_to_firestore(
+    db: firestore.Client,
+    chapter_data: Dict[str, Any],
+    subject: str,
+    class_level: str,
+    chapter_num: str,
+    force: bool = False,
+    output_path: Optional[Path] = None,
+) -> Dict[str, str]:
+    """
+    Sync chapter subtopics into curriculum_chunks collection.
+    With output_path, committed writes are checkpointed next to the chapter
+    JSON so a failed sync resumes where it stopped.
+    Returns the document paths written.
+    """
+    publisher = ChunkPublisher(db, force=force)
+    checkpoint = PublishCheckpoint(output_path) if output_path else None
+    summary = publisher.publish(chapter_data, subject, class_level, chapter_num, checkpoint=checkpoint)
+    failures = publisher.close()
+    if failures:
+        path, message = failures[0]
+        raise RuntimeError(f"{len(failures)} writes failed (first: {path}: {message})")
+
+    print(
+        f"  Written to: curriculum_chunks ({summary['subtopics_written']} documents, "
+        f"{summary['unchanged']} unchanged, {summary['deleted']} deleted)"
+    )
+    print(f"  Written to: curriculum_pools ({summary['pools_written']} documents)")
+    return summary
 
 
 def archive_pdf(pdf_path: Path, subject: str, class_level: str, chapter: str) -> Path:
@@ -207,6 +756,7 @@ def process_and_write(
     archive: bool = True,
     pdf_path: Optional[Path] = None,
     save_output: bool = True,
+    force: bool = False,
 ) -> Dict[str, Any]:
     """
     Process JSON file and optionally write to Firestore.
@@ -237,7 +787,7 @@ def process_and_write(
         try:
             db = get_firestore_client()
             paths = write_chunks_to_firestore(
-                db, chapter_data, subject, class_level, chapter
+                db, chapter_data, subject, class_level, chapter, force=force, output_path=output_path
             )
             result["written_to_firestore"] = True
             result["firestore_paths"] = paths
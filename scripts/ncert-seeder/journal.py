@@ -0,0 +1,130 @@
+# Append-only progress journal for chapter processing
+"""
+Journal - Append-only JSONL log of finished subtopics next to the chapter JSON.
+Each finished subtopic costs one appended line instead of a full chapter rewrite.
+The journal is replayed on resume and periodically compacted into the
+canonical chapter JSON, after which it is truncated.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from config import JOURNAL_COMPACT_EVERY, JOURNAL_FSYNC_EVERY
+
+
+def journal_path_for(output_path: Path) -> Path:
+    """Journal file that belongs to a chapter JSON path."""
+    return output_path.with_suffix(".journal.jsonl")
+
+
+class ChapterJournal:
+    """Subtopic result journal with batched fsync and compaction."""
+
+    def __init__(
+        self,
+        output_path: Path,
+        fsync_every: int = JOURNAL_FSYNC_EVERY,
+        compact_every: int = JOURNAL_COMPACT_EVERY,
+    ):
+        self.path = journal_path_for(output_path)
+        self.fsync_every = max(1, fsync_every)
+        self.compact_every = max(1, compact_every)
+        self._file = None
+        self._unsynced = 0
+        self._since_compaction = 0
+
+    def _handle(self):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Record one finished subtopic entry."""
+        handle = self._handle()
+        handle.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+        # Flushed lines survive a process crash; fsync batches protect against OS crashes.
+        handle.flush()
+        self._unsynced += 1
+        self._since_compaction += 1
+        if self._unsynced >= self.fsync_every:
+            self.sync()
+
+    def sync(self) -> None:
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self._since_compaction >= self.compact_every
+
+    def replay(
+        self,
+        subtopic_lookup: Dict[str, Dict[str, Any]],
+        unmatched: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> int:
+        """
+        Apply journaled entries onto subtopics by id. Returns entries applied.
+        Entries for ids missing from subtopic_lookup are collected into
+        unmatched (last entry per id wins) when it is given.
+        """
+        if not self.path.exists():
+            return 0
+        applied = 0
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from an interrupted append.
+                    continue
+                if not isinstance(entry, dict):
+                    continue
+                subtopic_id = str(entry.get("id", "")).strip()
+                target = subtopic_lookup.get(subtopic_id)
+                if target is None:
+                    if unmatched is not None and subtopic_id:
+                        unmatched[subtopic_id] = entry
+                    continue
+                target.update(entry)
+                applied += 1
+        self._since_compaction += applied
+        return applied
+
+    def compact(self, save: Callable[[], Any]) -> None:
+        """
+        Persist the canonical JSON via save(), then truncate the journal.
+        A crash between the two only leaves entries that replay idempotently.
+        """
+        self.sync()
+        save()
+        self.reset()
+
+    def reset(self) -> None:
+        """Truncate the journal."""
+        self.close()
+        if self.path.exists():
+            self.path.unlink()
+        self._since_compaction = 0
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+
+def fold_journal_into(
+    output_path: Path,
+    subtopic_lookup: Dict[str, Dict[str, Any]],
+    save: Callable[[], Any],
+) -> Optional[int]:
+    """Replay and compact a leftover journal. Returns entries folded, or None if none."""
+    journal = ChapterJournal(output_path)
+    if not journal.path.exists():
+        return None
+    applied = journal.replay(subtopic_lookup)
+    journal.compact(save)
+    return applied
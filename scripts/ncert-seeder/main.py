@@ -27,29 +27,51 @@ Setup (from project root):
 from __future__ import annotations
 
 import argparse
+import asyncio
+import hashlib
+import itertools
 import json
 import re
 import sys
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
 
 from dotenv import load_dotenv
 
+from book import extract_chapters, find_book_chapters, split_book
+from boilerplate import RunningTextFilter
 from config import (
     BASE_DIR,
     CLASS_MAPPING,
     CLASSES,
+    OUTPUT_DIR,
     PDF_DIR,
     SUBJECTS,
     SUBJECT_MAPPING,
 )
-from detector import extract_all_subtopics
-from extractor import extract_pdf
-from firestore import build_output_path, process_and_write, save_json_output
-from processor import get_gemini_client, process_subtopic
-from validator import validate_chapter
+from detector import iter_subtopics, outline_sections
+from extraction_cache import open_extraction
+from extractor import FigureRef, extract_figure_index
+from firestore import (
+    ChunkPublisher,
+    build_output_path,
+    get_firestore_client,
+    iter_output_chapters,
+    process_and_write,
+    save_json_output,
+)
+from journal import ChapterJournal, fold_journal_into
+from processor import (
+    get_gemini_client,
+    process_subtopic,
+    process_subtopics_concurrently,
+)
+from publish_checkpoint import PublishCheckpoint
+from response_cache import get_response_cache, set_response_cache_enabled
+from validator import PHASE1_FIELDS, validate_chapter, validate_phase1
 
 
 def load_env_files() -> None:
@@ -171,6 +193,7 @@ def _new_subtopic_entry(source: Dict[str, object]) -> Dict[str, object]:
         "page_start": source.get("page_start", 0),
         "page_end": source.get("page_end", 0),
         "status": "pending",
+        "failedPhase": "",
         "error": "",
         "updatedAt": now_iso(),
     }
@@ -269,11 +292,8 @@ def recompute_processing_meta(chapter_data: Dict[str, object]) -> None:
     processing_meta["lastUpdatedAt"] = now_iso()
 
 
-def merge_existing_with_detected(
-    chapter_data: Dict[str, object],
-    detected_subtopics: list[Dict[str, object]],
-) -> Dict[str, Dict[str, object]]:
-    """Ensure existing JSON contains all currently detected subtopics."""
+def index_topics(chapter_data: Dict[str, object]) -> Dict[str, Dict[str, object]]:
+    """Map topic id -> topic object, repairing missing topic/subtopic lists."""
     topics = chapter_data.get("topics")
     if not isinstance(topics, list):
         chapter_data["topics"] = []
@@ -288,30 +308,47 @@ def merge_existing_with_detected(
             topic_index[topic_id] = topic
             if not isinstance(topic.get("subtopics"), list):
                 topic["subtopics"] = []
+    return topic_index
 
-    lookup = build_subtopic_lookup(chapter_data)
 
-    for source in detected_subtopics:
-        topic_id = str(source.get("topic_id", "")).strip()
-        topic_title = str(source.get("topic_title", "")).strip()
-        subtopic_id = str(source.get("subtopic_id", "")).strip()
-
-        if topic_id not in topic_index:
-            topic_obj: Dict[str, object] = {
-                "id": topic_id,
-                "title": topic_title,
-                "subtopics": [],
-            }
-            topics.append(topic_obj)
-            topic_index[topic_id] = topic_obj
-
-        topic_obj = topic_index[topic_id]
-        if subtopic_id not in lookup:
-            entry = _new_subtopic_entry(source)
-            topic_obj["subtopics"].append(entry)
-            lookup[subtopic_id] = entry
-
-    return lookup
+def merge_detected_subtopic(
+    chapter_data: Dict[str, object],
+    topic_index: Dict[str, Dict[str, object]],
+    lookup: Dict[str, Dict[str, object]],
+    source: Dict[str, object],
+) -> Dict[str, object]:
+    """Add one detected subtopic to chapter_data if missing. Returns its entry."""
+    topic_id = str(source.get("topic_id", "")).strip()
+    topic_title = str(source.get("topic_title", "")).strip()
+    subtopic_id = str(source.get("subtopic_id", "")).strip()
+
+    if topic_id not in topic_index:
+        topic_obj: Dict[str, object] = {
+            "id": topic_id,
+            "title": topic_title,
+            "subtopics": [],
+        }
+        chapter_data["topics"].append(topic_obj)
+        topic_index[topic_id] = topic_obj
+
+    if subtopic_id not in lookup:
+        entry = _new_subtopic_entry(source)
+        topic_index[topic_id]["subtopics"].append(entry)
+        lookup[subtopic_id] = entry
+    return lookup[subtopic_id]
+
+
+def figures_on_pages(
+    figures: List[FigureRef],
+    page_start: int,
+    page_end: int,
+) -> list[Dict[str, object]]:
+    """Figure index entries (page, bbox, caption) on pages page_start..page_end."""
+    return [
+        {"page": figure.page_num, "bbox": list(figure.bbox), "caption": figure.caption}
+        for figure in figures
+        if page_start <= figure.page_num <= page_end
+    ]
 
 
 def is_subtopic_completed(subtopic: Dict[str, object]) -> bool:
@@ -321,6 +358,106 @@ def is_subtopic_completed(subtopic: Dict[str, object]) -> bool:
     return bool(subtopic.get("keyConcepts")) and bool(subtopic.get("questionBank"))
 
 
+def apply_processed_subtopic(
+    entry: Dict[str, object],
+    processed: Dict[str, object],
+    source: Dict[str, object],
+) -> None:
+    """Copy processor output into a chapter entry and derive its status."""
+    subtopic_id = str(source.get("subtopic_id", "")).strip()
+    entry["id"] = processed.get("id", subtopic_id)
+    entry["title"] = processed.get("title", source.get("subtopic_title", ""))
+    entry["learningObjectives"] = processed.get("learningObjectives", [])
+    entry["keyConcepts"] = processed.get("keyConcepts", [])
+    entry["keyTerms"] = processed.get("keyTerms", {})
+    entry["examples"] = processed.get("examples", [])
+    entry["misconceptions"] = processed.get("misconceptions", [])
+    entry["questionBank"] = processed.get("questionBank", [])
+    entry["page_start"] = processed.get("page_start", source.get("page_start", 0))
+    entry["page_end"] = processed.get("page_end", source.get("page_end", 0))
+    entry["sourceHash"] = source_content_hash(source)
+    entry["updatedAt"] = now_iso()
+
+    ok_phase1 = bool(entry["keyConcepts"]) and bool(entry["learningObjectives"])
+    ok_phase2 = bool(entry["questionBank"])
+    if ok_phase1 and ok_phase2:
+        entry["status"] = "completed"
+        entry["failedPhase"] = ""
+        entry["error"] = ""
+    elif ok_phase1:
+        entry["status"] = "failed"
+        entry["failedPhase"] = "phase2"
+        entry["error"] = "Phase 2 failed: no questions generated"
+    else:
+        entry["status"] = "failed"
+        entry["failedPhase"] = "phase1"
+        entry["error"] = "Phase 1 failed: no structure extracted"
+
+
+def source_content_hash(source: Dict[str, object]) -> str:
+    """Fingerprint detected subtopic text so stale checkpoints are not reused."""
+    content = str(source.get("content", ""))
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+
+def checkpointed_phase1(
+    entry: Dict[str, object],
+    source: Dict[str, object],
+) -> Optional[Dict[str, object]]:
+    """Return saved Phase 1 output when only Phase 2 needs to run again."""
+    if str(entry.get("status", "")).lower() != "failed":
+        return None
+    failed_phase = entry.get("failedPhase")
+    if failed_phase is None:
+        # Entries saved before failedPhase existed only carry the error text.
+        failed_phase = "phase2" if str(entry.get("error", "")).startswith("Phase 2") else "phase1"
+    if failed_phase != "phase2":
+        return None
+    saved_hash = entry.get("sourceHash")
+    if saved_hash and saved_hash != source_content_hash(source):
+        return None
+    is_valid, _ = validate_phase1(entry)
+    if not is_valid:
+        return None
+    return {field: entry.get(field) for field in (*PHASE1_FIELDS, "misconceptions")}
+
+
+def run_targets(
+    client: object,
+    targets: Iterable[Dict[str, object]],
+    class_level: str,
+    concurrency: int,
+    record_result: Callable[[Dict[str, object], Dict[str, object]], None],
+    phase1_checkpoints: Dict[str, Dict[str, object]],
+) -> None:
+    """
+    Process targets sequentially or with the async worker pool. targets may
+    be a lazy iterator that fills phase1_checkpoints as it yields.
+    """
+    if concurrency > 1:
+        print(f"\nProcessing subtopics ({concurrency} concurrent)...")
+        asyncio.run(
+            process_subtopics_concurrently(
+                client,
+                targets,
+                class_level,
+                concurrency,
+                record_result,
+                phase1_results=phase1_checkpoints,
+            )
+        )
+        return
+
+    print("\nProcessing subtopics...")
+    for idx, source in enumerate(targets, 1):
+        print(f"\n[{idx}] ", end="", flush=True)
+        subtopic_id = str(source.get("subtopic_id", "")).strip()
+        processed = process_subtopic(
+            client, source, class_level, phase1_result=phase1_checkpoints.get(subtopic_id)
+        )
+        record_result(source, processed)
+
+
 def _extract_numeric_subtopic_id(value: str) -> str:
     """Extract numeric id prefix like 6.4.5 from a title/id string."""
     match = re.search(r"\b(\d+(?:\.\d+)+)\b", value or "")
@@ -360,6 +497,334 @@ def load_json_file(path: Path) -> Dict[str, object]:
     return data
 
 
+def run_chapter(
+    args: argparse.Namespace,
+    subject: str,
+    class_level: str,
+    chapter: str,
+    pdf_path: Path,
+) -> bool:
+    """Dry-run one chapter PDF: extract, detect, process and save its JSON."""
+    output_path = build_output_path(subject, class_level, chapter)
+
+    print(f"\nProcessing: {pdf_path.name}")
+    print("-" * 40)
+
+    print("Step 1: Extracting PDF text...")
+    metadata, pages, cache_hit = open_extraction(
+        pdf_path,
+        workers=args.extract_workers,
+        use_cache=not args.no_extract_cache,
+        tiered=args.tiered_extract,
+    )
+    source = "extraction cache" if cache_hit else "PDF"
+    print(f"  Streaming {metadata['page_count']} pages from {source}")
+    figures: Optional[List[FigureRef]] = None
+    if not args.no_figure_index:
+        figures = extract_figure_index(pdf_path)
+        print(f"  Indexed {len(figures)} figures")
+
+    running_text = None
+    if not args.keep_running_text:
+        running_text = RunningTextFilter()
+        pages = running_text(pages)
+
+    chapter_data: Dict[str, object]
+    if output_path.exists() and not args.fresh:
+        print("Step 2: Loading existing output for resume...")
+        try:
+            chapter_data = load_json_file(output_path)
+        except Exception as e:
+            print(f"ERROR: Could not load existing JSON ({output_path}): {e}")
+            print("Run with --fresh to rebuild.")
+            return False
+    else:
+        print("Step 2: Creating new chapter output...")
+        chapter_data = build_initial_chapter_structure("Untitled", [], chapter, subject, class_level)
+
+    chapter_data["id"] = f"{subject.lower()}-{class_level}-{chapter}"
+    chapter_data["subject"] = subject
+    chapter_data["classLevel"] = CLASS_MAPPING.get(class_level, f"Class_{class_level}")
+    chapter_data["chapterNumber"] = chapter
+
+    topic_index = index_topics(chapter_data)
+    subtopic_lookup = build_subtopic_lookup(chapter_data)
+
+    def save_chapter() -> None:
+        recompute_processing_meta(chapter_data)
+        save_json_output(chapter_data, subject, class_level, chapter, output_path=output_path)
+
+    journal = ChapterJournal(output_path)
+    # Results for subtopics the JSON does not list yet, left by a run that
+    # stopped before detection finished. Applied as each one is detected.
+    journaled: Dict[str, Dict[str, object]] = {}
+    if args.fresh:
+        journal.reset()
+    else:
+        replayed = journal.replay(subtopic_lookup, unmatched=journaled)
+        if replayed or journaled:
+            print(f"  Replayed {replayed + len(journaled)} journaled subtopic results")
+
+    print("Step 3: Detecting structure...")
+    outline = None
+    if not args.ignore_outline:
+        outline = outline_sections(metadata.get("outline"), metadata["page_count"])
+    if outline is not None:
+        print(f"  Using PDF outline ({len(outline)} sections)")
+
+    retry_id = args.retry_subtopic.strip() if args.retry_subtopic else ""
+    phase1_checkpoints: Dict[str, Dict[str, object]] = {}
+    detected = 0
+    detection_done = False
+    retry_found = False
+    chapter_title = ""
+
+    def detect_targets() -> Iterator[Dict[str, object]]:
+        """
+        Merge subtopics into chapter_data as they are detected and yield the
+        ones to process, so Gemini work starts while later pages are still
+        being extracted. The JSON is first saved once detection finishes;
+        until then results only go to the journal.
+        """
+        nonlocal detected, detection_done, retry_found, chapter_title
+        for source in iter_subtopics(pages, outline=outline):
+            detected += 1
+            if not chapter_title and source.get("chapter_title"):
+                chapter_title = str(source["chapter_title"])
+            subtopic_id = str(source.get("subtopic_id", "")).strip()
+            existing = merge_detected_subtopic(chapter_data, topic_index, subtopic_lookup, source)
+            if subtopic_id in journaled:
+                existing.update(journaled.pop(subtopic_id))
+            if figures is not None:
+                existing["figures"] = figures_on_pages(
+                    figures, int(source.get("page_start", 0)), int(source.get("page_end", 0))
+                )
+            if retry_id:
+                if matches_retry_target(source, retry_id):
+                    retry_found = True
+                    yield source
+                continue
+            if args.retry_failed and str(existing.get("status", "")).lower() != "failed":
+                continue
+            if not args.fresh and is_subtopic_completed(existing):
+                continue
+            phase1 = None if args.fresh else checkpointed_phase1(existing, source)
+            if phase1:
+                phase1_checkpoints[subtopic_id] = phase1
+            yield source
+
+        detection_done = True
+        if running_text is not None and running_text.dropped_blocks:
+            print(
+                f"  Stripped {running_text.dropped_blocks} running header/footer blocks "
+                f"(~{running_text.tokens_saved()} tokens)"
+            )
+        print(f"  Found {detected} subtopics")
+        if detected:
+            chapter_data["title"] = normalize_chapter_title(chapter_title or "Untitled", chapter)
+            journal.compact(save_chapter)
+            print(f"  JSON initialized: {output_path}")
+
+    # Pages are consumed as they are extracted and never held all at once.
+    targets = detect_targets()
+    first_target = next(targets, None)
+    if first_target is None:
+        if not detected:
+            print("ERROR: No subtopics detected. Check PDF format.")
+            return False
+        if retry_id and not retry_found:
+            print(f"ERROR: Subtopic id '{retry_id}' not found in detected structure.")
+            return False
+        print("Step 4: No pending subtopics to process.")
+    else:
+        print("Step 4: Processing with Gemini as subtopics are detected (incremental save)...")
+        set_response_cache_enabled(not args.no_cache)
+        try:
+            client = get_gemini_client()
+        except ValueError as e:
+            print(f"ERROR: {e}")
+            return False
+
+        completed = 0
+
+        def record_result(source: Dict[str, object], processed: Dict[str, object]) -> None:
+            nonlocal completed
+            completed += 1
+            subtopic_id = str(source.get("subtopic_id", "")).strip()
+            entry = subtopic_lookup[subtopic_id]
+            apply_processed_subtopic(entry, processed, source)
+            journal.append(entry)
+            # Compacting before detection finishes would save a partial chapter
+            # and truncate journaled results for subtopics not detected yet.
+            if detection_done and journal.needs_compaction:
+                journal.compact(save_chapter)
+                print(f"    Saved: {output_path.name}")
+            else:
+                print(f"    Journaled: {journal.path.name}")
+
+        try:
+            run_targets(
+                client,
+                itertools.chain([first_target], targets),
+                class_level,
+                args.concurrency,
+                record_result,
+                phase1_checkpoints,
+            )
+        finally:
+            journal.close()
+
+        print(f"\n[OK] Completed {completed} targeted subtopics")
+        if phase1_checkpoints:
+            print(f"  Resumed {len(phase1_checkpoints)} of them from Phase 2")
+        cache = get_response_cache()
+        if cache.enabled:
+            print(f"  Response cache: {cache.hits} hits, {cache.misses} misses")
+
+    print("Step 5: Validating...")
+    is_valid, report = validate_chapter(chapter_data)
+    print(f"  Valid: {is_valid}")
+    if not is_valid:
+        print(f"  Errors: {len(report.get('errors', []))}")
+        for err in report.get("errors", [])[:10]:
+            print(f"    - {err}")
+
+    journal.compact(save_chapter)
+    print("Step 6: Saved final dry-run JSON.")
+
+    print("\n" + "=" * 60)
+    print("COMPLETE!")
+    print("=" * 60)
+    print(f"JSON: {output_path}")
+    print("\nTo write to Firestore, run with --write flag")
+    return True
+
+
+def run_book(args: argparse.Namespace, subject: str, class_level: str) -> bool:
+    """
+    Dry-run a whole-textbook PDF: split it into chapters and run each one
+    through run_chapter, book_workers chapters at a time.
+    """
+    book_path = PDF_DIR / args.book
+    if not book_path.exists():
+        print(f"PDF not found: {book_path}")
+        return False
+
+    print(f"\nBook: {book_path.name}")
+    chapters = find_book_chapters(book_path)
+    if not chapters:
+        print("ERROR: No chapter boundaries found in the outline or headings.")
+        return False
+    for chapter in chapters:
+        print(f"  Chapter {chapter.number}: {chapter.title} (pages {chapter.page_start}-{chapter.page_end})")
+
+    split_book(book_path, chapters)
+    print(f"Extracting {len(chapters)} chapters ({args.book_workers} processes)...")
+    extract_chapters(chapters, args.book_workers, args.tiered_extract)
+
+    # Threads share the Gemini rate limiter and response cache, so parallel
+    # chapters stay within one quota; pages now come from the extraction cache.
+    print(f"Processing {len(chapters)} chapters ({args.book_workers} at a time)...")
+    with ThreadPoolExecutor(max_workers=args.book_workers) as pool:
+        futures = [
+            pool.submit(run_chapter, args, subject, class_level, chapter.number, chapter.pdf_path)
+            for chapter in chapters
+        ]
+    failed = []
+    lines = []
+    for chapter, future in zip(chapters, futures):
+        error = future.exception()
+        ok = error is None and future.result()
+        if not ok:
+            failed.append(chapter.number)
+        status = "OK" if ok else f"FAILED ({error})" if error else "FAILED"
+        output_path = build_output_path(subject, class_level, chapter.number)
+        lines.append(f"  Chapter {chapter.number}: {status} -> {output_path}")
+
+    print("\n" + "=" * 60)
+    print("BOOK COMPLETE!" if not failed else f"BOOK DONE: {len(failed)} chapter(s) failed")
+    print("=" * 60)
+    print("\n".join(lines))
+    if not failed:
+        print("\nTo write to Firestore, run each chapter with --write")
+    return not failed
+
+
+def run_write_all(args: argparse.Namespace) -> bool:
+    """
+    Publish every chapter JSON in output/ (optionally one class/subject) in a
+    single run: one Firestore client and one BulkWriter for all chapters.
+    """
+    subject_filter = normalize_subject(args.subject) if args.subject else ""
+    chapters = [
+        entry for entry in iter_output_chapters()
+        if (not args.class_level or entry[2] == args.class_level.strip())
+        and (not subject_filter or entry[1] == subject_filter)
+    ]
+    print(f"\nFound {len(chapters)} chapter JSON files in {OUTPUT_DIR}")
+    if not chapters:
+        return False
+
+    try:
+        db = get_firestore_client()
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}")
+        return False
+
+    publisher = ChunkPublisher(db, force=args.force_write)
+    skipped = []
+    documents = 0
+    for json_path, subject, class_level, chapter in chapters:
+        try:
+            chapter_data = load_json_file(json_path)
+        except Exception as e:
+            print(f"  SKIP {json_path.name}: could not load JSON ({e})")
+            skipped.append(json_path.name)
+            continue
+
+        def save_loaded_chapter() -> None:
+            recompute_processing_meta(chapter_data)
+            save_json_output(chapter_data, subject, class_level, chapter, output_path=json_path)
+
+        fold_journal_into(json_path, build_subtopic_lookup(chapter_data), save_loaded_chapter)
+        is_valid, report = validate_chapter(chapter_data)
+        if not is_valid:
+            print(f"  SKIP {json_path.name}: {len(report.get('errors', []))} validation errors")
+            skipped.append(json_path.name)
+            continue
+
+        try:
+            summary = publisher.publish(
+                chapter_data, subject, class_level, chapter, checkpoint=PublishCheckpoint(json_path)
+            )
+        except Exception as e:
+            print(f"  SKIP {json_path.name}: could not read published documents ({e})")
+            skipped.append(json_path.name)
+            continue
+        documents += int(summary["subtopics_written"]) + int(summary["deleted"]) + int(summary["pools_written"])
+        print(
+            f"  {json_path.name}: {summary['subtopics_written']} changed, "
+            f"{summary['unchanged']} unchanged, {summary['deleted']} to delete, "
+            f"{summary['pools_written']} pool documents"
+        )
+
+    print(f"Syncing {documents} documents in curriculum_chunks and curriculum_pools...")
+    failures = publisher.close()
+
+    print("\n" + "=" * 60)
+    print("COMPLETE!" if not failures and not skipped else "FINISHED WITH ERRORS")
+    print("=" * 60)
+    print(f"Written: {publisher.written} document changes from {len(chapters) - len(skipped)} chapters")
+    print(f"Unchanged: {publisher.unchanged}, deleted: {publisher.deleted}, catalogs updated: {publisher.catalogs_updated}")
+    if skipped:
+        print(f"Skipped chapters: {', '.join(skipped)}")
+    if failures:
+        print(f"Failed writes: {len(failures)}")
+        for path, message in failures[:10]:
+            print(f"    - {path}: {message}")
+    return not failures and not skipped
+
+
 def main() -> None:
     load_env_files()
 
@@ -374,12 +839,79 @@ def main() -> None:
         help="Explicit dry-run mode (default when --write is not set)",
     )
     parser.add_argument("--write", action="store_true", help="Write to Firestore from JSON output")
+    parser.add_argument(
+        "--write-all",
+        action="store_true",
+        help="Write every chapter JSON in output/ to Firestore (filter with --class/--subject)",
+    )
+    parser.add_argument(
+        "--force-write",
+        action="store_true",
+        help="Rewrite every Firestore document ignoring content hashes and the write checkpoint",
+    )
     parser.add_argument("--fresh", action="store_true", help="Rebuild chapter JSON from scratch")
     parser.add_argument("--retry-subtopic", help="Rerun one subtopic id (example: 6.4.2)")
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="Rerun only failed subtopics, resuming each from the phase that failed",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of subtopics to process at once with the async Gemini client",
+    )
+    parser.add_argument(
+        "--extract-workers",
+        type=int,
+        default=1,
+        help="Processes used for PDF page extraction",
+    )
+    parser.add_argument(
+        "--tiered-extract",
+        action="store_true",
+        help="Parse PDF spans only for heading candidates and math lines (faster on prose)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the on-disk Gemini response cache",
+    )
+    parser.add_argument(
+        "--no-extract-cache",
+        action="store_true",
+        help="Re-extract the PDF instead of reading cached pages",
+    )
+    parser.add_argument(
+        "--keep-running-text",
+        action="store_true",
+        help="Keep text that repeats at the same place on many pages (running headers, watermarks)",
+    )
+    parser.add_argument(
+        "--ignore-outline",
+        action="store_true",
+        help="Detect headings from fonts and numbering even when the PDF has an outline",
+    )
+    parser.add_argument(
+        "--no-figure-index",
+        action="store_true",
+        help="Don't record figure positions and captions in the chapter JSON",
+    )
     parser.add_argument("--no-archive", action="store_true", help="Don't archive PDF after write")
     parser.add_argument("--class", dest="class_level", help="Class level (6-12)")
     parser.add_argument("--subject", help="Subject (Science/Maths)")
     parser.add_argument("--chapter", help="Chapter number")
+    parser.add_argument(
+        "--book",
+        help="Whole-textbook PDF (in ./pdf folder) to split into chapters and dry-run",
+    )
+    parser.add_argument(
+        "--book-workers",
+        type=int,
+        default=2,
+        help="Chapters of a --book processed at once",
+    )
 
     args = parser.parse_args()
 
@@ -387,11 +919,36 @@ def main() -> None:
         parser.error("Use either --write or --dry-run, not both.")
     if args.write and args.retry_subtopic:
         parser.error("--retry-subtopic can only be used in dry-run mode.")
+    if args.write and args.retry_failed:
+        parser.error("--retry-failed can only be used in dry-run mode.")
+    if args.retry_subtopic and args.retry_failed:
+        parser.error("Use either --retry-subtopic or --retry-failed, not both.")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1.")
+    if args.extract_workers < 1:
+        parser.error("--extract-workers must be at least 1.")
+    if args.write_all:
+        if args.write or args.dry_run or args.book:
+            parser.error("--write-all cannot be combined with --write, --dry-run or --book.")
+        if args.pdf or args.chapter or args.json:
+            parser.error("--write-all publishes output/; drop --pdf, --chapter and --json.")
+    if args.book:
+        if args.write:
+            parser.error("--book runs dry-run only; write each chapter JSON with --write.")
+        if args.pdf or args.chapter or args.json or args.retry_subtopic:
+            parser.error("--book cannot be combined with --pdf, --chapter, --json or --retry-subtopic.")
+        if args.no_extract_cache:
+            parser.error("--book reads chapters from the extraction cache; drop --no-extract-cache.")
+        if args.book_workers < 1:
+            parser.error("--book-workers must be at least 1.")
 
     print("=" * 60)
     print("NCERT Curriculum Seeder")
     print("=" * 60)
 
+    if args.write_all:
+        sys.exit(0 if run_write_all(args) else 1)
+
     class_level = (args.class_level or prompt_class()).strip()
     if class_level not in CLASSES:
         print(f"Invalid class '{class_level}'. Choose from: {', '.join(CLASSES)}")
@@ -403,6 +960,9 @@ def main() -> None:
         print(f"Invalid subject '{raw_subject}'. Choose from: {', '.join(SUBJECTS)}")
         sys.exit(1)
 
+    if args.book:
+        sys.exit(0 if run_book(args, subject, class_level) else 1)
+
     try:
         chapter = parse_chapter(args.chapter or prompt_chapter())
     except ValueError as err:
@@ -417,8 +977,14 @@ def main() -> None:
     print(f"  Mode: {mode_name}")
     if args.retry_subtopic:
         print(f"  Retry Subtopic: {args.retry_subtopic}")
+    if args.retry_failed:
+        print("  Retry Failed: True")
     if args.fresh:
         print("  Fresh Run: True")
+    if args.concurrency > 1 and not args.write:
+        print(f"  Concurrency: {args.concurrency}")
+    if args.no_cache and not args.write:
+        print("  Response Cache: disabled")
 
     output_path = build_output_path(subject, class_level, chapter)
 
@@ -436,6 +1002,16 @@ def main() -> None:
             print(f"ERROR: Could not load JSON: {e}")
             sys.exit(1)
 
+        def save_loaded_chapter() -> None:
+            recompute_processing_meta(chapter_data)
+            save_json_output(chapter_data, subject, class_level, chapter, output_path=json_path)
+
+        folded = fold_journal_into(
+            json_path, build_subtopic_lookup(chapter_data), save_loaded_chapter
+        )
+        if folded is not None:
+            print(f"  Folded {folded} journaled subtopic results into JSON")
+
         print("Step 2: Validating...")
         is_valid, report = validate_chapter(chapter_data)
         print(f"  Valid: {is_valid}")
@@ -461,6 +1037,7 @@ def main() -> None:
             archive=not args.no_archive,
             pdf_path=pdf_path,
             save_output=False,
+            force=args.force_write,
         )
 
         print("\n" + "=" * 60)
@@ -484,137 +1061,9 @@ def main() -> None:
         print(f"PDF not found: {pdf_path}")
         sys.exit(1)
 
-    print(f"\nProcessing: {pdf_path.name}")
-    print("-" * 40)
-
-    print("Step 1: Extracting PDF text...")
-    extracted = extract_pdf(str(pdf_path))
-    print(f"  Extracted {len(extracted.pages)} pages")
-
-    print("Step 2: Detecting structure...")
-    detected_subtopics = extract_all_subtopics(extracted)
-    print(f"  Found {len(detected_subtopics)} subtopics")
-    if not detected_subtopics:
-        print("ERROR: No subtopics detected. Check PDF format.")
-        sys.exit(1)
-
-    chapter_title = extracted.pages[0].raw_text[:100] if extracted.pages else "Untitled"
-    for st in detected_subtopics:
-        if st.get("chapter_title"):
-            chapter_title = str(st["chapter_title"])
-            break
-
-    chapter_data: Dict[str, object]
-    if output_path.exists() and not args.fresh:
-        print("Step 3: Loading existing output for resume...")
-        try:
-            chapter_data = load_json_file(output_path)
-        except Exception as e:
-            print(f"ERROR: Could not load existing JSON ({output_path}): {e}")
-            print("Run with --fresh to rebuild.")
-            sys.exit(1)
-    else:
-        print("Step 3: Creating new chapter output...")
-        chapter_data = build_initial_chapter_structure(
-            chapter_title, detected_subtopics, chapter, subject, class_level
-        )
-
-    chapter_data["id"] = f"{subject.lower()}-{class_level}-{chapter}"
-    chapter_data["title"] = normalize_chapter_title(chapter_title, chapter)
-    chapter_data["subject"] = subject
-    chapter_data["classLevel"] = CLASS_MAPPING.get(class_level, f"Class_{class_level}")
-    chapter_data["chapterNumber"] = chapter
-
-    subtopic_lookup = merge_existing_with_detected(chapter_data, detected_subtopics)
-    recompute_processing_meta(chapter_data)
-    save_json_output(chapter_data, subject, class_level, chapter, output_path=output_path)
-    print(f"  JSON initialized: {output_path}")
-
-    retry_id = args.retry_subtopic.strip() if args.retry_subtopic else ""
-    if retry_id and not any(matches_retry_target(s, retry_id) for s in detected_subtopics):
-        print(f"ERROR: Subtopic id '{retry_id}' not found in detected structure.")
+    if not run_chapter(args, subject, class_level, chapter, pdf_path):
         sys.exit(1)
 
-    targets = []
-    for source in detected_subtopics:
-        subtopic_id = str(source.get("subtopic_id", "")).strip()
-        existing = subtopic_lookup.get(subtopic_id)
-        if existing is None:
-            continue
-        if retry_id:
-            if matches_retry_target(source, retry_id):
-                targets.append(source)
-            continue
-        if not args.fresh and is_subtopic_completed(existing):
-            continue
-        targets.append(source)
-
-    if targets:
-        print("Step 4: Processing with Gemini (incremental save)...")
-        try:
-            client = get_gemini_client()
-        except ValueError as e:
-            print(f"ERROR: {e}")
-            sys.exit(1)
-
-        total = len(targets)
-        print(f"\nProcessing {total} subtopics...")
-        for idx, source in enumerate(targets, 1):
-            subtopic_id = str(source.get("subtopic_id", "")).strip()
-            print(f"\n[{idx}/{total}] ", end="", flush=True)
-            processed = process_subtopic(client, source, class_level)
-
-            entry = subtopic_lookup[subtopic_id]
-            entry["id"] = processed.get("id", subtopic_id)
-            entry["title"] = processed.get("title", source.get("subtopic_title", ""))
-            entry["learningObjectives"] = processed.get("learningObjectives", [])
-            entry["keyConcepts"] = processed.get("keyConcepts", [])
-            entry["keyTerms"] = processed.get("keyTerms", {})
-            entry["examples"] = processed.get("examples", [])
-            entry["misconceptions"] = processed.get("misconceptions", [])
-            entry["questionBank"] = processed.get("questionBank", [])
-            entry["page_start"] = processed.get("page_start", source.get("page_start", 0))
-            entry["page_end"] = processed.get("page_end", source.get("page_end", 0))
-            entry["updatedAt"] = now_iso()
-
-            ok_phase1 = bool(entry["keyConcepts"]) and bool(entry["learningObjectives"])
-            ok_phase2 = bool(entry["questionBank"])
-            if ok_phase1 and ok_phase2:
-                entry["status"] = "completed"
-                entry["error"] = ""
-            elif ok_phase1:
-                entry["status"] = "failed"
-                entry["error"] = "Phase 2 failed: no questions generated"
-            else:
-                entry["status"] = "failed"
-                entry["error"] = "Phase 1 failed: no structure extracted"
-
-            recompute_processing_meta(chapter_data)
-            save_json_output(chapter_data, subject, class_level, chapter, output_path=output_path)
-            print(f"    Saved: {output_path.name}")
-
-        print(f"\n[OK] Completed {total} targeted subtopics")
-    else:
-        print("Step 4: No pending subtopics to process.")
-
-    print("Step 5: Validating...")
-    is_valid, report = validate_chapter(chapter_data)
-    print(f"  Valid: {is_valid}")
-    if not is_valid:
-        print(f"  Errors: {len(report.get('errors', []))}")
-        for err in report.get("errors", [])[:10]:
-            print(f"    - {err}")
-
-    recompute_processing_meta(chapter_data)
-    save_json_output(chapter_data, subject, class_level, chapter, output_path=output_path)
-    print("Step 6: Saved final dry-run JSON.")
-
-    print("\n" + "=" * 60)
-    print("COMPLETE!")
-    print("=" * 60)
-    print(f"JSON: {output_path}")
-    print("\nTo write to Firestore, run with --write flag")
-
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,109 @@
+# Text normalization shared by extractor and detector
+"""
+Normalizer - Precompiled translate tables and regexes for cleaning extracted
+text, so each span, line and subtopic is processed in as few passes as
+possible. Output is byte-identical to the earlier per-call re.sub chains
+(see benchmarks/bench_normalizer.py and tests/test_normalizer.py).
+"""
+import re
+from typing import List, Tuple
+
+# Characters rewritten or dropped in every extracted span.
+_SPAN_TABLE = str.maketrans({
+    "\u00a0": " ",  # non-breaking space
+    "\u2009": " ",  # thin space
+    "\u2011": "-",  # non-breaking hyphen
+    # Control chars except whitespace controls used for layout.
+    **{chr(c): None for c in (*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F)},
+})
+# Most spans contain none of them; a C-level scan is cheaper than translating.
+_SPAN_CHARS = re.compile("[" + re.escape("".join(map(chr, _SPAN_TABLE))) + "]")
+
+_MATH_MARKER = re.compile(r"[=<>±×÷*/^]")
+# Whitespace after an opening bracket, or before punctuation/closing bracket.
+# Each whitespace run is removed whole, so one pass equals doing them in turn.
+_BRACKET_SPACE = re.compile(r"(?<=[(\[{])\s+|\s+(?=[,.;:%)\]}])")
+# Whitespace around an operator between word characters. This also covers
+# digit/digit division, which is a special case of it.
+_OPERATOR_SPACE = re.compile(r"(?<=\w)\s*([=<>±×÷*/^])\s*(?=\w)")
+
+_BLANK_LINES = re.compile(r"\n{3,}")
+_SPACE_RUNS = re.compile(r" {2,}")
+# Applied in order: a removal can expose a later pattern ("page fig. 1 2").
+_NOISE_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (r"fig\.\s*\d+", r"figure\s*\d+", r"page\s*\d+")
+)
+# The same patterns, case-sensitive, for matching against text.lower(). Apart
+# from U+0130 and U+0131, every character they match case-insensitively
+# lowers to exactly that pattern letter, one character for one, so matches
+# in the lowered text sit at the same offsets as in the original. Literal
+# case-sensitive scans are several times faster than IGNORECASE ones.
+_LOWER_NOISE_PATTERNS = tuple(re.compile(pattern.pattern) for pattern in _NOISE_PATTERNS)
+
+
+def normalize_text(text: str) -> str:
+    """Normalize extracted span text for stable downstream parsing."""
+    if not text:
+        return ""
+    if _SPAN_CHARS.search(text) is None:
+        return text
+    return text.translate(_SPAN_TABLE)
+
+
+def merge_hyphenated_lines(lines: List[str]) -> str:
+    """Merge hyphenated line breaks. Lines must already be normalized."""
+    if not lines:
+        return ""
+    merged = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if line.endswith("-") and i + 1 < len(lines):
+            next_line = lines[i + 1].lstrip()
+            if next_line and next_line[0].islower():
+                merged.append(line[:-1] + next_line)
+                i += 2
+                continue
+        merged.append(line)
+        i += 1
+    return "\n".join(merged)
+
+
+def tighten_math_line(line: str) -> str:
+    """Clean up spacing in math expressions."""
+    if not _MATH_MARKER.search(line):
+        return line
+    line = _BRACKET_SPACE.sub("", line)
+    return _OPERATOR_SPACE.sub(r"\1", line)
+
+
+def _cut(text: str, spans: List[Tuple[int, int]]) -> str:
+    """text without the given ordered, non-overlapping spans."""
+    parts = []
+    last = 0
+    for start, end in spans:
+        parts.append(text[last:start])
+        last = end
+    parts.append(text[last:])
+    return "".join(parts)
+
+
+def clean_content_text(text: str) -> str:
+    """Collapse blank lines and spaces, then drop figure/page references."""
+    # Substring checks are far cheaper than a regex scan that finds nothing.
+    if "\n\n\n" in text:
+        text = _BLANK_LINES.sub("\n\n", text)
+    if "  " in text:
+        text = _SPACE_RUNS.sub(" ", text)
+    if "\u0130" in text or "\u0131" in text:
+        for pattern in _NOISE_PATTERNS:
+            text = pattern.sub("", text)
+        return text.strip()
+    lower = text.lower()
+    for pattern in _LOWER_NOISE_PATTERNS:
+        spans = [match.span() for match in pattern.finditer(lower)]
+        if spans:
+            text = _cut(text, spans)
+            lower = _cut(lower, spans)
+    return text.strip()
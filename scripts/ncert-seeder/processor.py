@@ -4,18 +4,32 @@ Processor - Two-phase LLM processing for content extraction and question generat
 Phase 1: Extract objectives, concepts, terms, examples, misconceptions
 Phase 2: Generate questions from structured data
 """
+import asyncio
 import json
 import os
 import re
 import sys
 import time
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import google.genai as genai
 from google.genai import types
 
-from chunker import count_tokens
-from config import GEMINI_MODEL, GEMINI_MODEL_FALLBACKS, MAX_RETRIES, RETRY_DELAY
+from chunker import chunk_subtopic, count_tokens, plan_chunks
+from config import (
+    DEFAULT_SOURCE_TOKEN_BUDGET,
+    GEMINI_MODEL,
+    GEMINI_MODEL_FALLBACKS,
+    GEMINI_SOURCE_TOKEN_BUDGETS,
+    MAP_REDUCE_MAX_WORKERS,
+    MAX_RETRIES,
+    PHASE2_SOURCE_BUDGET_RATIO,
+    RETRY_DELAY,
+)
+from rate_limiter import get_rate_limiter
+from response_cache import get_response_cache, make_cache_key
+from validator import PHASE1_FIELDS, validate_phase1, validate_phase2
 
 
 PHASE1_SCHEMA = {
@@ -171,14 +185,118 @@ def extract_json(text: str) -> Dict[str, Any]:
         return json.loads(repaired)
 
 
-def trim_text(text: str, max_chars: int = 8000) -> str:
-    """Trim text to fit within token limits."""
-    if len(text) <= max_chars:
-        return text
-    
-    head = text[:int(max_chars * 0.75)].rstrip()
-    tail = text[-int(max_chars * 0.25):].lstrip()
-    return f"{head}\n...\n{tail}"
+def source_token_budget(phase: int = 1) -> int:
+    """Source-text token budget for a phase, sized for the preferred model."""
+    model = _build_model_candidates()[0]
+    budget = GEMINI_SOURCE_TOKEN_BUDGETS.get(model, DEFAULT_SOURCE_TOKEN_BUDGET)
+    if phase == 2:
+        return int(budget * PHASE2_SOURCE_BUDGET_RATIO)
+    return budget
+
+
+def fit_to_token_budget(text: str, budget: int) -> str:
+    """Return text unchanged when it fits, else its leading chunk within budget."""
+    spans = plan_chunks(text, budget, overlap=0)
+    if not spans:
+        return ""
+    start, end, _ = spans[0]
+    return text if len(spans) == 1 else text[start:end]
+
+
+def pack_source_for_questions(
+    content: str,
+    extracted_data: Dict[str, Any],
+    budget: int
+) -> str:
+    """
+    Pack the source passages that mention the most extracted concepts/terms
+    into the token budget, kept in reading order.
+    """
+    spans = plan_chunks(content, max(1, budget // 4), overlap=0)
+    if sum(tokens for _, _, tokens in spans) <= budget:
+        return content
+
+    cues = [str(term).lower() for term in extracted_data.get("keyTerms", {})]
+    for concept in extracted_data.get("keyConcepts", []):
+        cues.extend(w for w in re.findall(r"[a-z]{5,}", str(concept).lower()))
+    cues = list(dict.fromkeys(cues))
+
+    def score(span: Tuple[int, int, int]) -> int:
+        passage = content[span[0]:span[1]].lower()
+        return sum(1 for cue in cues if cue in passage)
+
+    # Stable sort keeps earlier passages ahead on ties.
+    ranked = sorted(range(len(spans)), key=lambda i: -score(spans[i]))
+    chosen = []
+    used = 0
+    for i in ranked:
+        tokens = spans[i][2]
+        if used + tokens > budget:
+            continue
+        chosen.append(i)
+        used += tokens
+
+    return "\n...\n".join(content[spans[i][0]:spans[i][1]] for i in sorted(chosen))
+
+
+def split_for_map_reduce(subtopic_data: Dict[str, Any], budget: int) -> List[Dict[str, Any]]:
+    """Split an oversized subtopic into Phase 1 map inputs. Empty when it fits."""
+    chunks = chunk_subtopic(subtopic_data, max_tokens=budget)
+    if len(chunks) <= 1:
+        return []
+
+    title = subtopic_data.get("subtopic_title", "Untitled")
+    return [
+        {
+            **subtopic_data,
+            "subtopic_title": f"{title} (part {chunk['chunk_index'] + 1} of {chunk['total_chunks']})",
+            "content": chunk["content"],
+        }
+        for chunk in chunks
+    ]
+
+
+# Caps taken from PHASE1_SCHEMA maxItems.
+_PHASE1_LIST_LIMITS = {
+    "learningObjectives": 12,
+    "keyConcepts": 12,
+    "examples": 12,
+    "misconceptions": 8,
+}
+
+
+def merge_phase1_results(partials: List[Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+    """Reduce per-chunk Phase 1 outputs into one, deduplicating in chunk order."""
+    results = [p for p in partials if p]
+    if not results:
+        return None
+
+    merged: Dict[str, Any] = {"keyTerms": {}}
+    for field, limit in _PHASE1_LIST_LIMITS.items():
+        seen = set()
+        items = []
+        # Round-robin across chunks so later sections are represented too.
+        columns = [r.get(field, []) or [] for r in results]
+        for row in range(max(len(c) for c in columns)):
+            for column in columns:
+                if row >= len(column):
+                    continue
+                item = column[row]
+                key = str(item).strip().lower()
+                if key and key not in seen:
+                    seen.add(key)
+                    items.append(item)
+        merged[field] = items[:limit]
+
+    seen_terms = set()
+    for result in results:
+        for term, definition in (result.get("keyTerms") or {}).items():
+            key = str(term).strip().lower()
+            if key and key not in seen_terms:
+                seen_terms.add(key)
+                merged["keyTerms"][term] = definition
+
+    return merged
 
 
 def _safe_console_text(value: object) -> str:
@@ -214,7 +332,115 @@ def _is_missing_model_error(error: Exception) -> bool:
     )
 
 
+def _is_rate_limit_error(error: Exception) -> bool:
+    """Detect 429/quota responses from Gemini API."""
+    msg = str(error).lower()
+    return "429" in msg or "resource_exhausted" in msg or "rate limit" in msg
+
+
+def _estimate_request_tokens(prompt: str, system_instruction: str) -> int:
+    """Estimate input tokens charged against the per-model TPM budget."""
+    return count_tokens(system_instruction) + count_tokens(prompt)
+
+
+def _build_generate_config(
+    system_instruction: str,
+    schema: Dict[str, Any],
+    temperature: float
+) -> types.GenerateContentConfig:
+    """Build the shared structured-output request config."""
+    return types.GenerateContentConfig(
+        system_instruction=system_instruction,
+        temperature=temperature,
+        max_output_tokens=8192,
+        response_mime_type="application/json",
+        response_json_schema=schema
+    )
+
+
+def _report_failure(error: Exception, model_name: str, attempt: int) -> bool:
+    """Log a failed Gemini attempt. Returns True when the model should be skipped."""
+    print(
+        f"  Gemini call failed ({model_name}, attempt {attempt + 1}/{MAX_RETRIES}): {error}"
+    )
+
+    # Model id is unavailable for this API/key; move to next candidate.
+    if _is_missing_model_error(error):
+        print(f"  Model unavailable: {model_name}. Trying fallback model...")
+        return True
+    return False
+
+
+def _request_cache_key(
+    prompt: str,
+    system_instruction: str,
+    schema: Dict[str, Any],
+    temperature: float
+) -> str:
+    """Key a request by everything that shapes its response."""
+    return make_cache_key(
+        models=_build_model_candidates(),
+        prompt=prompt,
+        system_instruction=system_instruction,
+        schema=schema,
+        temperature=temperature,
+        max_output_tokens=8192,
+    )
+
+
 def call_gemini(
+    client: genai.Client,
+    prompt: str,
+    system_instruction: str,
+    schema: Dict[str, Any],
+    temperature: float = 0.1,
+    validate: Optional[Callable[[Dict[str, Any]], bool]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Call Gemini through the persistent response cache. Responses rejected
+    by validate are returned but not cached, so a retry asks again.
+    """
+    key = _request_cache_key(prompt, system_instruction, schema, temperature)
+    return get_response_cache().get_or_compute(
+        key,
+        lambda: _call_gemini_uncached(client, prompt, system_instruction, schema, temperature),
+        validate,
+    )
+
+
+async def call_gemini_async(
+    client: genai.Client,
+    prompt: str,
+    system_instruction: str,
+    schema: Dict[str, Any],
+    temperature: float = 0.1,
+    validate: Optional[Callable[[Dict[str, Any]], bool]] = None
+) -> Optional[Dict[str, Any]]:
+    """Async variant of call_gemini using the client's aio surface."""
+    key = _request_cache_key(prompt, system_instruction, schema, temperature)
+    return await get_response_cache().get_or_compute_async(
+        key,
+        lambda: _call_gemini_uncached_async(
+            client, prompt, system_instruction, schema, temperature
+        ),
+        validate,
+    )
+
+
+def _phase1_ok(data: Dict[str, Any]) -> bool:
+    return validate_phase1(data)[0]
+
+
+def _phase1_part_ok(data: Dict[str, Any]) -> bool:
+    # Map-reduce parts are merged before the minimum counts apply.
+    return all(field in data for field in PHASE1_FIELDS)
+
+
+def _phase2_ok(data: Dict[str, Any]) -> bool:
+    return validate_phase2(data)[0]
+
+
+def _call_gemini_uncached(
     client: genai.Client,
     prompt: str,
     system_instruction: str,
@@ -224,20 +450,18 @@ def call_gemini(
     """Call Gemini API with retry logic."""
     last_error = None
     model_candidates = _build_model_candidates()
+    config = _build_generate_config(system_instruction, schema, temperature)
+    limiter = get_rate_limiter()
+    request_tokens = _estimate_request_tokens(prompt, system_instruction)
 
     for model_name in model_candidates:
         for attempt in range(MAX_RETRIES):
             try:
+                limiter.acquire(model_name, request_tokens)
                 response = client.models.generate_content(
                     model=model_name,
                     contents=prompt,
-                    config=types.GenerateContentConfig(
-                        system_instruction=system_instruction,
-                        temperature=temperature,
-                        max_output_tokens=8192,
-                        response_mime_type="application/json",
-                        response_json_schema=schema
-                    )
+                    config=config
                 )
 
                 if not response.text:
@@ -247,51 +471,109 @@ def call_gemini(
 
             except Exception as e:
                 last_error = e
-                print(
-                    f"  Gemini call failed ({model_name}, attempt {attempt + 1}/{MAX_RETRIES}): {e}"
-                )
-
-                # Model id is unavailable for this API/key; move to next candidate.
-                if _is_missing_model_error(e):
-                    print(f"  Model unavailable: {model_name}. Trying fallback model...")
+                if _report_failure(e, model_name, attempt):
                     break
 
+                # Quota errors pause every worker on this model via the limiter,
+                # whose next acquire does the waiting.
+                if _is_rate_limit_error(e):
+                    limiter.cooldown(model_name, RETRY_DELAY * (attempt + 1))
+                    continue
+
                 if attempt < MAX_RETRIES - 1:
                     time.sleep(RETRY_DELAY * (attempt + 1))
-    
+
+        # Repeated 429s are a quota problem, not a model problem: a fallback
+        # would spend a second model's quota on the same request.
+        if _is_rate_limit_error(last_error):
+            print(f"  Still rate limited on {model_name}; not switching models")
+            break
+
     print(f"  All attempts failed: {last_error}")
     return None
 
 
-def phase1_extract_structure(
+async def _call_gemini_uncached_async(
     client: genai.Client,
-    subtopic_data: Dict[str, Any],
-    grade_level: str
+    prompt: str,
+    system_instruction: str,
+    schema: Dict[str, Any],
+    temperature: float = 0.1
 ) -> Optional[Dict[str, Any]]:
-    """
-    Phase 1: Extract learning objectives, concepts, terms, examples, misconceptions.
-    """
-    content = subtopic_data.get("content", "")
-    title = subtopic_data.get("subtopic_title", "Untitled")
-    topic = subtopic_data.get("topic_title", "")
-    
-    if not content:
-        return None
-    
-    system_instruction = """You are a curriculum designer extracting content from a science textbook.
+    """Async Gemini call with retry logic."""
+    last_error = None
+    model_candidates = _build_model_candidates()
+    config = _build_generate_config(system_instruction, schema, temperature)
+    limiter = get_rate_limiter()
+    request_tokens = _estimate_request_tokens(prompt, system_instruction)
+
+    for model_name in model_candidates:
+        for attempt in range(MAX_RETRIES):
+            try:
+                await limiter.acquire_async(model_name, request_tokens)
+                response = await client.aio.models.generate_content(
+                    model=model_name,
+                    contents=prompt,
+                    config=config
+                )
+
+                if not response.text:
+                    raise ValueError("Empty response from Gemini")
+
+                return extract_json(response.text)
+
+            except Exception as e:
+                last_error = e
+                if _report_failure(e, model_name, attempt):
+                    break
+
+                # Quota errors pause every worker on this model via the limiter,
+                # whose next acquire does the waiting.
+                if _is_rate_limit_error(e):
+                    limiter.cooldown(model_name, RETRY_DELAY * (attempt + 1))
+                    continue
+
+                if attempt < MAX_RETRIES - 1:
+                    await asyncio.sleep(RETRY_DELAY * (attempt + 1))
+
+        # Repeated 429s are a quota problem, not a model problem: a fallback
+        # would spend a second model's quota on the same request.
+        if _is_rate_limit_error(last_error):
+            print(f"  Still rate limited on {model_name}; not switching models")
+            break
+
+    print(f"  All attempts failed: {last_error}")
+    return None
+
+
+PHASE1_SYSTEM_INSTRUCTION = """You are a curriculum designer extracting content from a science textbook.
 Return clean, production-ready JSON. Use only facts explicitly present in SOURCE TEXT.
 Keep language clear and age-appropriate for school students.
 - Each learning objective should start with an action verb
 - Key terms should be single words or short phrases with clear definitions
 - Examples should be concrete and from everyday life
 - Misconceptions should address common student misunderstandings"""
-    
-    prompt = f"""SUBTOPIC: {title}
+
+PHASE2_SYSTEM_INSTRUCTION = """You are a science teacher creating quiz questions.
+Generate questions that test understanding based on the provided concepts and content.
+- MCQ: 4 options (A-D), one correct answer
+- Short: Direct answer questions
+- Reasoning: Explain WHY questions
+All questions must be answerable from the source content."""
+
+
+def build_phase1_prompt(subtopic_data: Dict[str, Any], grade_level: str) -> str:
+    """Build the Phase 1 structure-extraction prompt."""
+    content = subtopic_data.get("content", "")
+    title = subtopic_data.get("subtopic_title", "Untitled")
+    topic = subtopic_data.get("topic_title", "")
+
+    return f"""SUBTOPIC: {title}
 TOPIC: {topic}
 GRADE LEVEL: Class {grade_level}
 
 SOURCE TEXT START >>>
-{trim_text(content, 8000)}
+{fit_to_token_budget(content, source_token_budget(1))}
 <<< SOURCE TEXT END
 
 Extract and return ONLY valid JSON with these fields:
@@ -303,18 +585,13 @@ Extract and return ONLY valid JSON with these fields:
 
 Return JSON only, no markdown fences."""
 
-    return call_gemini(client, prompt, system_instruction, PHASE1_SCHEMA)
-
 
-def phase2_generate_questions(
-    client: genai.Client,
+def build_phase2_prompt(
     subtopic_data: Dict[str, Any],
     extracted_data: Dict[str, Any],
     grade_level: str
-) -> Optional[Dict[str, Any]]:
-    """
-    Phase 2: Generate questions from extracted structure.
-    """
+) -> str:
+    """Build the Phase 2 question-generation prompt."""
     title = subtopic_data.get("subtopic_title", "Untitled")
     topic = subtopic_data.get("topic_title", "")
     content = subtopic_data.get("content", "")
@@ -322,15 +599,8 @@ def phase2_generate_questions(
     concepts = extracted_data.get("keyConcepts", [])
     terms = extracted_data.get("keyTerms", {})
     examples = extracted_data.get("examples", [])
-    
-    system_instruction = """You are a science teacher creating quiz questions.
-Generate questions that test understanding based on the provided concepts and content.
-- MCQ: 4 options (A-D), one correct answer
-- Short: Direct answer questions
-- Reasoning: Explain WHY questions
-All questions must be answerable from the source content."""
 
-    prompt = f"""SUBTOPIC: {title}
+    return f"""SUBTOPIC: {title}
 TOPIC: {topic}
 GRADE LEVEL: Class {grade_level}
 
@@ -344,7 +614,7 @@ EXAMPLES:
 {chr(10).join(f"- {e}" for e in examples[:4])}
 
 SOURCE CONTENT:
-{trim_text(content, 4000)}
+{pack_source_for_questions(content, extracted_data, source_token_budget(2))}
 
 Generate exactly 6 questions:
 - 3 MCQ (multiple choice with 4 options each)
@@ -360,26 +630,102 @@ Return ONLY valid JSON with questionBank array containing objects with:
 
 Return JSON only, no markdown fences."""
 
-    return call_gemini(client, prompt, system_instruction, PHASE2_SCHEMA, temperature=0.2)
 
+def phase1_extract_structure(
+    client: genai.Client,
+    subtopic_data: Dict[str, Any],
+    grade_level: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Phase 1: Extract learning objectives, concepts, terms, examples, misconceptions.
+    Subtopics over the source budget are extracted per chunk in parallel and merged.
+    """
+    if not subtopic_data.get("content", ""):
+        return None
 
-def process_subtopic(
+    parts = split_for_map_reduce(subtopic_data, source_token_budget(1))
+    if not parts:
+        prompt = build_phase1_prompt(subtopic_data, grade_level)
+        return call_gemini(
+            client, prompt, PHASE1_SYSTEM_INSTRUCTION, PHASE1_SCHEMA, validate=_phase1_ok
+        )
+
+    print(f"    Phase 1 map-reduce over {len(parts)} chunks")
+
+    def extract_part(part: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        prompt = build_phase1_prompt(part, grade_level)
+        return call_gemini(
+            client, prompt, PHASE1_SYSTEM_INSTRUCTION, PHASE1_SCHEMA, validate=_phase1_part_ok
+        )
+
+    with ThreadPoolExecutor(max_workers=min(len(parts), MAP_REDUCE_MAX_WORKERS)) as pool:
+        partials = list(pool.map(extract_part, parts))
+    return merge_phase1_results(partials)
+
+
+def phase2_generate_questions(
     client: genai.Client,
     subtopic_data: Dict[str, Any],
+    extracted_data: Dict[str, Any],
     grade_level: str
-) -> Dict[str, Any]:
+) -> Optional[Dict[str, Any]]:
     """
-    Process a single subtopic through both LLM phases.
-    Returns complete subtopic data ready for database.
+    Phase 2: Generate questions from extracted structure.
     """
-    subtopic_id = subtopic_data.get("subtopic_id", "")
-    title = subtopic_data.get("subtopic_title", "")
-    
-    print(f"  Processing: {_safe_console_text(title)}")
-    
-    result = {
-        "id": subtopic_id,
-        "title": title,
+    prompt = build_phase2_prompt(subtopic_data, extracted_data, grade_level)
+    return call_gemini(
+        client, prompt, PHASE2_SYSTEM_INSTRUCTION, PHASE2_SCHEMA, temperature=0.2, validate=_phase2_ok
+    )
+
+
+async def phase1_extract_structure_async(
+    client: genai.Client,
+    subtopic_data: Dict[str, Any],
+    grade_level: str
+) -> Optional[Dict[str, Any]]:
+    """Async variant of phase1_extract_structure."""
+    if not subtopic_data.get("content", ""):
+        return None
+
+    parts = split_for_map_reduce(subtopic_data, source_token_budget(1))
+    if not parts:
+        prompt = build_phase1_prompt(subtopic_data, grade_level)
+        return await call_gemini_async(
+            client, prompt, PHASE1_SYSTEM_INSTRUCTION, PHASE1_SCHEMA, validate=_phase1_ok
+        )
+
+    print(f"    Phase 1 map-reduce over {len(parts)} chunks")
+    semaphore = asyncio.Semaphore(MAP_REDUCE_MAX_WORKERS)
+
+    async def extract_part(part: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            prompt = build_phase1_prompt(part, grade_level)
+            return await call_gemini_async(
+                client, prompt, PHASE1_SYSTEM_INSTRUCTION, PHASE1_SCHEMA, validate=_phase1_part_ok
+            )
+
+    partials = await asyncio.gather(*(extract_part(part) for part in parts))
+    return merge_phase1_results(list(partials))
+
+
+async def phase2_generate_questions_async(
+    client: genai.Client,
+    subtopic_data: Dict[str, Any],
+    extracted_data: Dict[str, Any],
+    grade_level: str
+) -> Optional[Dict[str, Any]]:
+    """Async variant of phase2_generate_questions."""
+    prompt = build_phase2_prompt(subtopic_data, extracted_data, grade_level)
+    return await call_gemini_async(
+        client, prompt, PHASE2_SYSTEM_INSTRUCTION, PHASE2_SCHEMA, temperature=0.2, validate=_phase2_ok
+    )
+
+
+def _empty_subtopic_result(subtopic_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the default subtopic payload before any phase succeeds."""
+    return {
+        "id": subtopic_data.get("subtopic_id", ""),
+        "title": subtopic_data.get("subtopic_title", ""),
         "learningObjectives": [],
         "keyConcepts": [],
         "keyTerms": {},
@@ -389,8 +735,30 @@ def process_subtopic(
         "page_start": subtopic_data.get("page_start", 0),
         "page_end": subtopic_data.get("page_end", 0)
     }
+
+
+def process_subtopic(
+    client: genai.Client,
+    subtopic_data: Dict[str, Any],
+    grade_level: str,
+    phase1_result: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Process a single subtopic through both LLM phases.
+    A previously validated phase1_result skips straight to Phase 2.
+    Returns complete subtopic data ready for database.
+    """
+    title = subtopic_data.get("subtopic_title", "")
     
-    extracted = phase1_extract_structure(client, subtopic_data, grade_level)
+    print(f"  Processing: {_safe_console_text(title)}")
+    
+    result = _empty_subtopic_result(subtopic_data)
+    
+    if phase1_result:
+        extracted = phase1_result
+        print("    Phase 1 reused from checkpoint")
+    else:
+        extracted = phase1_extract_structure(client, subtopic_data, grade_level)
     
     if extracted:
         result.update(extracted)
@@ -409,6 +777,49 @@ def process_subtopic(
     return result
 
 
+async def process_subtopic_async(
+    client: genai.Client,
+    subtopic_data: Dict[str, Any],
+    grade_level: str,
+    phase1_result: Optional[Dict[str, Any]] = None,
+    label: str = ""
+) -> Dict[str, Any]:
+    """
+    Async variant of process_subtopic.
+    Log lines carry the label since several subtopics interleave on stdout.
+    """
+    title = _safe_console_text(subtopic_data.get("subtopic_title", ""))
+    prefix = f"{label} " if label else ""
+
+    print(f"{prefix}Processing: {title}")
+
+    result = _empty_subtopic_result(subtopic_data)
+
+    if phase1_result:
+        extracted = phase1_result
+        print(f"{prefix}Phase 1 reused from checkpoint")
+    else:
+        extracted = await phase1_extract_structure_async(client, subtopic_data, grade_level)
+
+    if extracted:
+        result.update(extracted)
+        print(f"{prefix}Phase 1 complete: {len(extracted.get('keyConcepts', []))} concepts")
+
+        questions = await phase2_generate_questions_async(
+            client, subtopic_data, extracted, grade_level
+        )
+
+        if questions and questions.get("questionBank"):
+            result["questionBank"] = questions["questionBank"]
+            print(f"{prefix}Phase 2 complete: {len(result['questionBank'])} questions")
+        else:
+            print(f"{prefix}Phase 2 failed - no questions generated ({title})")
+    else:
+        print(f"{prefix}Phase 1 failed - no structure extracted ({title})")
+
+    return result
+
+
 def process_all_subtopics(
     client: genai.Client,
     subtopics: list,
@@ -433,6 +844,47 @@ def process_all_subtopics(
     return results
 
 
+async def process_subtopics_concurrently(
+    client: genai.Client,
+    subtopics: Iterable[Dict[str, Any]],
+    grade_level: str,
+    concurrency: int,
+    on_result: Callable[[Dict[str, Any], Dict[str, Any]], None],
+    phase1_results: Optional[Dict[str, Dict[str, Any]]] = None
+) -> None:
+    """
+    Process subtopics with a bounded pool of async workers.
+    subtopics may be a lazy iterator: workers pull the next one as they free
+    up, so processing starts before detection has finished. Pulling runs the
+    iterator on the event loop, which briefly blocks it while the next
+    subtopic is detected.
+    on_result(source, processed) runs on the event loop as each subtopic
+    finishes, so callers can update and save shared state without locking.
+    phase1_results maps subtopic ids to checkpointed Phase 1 output to reuse.
+    """
+    # Not `or {}`: a lazy subtopics iterator fills the caller's dict as it goes.
+    if phase1_results is None:
+        phase1_results = {}
+    pending = enumerate(subtopics, 1)
+
+    async def worker() -> None:
+        while True:
+            item = next(pending, None)
+            if item is None:
+                return
+            idx, source = item
+            processed = await process_subtopic_async(
+                client,
+                source,
+                grade_level,
+                phase1_result=phase1_results.get(source.get("subtopic_id", "")),
+                label=f"[{idx}]",
+            )
+            on_result(source, processed)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+
+
 if __name__ == "__main__":
     import sys
     
@@ -0,0 +1,103 @@
+# Per-chapter log of committed Firestore writes
+"""
+Publish Checkpoint - Append-only JSONL log of the curriculum_chunks documents
+committed for one chapter, with the content hash each was written with.
+A rerun after a failed or interrupted publish skips every document the log
+already holds at the same hash, so only uncommitted writes are sent again.
+The log is removed once every write of the chapter has committed.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from config import JOURNAL_FSYNC_EVERY
+
+
+def checkpoint_path_for(output_path: Path) -> Path:
+    """Checkpoint file that belongs to a chapter JSON path."""
+    return output_path.with_suffix(".published.jsonl")
+
+
+class PublishCheckpoint:
+    """Committed doc id -> content hash, persisted as it grows. Thread-safe."""
+
+    def __init__(self, output_path: Path, fsync_every: int = JOURNAL_FSYNC_EVERY):
+        self.path = checkpoint_path_for(output_path)
+        self.fsync_every = max(1, fsync_every)
+        self.committed: Dict[str, str] = {}
+        self._file = None
+        self._unsynced = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from an interrupted append.
+                    continue
+                if not isinstance(entry, dict) or not entry.get("id"):
+                    continue
+                if entry.get("hash"):
+                    self.committed[entry["id"]] = entry["hash"]
+                else:
+                    self.committed.pop(entry["id"], None)
+
+    def is_committed(self, doc_id: str, content_hash: str) -> bool:
+        return self.committed.get(doc_id) == content_hash
+
+    def record(self, doc_id: str, content_hash: Optional[str]) -> None:
+        """Log a committed write, or a delete when content_hash is None."""
+        line = json.dumps({"id": doc_id, "hash": content_hash}, separators=(",", ":")) + "\n"
+        with self._lock:
+            if content_hash:
+                self.committed[doc_id] = content_hash
+            else:
+                self.committed.pop(doc_id, None)
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+            self._unsynced += 1
+            if self._unsynced >= self.fsync_every:
+                os.fsync(self._file.fileno())
+                self._unsynced = 0
+
+    def compact(self) -> None:
+        """Rewrite the log as one line per committed document."""
+        with self._lock:
+            self._close_file()
+            temp_path = self.path.with_suffix(f"{self.path.suffix}.tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                for doc_id, content_hash in sorted(self.committed.items()):
+                    f.write(json.dumps({"id": doc_id, "hash": content_hash}, separators=(",", ":")) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            temp_path.replace(self.path)
+
+    def reset(self) -> None:
+        """Forget every committed write."""
+        with self._lock:
+            self._close_file()
+            self.committed.clear()
+            if self.path.exists():
+                self.path.unlink()
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            if self._unsynced:
+                os.fsync(self._file.fileno())
+                self._unsynced = 0
+            self._file.close()
+            self._file = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_file()
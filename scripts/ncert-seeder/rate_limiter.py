@@ -0,0 +1,126 @@
+# Client-side request/token pacing for Gemini calls
+"""
+Rate Limiter - Token buckets that pace Gemini calls per model.
+Each model gets a requests-per-minute and a tokens-per-minute bucket.
+Callers reserve capacity up front and sleep until the reservation is covered,
+so concurrent workers queue in arrival order instead of racing into 429s.
+"""
+import asyncio
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from config import DEFAULT_RATE_LIMIT, GEMINI_RATE_LIMITS
+
+
+class TokenBucket:
+    """Continuously refilling bucket that allows borrowing against future refill."""
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self.level = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.level = min(self.capacity, self.level + elapsed * self.rate)
+            self.updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take amount from the bucket. Returns seconds to wait before using it."""
+        if self.capacity <= 0:
+            return 0.0
+        # A single oversized request must still go through eventually.
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            self.level -= amount
+            if self.level >= 0:
+                return 0.0
+            return -self.level / self.rate
+
+    def drain(self, seconds: float) -> None:
+        """Push the bucket into debt so every caller waits at least `seconds`."""
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self.level = min(self.level, -seconds * self.rate)
+
+
+class GeminiRateLimiter:
+    """Per-model RPM + TPM pacing shared by sync and async callers."""
+
+    def __init__(
+        self,
+        limits: Dict[str, Tuple[int, int]],
+        default: Tuple[int, int] = DEFAULT_RATE_LIMIT,
+    ):
+        self._limits = dict(limits)
+        self._default = default
+        self._buckets: Dict[str, Tuple[TokenBucket, TokenBucket]] = {}
+        self._lock = threading.Lock()
+
+    def _buckets_for(self, model: str) -> Tuple[TokenBucket, TokenBucket]:
+        with self._lock:
+            buckets = self._buckets.get(model)
+            if buckets is None:
+                rpm, tpm = self._limits.get(model, self._default)
+                buckets = (TokenBucket(rpm), TokenBucket(tpm))
+                self._buckets[model] = buckets
+            return buckets
+
+    def reserve(self, model: str, tokens: int) -> float:
+        """Reserve one request and `tokens` input tokens. Returns wait seconds."""
+        requests, token_bucket = self._buckets_for(model)
+        return max(requests.reserve(1), token_bucket.reserve(tokens))
+
+    def acquire(self, model: str, tokens: int) -> None:
+        """Block until the model has budget for this call."""
+        delay = self.reserve(model, tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, model: str, tokens: int) -> None:
+        """Await until the model has budget for this call."""
+        delay = self.reserve(model, tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def cooldown(self, model: str, seconds: float) -> None:
+        """Pause every caller of a model after the API reports rate limiting."""
+        requests, _ = self._buckets_for(model)
+        requests.drain(seconds)
+
+
+def parse_rate_limits(value: str) -> Dict[str, Tuple[int, int]]:
+    """Parse overrides like 'gemini-2.5-pro=150:2000000,gemini-2.5-flash=1000:1000000'."""
+    limits: Dict[str, Tuple[int, int]] = {}
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        model, _, budget = item.partition("=")
+        rpm, _, tpm = budget.partition(":")
+        try:
+            limits[model.strip()] = (int(rpm), int(tpm))
+        except ValueError:
+            raise ValueError(f"Invalid rate limit entry '{item}' (expected model=rpm:tpm)")
+    return limits
+
+
+_limiter: Optional[GeminiRateLimiter] = None
+
+
+def get_rate_limiter() -> GeminiRateLimiter:
+    """Return the process-wide limiter, applying GEMINI_RATE_LIMITS overrides."""
+    global _limiter
+    if _limiter is None:
+        limits = dict(GEMINI_RATE_LIMITS)
+        limits.update(parse_rate_limits(os.getenv("GEMINI_RATE_LIMITS", "")))
+        _limiter = GeminiRateLimiter(limits)
+    return _limiter
@@ -0,0 +1,263 @@
+# Persistent cache for structured Gemini responses
+"""
+Response Cache - Content-addressed SQLite store in front of call_gemini.
+Keys hash every input that shapes a response (models, prompts, schema,
+temperature), so re-seeding unchanged source text never pays for the same call.
+Concurrent requests for one key share a single in-flight computation.
+Only responses that pass the caller's validation are stored, so a rejected
+response is requested again instead of being replayed.
+"""
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from config import (
+    RESPONSE_CACHE_MAX_AGE_DAYS,
+    RESPONSE_CACHE_MAX_BYTES,
+    RESPONSE_CACHE_PATH,
+)
+
+# Bump when the stored payload or key layout changes.
+CACHE_VERSION = 1
+
+# Run a prune pass after this many inserts.
+PRUNE_EVERY = 50
+
+
+def make_cache_key(**parts: Any) -> str:
+    """Hash request inputs into a stable hex key."""
+    payload = json.dumps(
+        {"v": CACHE_VERSION, **parts},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed response store with size/age eviction and request coalescing."""
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+        max_age_days: float = RESPONSE_CACHE_MAX_AGE_DAYS,
+        enabled: bool = True,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_days * 86400
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._puts_since_prune = 0
+        self._inflight: Dict[str, threading.Event] = {}
+        # Futures belong to one event loop, and run_book runs a loop per
+        # thread, so async computations are coalesced per (loop, key).
+        self._inflight_async: Dict[Tuple[asyncio.AbstractEventLoop, str], asyncio.Future] = {}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed_at)"
+            )
+            conn.commit()
+            self._conn = conn
+            self.prune()
+        return self._conn
+
+    def get(
+        self,
+        key: str,
+        validate: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Return a cached response, or None on miss/expiry/bypass/rejection."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            now = time.time()
+            if row is None or now - row[1] > self.max_age_seconds:
+                self.misses += 1
+                return None
+            value = json.loads(row[0])
+            if validate is not None and not validate(value):
+                # Stored before validation applied; recompute and overwrite.
+                self.misses += 1
+                return None
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a response and occasionally evict old entries."""
+        if not self.enabled:
+            return
+        encoded = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, encoded, len(encoded.encode("utf-8")), now, now),
+            )
+            conn.commit()
+            self._puts_since_prune += 1
+            if self._puts_since_prune >= PRUNE_EVERY:
+                self.prune()
+
+    def prune(self) -> int:
+        """Drop expired entries, then least-recently-used ones above max_bytes."""
+        with self._lock:
+            conn = self._conn
+            if conn is None:
+                return 0
+            self._puts_since_prune = 0
+            removed = conn.execute(
+                "DELETE FROM responses WHERE created_at < ?",
+                (time.time() - self.max_age_seconds,),
+            ).rowcount
+
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                stale_keys = []
+                for key, size in conn.execute(
+                    "SELECT key, size FROM responses ORDER BY accessed_at"
+                ):
+                    stale_keys.append((key,))
+                    excess -= size
+                    if excess <= 0:
+                        break
+                conn.executemany("DELETE FROM responses WHERE key = ?", stale_keys)
+                removed += len(stale_keys)
+            conn.commit()
+            return removed
+
+    def _store(
+        self,
+        key: str,
+        value: Optional[Dict[str, Any]],
+        validate: Optional[Callable[[Dict[str, Any]], bool]],
+    ) -> None:
+        if value is not None and (validate is None or validate(value)):
+            self.put(key, value)
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Optional[Dict[str, Any]]],
+        validate: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached value or compute it once across threads. With
+        validate, only values it accepts are stored or served from the cache.
+        """
+        if not self.enabled:
+            return compute()
+
+        while True:
+            cached = self.get(key, validate)
+            if cached is not None:
+                return cached
+            with self._lock:
+                waiter = self._inflight.get(key)
+                if waiter is None:
+                    self._inflight[key] = threading.Event()
+                    break
+            # Another thread owns this key; re-read once it finishes.
+            waiter.wait()
+
+        try:
+            value = compute()
+            self._store(key, value, validate)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key).set()
+
+    async def get_or_compute_async(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+        validate: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Async variant of get_or_compute; coalesces tasks on the running event loop."""
+        if not self.enabled:
+            return await compute()
+
+        cached = self.get(key, validate)
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pending = self._inflight_async.get((loop, key))
+            if pending is None:
+                future = loop.create_future()
+                self._inflight_async[(loop, key)] = future
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        try:
+            value = await compute()
+            self._store(key, value, validate)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure does not log a warning.
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            with self._lock:
+                self._inflight_async.pop((loop, key), None)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache."""
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache(RESPONSE_CACHE_PATH)
+    return _cache
+
+
+def set_response_cache_enabled(enabled: bool) -> None:
+    """Turn the cache on or off for this process (e.g. --no-cache)."""
+    get_response_cache().enabled = enabled
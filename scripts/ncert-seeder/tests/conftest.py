@@ -0,0 +1,45 @@
+# Shared pytest setup for the seeder modules
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from detector import extract_all_subtopics  # noqa: E402
+from extractor import extract_pdf  # noqa: E402
+from sample_pdf import make_sample_pdf, make_textbook_pdf  # noqa: E402
+
+# More pages than the streaming threshold sample and RunningTextFilter buffer.
+SAMPLE_PAGES = 40
+
+
+@pytest.fixture(scope="session")
+def sample_pdfs(tmp_path_factory):
+    """
+    The benchmark fixtures: a math-dense chapter, a prose-heavy one and one
+    laid out like a printed textbook chapter.
+    """
+    tmp = tmp_path_factory.mktemp("pdfs")
+    return {
+        "math_dense": make_sample_pdf(tmp / "math_dense.pdf", pages=SAMPLE_PAGES),
+        "prose": make_sample_pdf(
+            tmp / "prose.pdf", pages=SAMPLE_PAGES, figures=False, math_lines=False, subtopic_every=3
+        ),
+        "textbook": make_textbook_pdf(tmp / "textbook.pdf", pages=SAMPLE_PAGES),
+    }
+
+
+@pytest.fixture(scope="session")
+def baselines(sample_pdfs):
+    """Subtopics from serial span-level extraction of each sample PDF."""
+    return {name: extract_all_subtopics(extract_pdf(path)) for name, path in sample_pdfs.items()}
+
+
+@pytest.fixture(params=["math_dense", "prose", "textbook"])
+def sample(request, sample_pdfs, baselines):
+    """(path, baseline subtopics) for each sample PDF."""
+    return sample_pdfs[request.param], baselines[request.param]
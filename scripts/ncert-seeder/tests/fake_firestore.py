@@ -0,0 +1,129 @@
+# In-memory stand-in for the Firestore client surface the publisher uses
+"""
+Fake Firestore - Dict-backed client with collections, equality queries,
+get_all, a BulkWriter that reports per-write results, and transactions
+that apply directly. lose_writes simulates batch RPCs that fail silently.
+"""
+from typing import Any, Dict, List, Optional
+
+
+class FakeSnapshot:
+    def __init__(self, doc_id: str, data: Optional[Dict[str, Any]]):
+        self.id = doc_id
+        self._data = data
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return dict(self._data) if self._data is not None else None
+
+
+class FakeRef:
+    def __init__(self, db: "FakeClient", collection: str, doc_id: str):
+        self.db = db
+        self.collection = collection
+        self.id = doc_id
+        self.path = f"{collection}/{doc_id}"
+
+    def get(self, transaction: Any = None) -> FakeSnapshot:
+        self.db.reads += 1
+        return FakeSnapshot(self.id, self.db.data(self.collection).get(self.id))
+
+
+class FakeQuery:
+    def __init__(self, db: "FakeClient", collection: str, filters: Optional[List[Any]] = None):
+        self.db = db
+        self.collection = collection
+        self.filters = filters or []
+
+    def where(self, filter: Any) -> "FakeQuery":
+        return FakeQuery(self.db, self.collection, self.filters + [filter])
+
+    def select(self, field_paths: List[str]) -> "FakeQuery":
+        return self
+
+    def stream(self) -> List[FakeSnapshot]:
+        snapshots = []
+        for doc_id, data in sorted(self.db.data(self.collection).items()):
+            if all(data.get(f.field_path) == f.value for f in self.filters):
+                self.db.reads += 1
+                snapshots.append(FakeSnapshot(doc_id, data))
+        return snapshots
+
+
+class FakeCollection(FakeQuery):
+    def document(self, doc_id: str) -> FakeRef:
+        return FakeRef(self.db, self.collection, doc_id)
+
+
+class FakeBulkWriter:
+    def __init__(self, db: "FakeClient"):
+        self.db = db
+        self.operations: List[tuple] = []
+
+    def on_write_result(self, callback: Any) -> None:
+        self.on_result = callback
+
+    def on_write_error(self, callback: Any) -> None:
+        self.on_error = callback
+
+    def set(self, ref: FakeRef, document: Dict[str, Any], merge: bool = False) -> None:
+        self.operations.append((ref, document))
+
+    def delete(self, ref: FakeRef) -> None:
+        self.operations.append((ref, None))
+
+    def flush(self) -> None:
+        operations, self.operations = self.operations, []
+        for ref, document in operations:
+            if self.db.lose_writes > 0:
+                self.db.lose_writes -= 1
+                continue
+            self.db.apply(ref, document)
+            self.on_result(ref, None, self)
+
+    close = flush
+
+
+class FakeTransaction:
+    def __init__(self, db: "FakeClient"):
+        self.db = db
+
+    def set(self, ref: FakeRef, document: Dict[str, Any]) -> None:
+        self.db.apply(ref, document, merge=False)
+
+
+class FakeClient:
+    def __init__(self):
+        self.collections: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.reads = 0
+        self.writes = 0
+        self.lose_writes = 0
+
+    def data(self, collection: str) -> Dict[str, Dict[str, Any]]:
+        return self.collections.setdefault(collection, {})
+
+    def apply(self, ref: FakeRef, document: Optional[Dict[str, Any]], merge: bool = True) -> None:
+        self.writes += 1
+        store = self.data(ref.collection)
+        if document is None:
+            store.pop(ref.id, None)
+        elif merge:
+            store[ref.id] = {**store.get(ref.id, {}), **document}
+        else:
+            store[ref.id] = dict(document)
+
+    def collection(self, name: str) -> FakeCollection:
+        return FakeCollection(self, name)
+
+    def get_all(self, refs: List[FakeRef], field_paths: Optional[List[str]] = None):
+        for ref in refs:
+            yield ref.get()
+
+    def bulk_writer(self, options: Any = None) -> FakeBulkWriter:
+        return FakeBulkWriter(self)
+
+    def transaction(self) -> FakeTransaction:
+        return FakeTransaction(self)
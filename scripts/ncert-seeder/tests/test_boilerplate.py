@@ -0,0 +1,53 @@
+# Tests for cross-page running text removal
+import fitz
+
+from boilerplate import RunningTextFilter
+from detector import iter_subtopics
+from extractor import iter_pages
+
+
+def test_running_text_filter_keeps_body_text(sample):
+    path, baseline = sample
+    running_text = RunningTextFilter()
+    assert list(iter_subtopics(running_text(iter_pages(path)))) == baseline
+    assert running_text.dropped_blocks == 0
+
+
+def labelled_pdf(path, pages=12):
+    """Pages with a running title just inside the top margin and a repeated in-body label."""
+    doc = fitz.open()
+    for pno in range(pages):
+        page = doc.new_page(width=595, height=842)
+        page.insert_text((50, 90), f"Curiosity | Chapter {pno // 4 + 1}", fontsize=9)
+        page.insert_text((50, 300), "Think and answer", fontsize=11)
+        for line in range(4):
+            page.insert_text((50, 420 + 14 * line), f"Body line {line} on page {pno + 1}.", fontsize=10)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def page_texts(pages):
+    return [" | ".join(text.strip() for text in page.block_texts()) for page in pages]
+
+
+def test_running_title_inside_the_margin_band_is_dropped(tmp_path):
+    path = labelled_pdf(tmp_path / "labelled.pdf")
+    running_text = RunningTextFilter()
+
+    texts = page_texts(running_text(iter_pages(path)))
+
+    assert all("Curiosity" not in text for text in texts)
+    assert all("Think and answer" in text and "Body line 3" in text for text in texts)
+    assert running_text.dropped_blocks == 12
+    assert running_text.tokens_saved() > 0
+
+
+def test_repeated_labels_in_the_body_area_are_kept(tmp_path):
+    path = labelled_pdf(tmp_path / "labelled.pdf", pages=3)
+    running_text = RunningTextFilter()
+
+    texts = page_texts(running_text(iter_pages(path)))
+
+    assert all("Think and answer" in text for text in texts)
+    assert running_text.dropped_blocks == 3
@@ -0,0 +1,20 @@
+# Tests for token counting
+from collections import Counter
+
+from boilerplate import RunningTextFilter
+from chunker import count_tokens, count_tokens_batch
+
+
+def test_batch_counts_match_single_counts():
+    texts = ["", "Force", "Reprint 2024-25", "friction surface motion " * 200, "x = y + 2"]
+    assert count_tokens_batch(texts) == [count_tokens(text) for text in texts]
+    assert count_tokens_batch(texts, num_threads=1) == count_tokens_batch(texts)
+
+
+def test_tokens_saved_weights_each_dropped_text_by_its_count():
+    running_text = RunningTextFilter()
+    running_text.dropped = Counter({"Reprint 2024-25": 30, "Science": 12})
+    assert running_text.tokens_saved() == (
+        30 * count_tokens("Reprint 2024-25") + 12 * count_tokens("Science")
+    )
+    assert RunningTextFilter().tokens_saved() == 0
@@ -0,0 +1,64 @@
+# Tests for structure detection
+import fitz
+
+from detector import (
+    _detect_font_threshold,
+    extract_all_subtopics,
+    iter_subtopics,
+    outline_sections,
+)
+from extractor import ExtractedPage, TextBlock, extract_pdf, iter_pages, read_pdf_metadata
+from sample_pdf import make_sample_pdf
+
+
+def test_outline_sets_the_chapter_id(tmp_path):
+    path = make_sample_pdf(tmp_path / "outlined.pdf", pages=10, figures=False, outline=True)
+    metadata = read_pdf_metadata(path)
+    outline = outline_sections(metadata["outline"], metadata["page_count"])
+
+    subtopics = list(iter_subtopics(iter_pages(path), outline=outline))
+    headings = list(iter_subtopics(iter_pages(path)))
+
+    assert outline is not None
+    assert {s["chapter_id"] for s in subtopics} == {"chapter-6"}
+    assert [s["subtopic_id"] for s in subtopics] == [s["subtopic_id"] for s in headings]
+    assert subtopics == extract_all_subtopics(extract_pdf(path))
+
+
+def page_with_sizes(*sizes):
+    blocks = [
+        TextBlock(f"block {i}", 50, 90 + 20 * i, 500, 100 + 20 * i, size, "helv")
+        for i, size in enumerate(sizes)
+    ]
+    return ExtractedPage(1, 595, 842, blocks=blocks)
+
+
+def test_font_threshold_ignores_blocks_without_font_info():
+    pages = [page_with_sizes(10.5, 12, 14, 20)]
+    # Tiered extraction's cheap pass leaves body blocks at font_size 0.
+    cheap = page_with_sizes(0, 0, 0, 0, 0)
+
+    assert _detect_font_threshold(pages) == 12
+    assert _detect_font_threshold(pages + [cheap]) == 12
+    assert _detect_font_threshold([cheap]) == 12.0
+
+
+def test_outline_topics_without_subtopic_entries_still_split_at_headings(tmp_path):
+    full = make_sample_pdf(tmp_path / "outlined.pdf", pages=10, figures=False, outline=True)
+    path = tmp_path / "topics_only.pdf"
+    with fitz.open(full) as doc:
+        toc = doc.get_toc(simple=False)
+        # Keep subtopic entries for the first topic only.
+        first_topic_end = [row[0] for row in toc].index(2, 2)
+        doc.set_toc(toc[:first_topic_end] + [row for row in toc[first_topic_end:] if row[0] < 3])
+        doc.save(str(path))
+    metadata = read_pdf_metadata(path)
+    outline = outline_sections(metadata["outline"], metadata["page_count"])
+
+    subtopics = list(iter_subtopics(iter_pages(path), outline=outline))
+    headings = list(iter_subtopics(iter_pages(path)))
+
+    assert sum(entry.kind == "subtopic" for entry in outline) < len(headings)
+    assert [s["subtopic_id"] for s in subtopics] == [s["subtopic_id"] for s in headings]
+    assert [s["topic_id"] for s in subtopics] == [s["topic_id"] for s in headings]
+    assert subtopics == extract_all_subtopics(extract_pdf(path))
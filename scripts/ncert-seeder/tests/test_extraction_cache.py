@@ -0,0 +1,103 @@
+# Tests for the on-disk extraction cache
+import numpy as np
+import pytest
+
+import extraction_cache
+from boilerplate import RunningTextFilter
+from detector import iter_subtopics
+from extractor import iter_pages
+from sample_pdf import make_sample_pdf
+from test_boilerplate import labelled_pdf, page_texts
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(extraction_cache, "EXTRACTION_CACHE_DIR", tmp_path / "extraction")
+    return tmp_path / "extraction"
+
+
+def test_cache_key_covers_pdf_bytes_mode_and_extractor_version(tmp_path, monkeypatch):
+    first = make_sample_pdf(tmp_path / "a.pdf", pages=2, figures=False)
+    copy = tmp_path / "copy.pdf"
+    copy.write_bytes(first.read_bytes())
+    other = make_sample_pdf(tmp_path / "b.pdf", pages=2, figures=False, seed=4)
+
+    key = extraction_cache.pdf_cache_key(first)
+    assert extraction_cache.pdf_cache_key(copy) == key
+    assert extraction_cache.pdf_cache_key(other) != key
+    assert extraction_cache.pdf_cache_key(first, tiered=True) != key
+
+    monkeypatch.setattr(extraction_cache, "EXTRACTOR_VERSION", "next")
+    assert extraction_cache.pdf_cache_key(first) != key
+
+
+def test_cached_pages_replay_the_extraction(sample_pdfs, baselines, cache_dir):
+    path = sample_pdfs["math_dense"]
+    metadata, pages, hit = extraction_cache.open_extraction(path)
+    assert not hit
+    assert list(iter_subtopics(pages)) == baselines["math_dense"]
+
+    cached_metadata, cached_pages, hit = extraction_cache.open_extraction(path)
+    assert hit
+    assert cached_metadata == metadata
+    assert list(iter_subtopics(cached_pages)) == baselines["math_dense"]
+
+    # The tiered mode has its own entry.
+    assert not extraction_cache.open_extraction(path, tiered=True)[2]
+
+
+def test_unreadable_cache_file_is_rebuilt(sample_pdfs, cache_dir):
+    path = sample_pdfs["prose"]
+    cache_file = extraction_cache.cache_path_for(path)
+    cache_file.parent.mkdir(parents=True)
+    cache_file.write_bytes(b"not a cache")
+
+    _, pages, hit = extraction_cache.open_extraction(path)
+    assert not hit
+    list(pages)
+    assert extraction_cache.open_extraction(path)[2]
+
+
+def test_cache_writer_spools_pages_and_cleans_up_when_abandoned(sample_pdfs, cache_dir):
+    path = sample_pdfs["prose"]
+    cache_file = extraction_cache.cache_path_for(path)
+    _, pages, hit = extraction_cache.open_extraction(path)
+    assert not hit
+
+    next(pages)
+    parts = sorted(cache_dir.glob("*.tmp"))
+    assert [part.name.split(".", 1)[1] for part in parts] == ["ncx.blocks.tmp", "ncx.text.tmp"]
+    assert all(part.stat().st_size for part in parts)
+
+    pages.close()
+    assert list(cache_dir.iterdir()) == []
+    assert not cache_file.exists()
+
+
+
+def test_cached_pages_are_read_only_views_that_outlive_close(sample_pdfs, cache_dir):
+    path = sample_pdfs["math_dense"]
+    list(extraction_cache.open_extraction(path)[1])
+    cached = extraction_cache.CachedExtraction(extraction_cache.cache_path_for(path))
+    pages = list(cached.iter_pages())
+    expected = [page.block_texts() for page in iter_pages(path)]
+
+    assert all(not page.table.flags.writeable for page in pages)
+    assert all(np.shares_memory(page.table, cached.table) for page in pages)
+    cached.close()
+
+    # The mapping stays alive while pages still reference it.
+    assert [page.block_texts() for page in pages] == expected
+    order = np.arange(pages[0].block_count)[::-1]
+    assert pages[0].take(order).block_texts() == expected[0][::-1]
+
+
+def test_running_text_is_stripped_from_cached_pages(tmp_path, cache_dir):
+    path = labelled_pdf(tmp_path / "labelled.pdf")
+    list(extraction_cache.open_extraction(path)[1])
+    _, cached_pages, hit = extraction_cache.open_extraction(path)
+    assert hit
+
+    running_text = RunningTextFilter()
+    assert page_texts(running_text(cached_pages)) == page_texts(RunningTextFilter()(iter_pages(path)))
+    assert running_text.dropped_blocks == 12
@@ -0,0 +1,37 @@
+# Tests for the extraction paths against the serial span-level baseline
+from conftest import SAMPLE_PAGES
+from detector import _detect_font_threshold, extract_all_subtopics, iter_subtopics
+from extractor import extract_pdf, iter_pages
+
+
+def test_baseline_detects_every_subtopic(baselines):
+    assert len(baselines["math_dense"]) == SAMPLE_PAGES
+    assert len(baselines["prose"]) == SAMPLE_PAGES // 3 + 1
+
+
+def test_workers_match_baseline(sample):
+    path, baseline = sample
+    assert extract_all_subtopics(extract_pdf(path, workers=2)) == baseline
+
+
+def test_streaming_matches_baseline(sample):
+    path, baseline = sample
+    assert list(iter_subtopics(iter_pages(path))) == baseline
+    assert list(iter_subtopics(iter_pages(path, workers=2))) == baseline
+
+
+def test_tiered_matches_baseline(sample):
+    path, baseline = sample
+    assert extract_all_subtopics(extract_pdf(path, tiered=True)) == baseline
+    assert list(iter_subtopics(iter_pages(path, workers=2, tiered=True))) == baseline
+
+
+def test_tiered_threshold_matches_on_textbook_layout(sample_pdfs, baselines):
+    path = sample_pdfs["textbook"]
+    full = extract_pdf(path)
+    tiered = extract_pdf(path, tiered=True)
+
+    # Some pages never needed the span-level pass, so carry no font sizes.
+    assert any(page.block_count and not page.font_size.any() for page in tiered.pages)
+    assert _detect_font_threshold(tiered.pages) == _detect_font_threshold(full.pages)
+    assert extract_all_subtopics(tiered) == baselines["textbook"]
@@ -0,0 +1,230 @@
+# Tests for Firestore publishing without a live backend
+import functools
+import json
+
+import pytest
+from google.cloud import firestore as gcloud_firestore
+from google.cloud.firestore_v1.bulk_writer import BulkWriter
+from google.cloud.firestore_v1.query import Query
+from google.cloud.firestore_v1.types import BatchWriteResponse, WriteResult
+from google.rpc import status_pb2
+
+import firestore
+from fake_firestore import FakeClient
+from publish_checkpoint import PublishCheckpoint, checkpoint_path_for
+
+
+@pytest.fixture
+def db(monkeypatch):
+    # Points at a closed port; every RPC a test does not stub would fail.
+    monkeypatch.setenv("FIRESTORE_EMULATOR_HOST", "127.0.0.1:1")
+    return gcloud_firestore.Client(project="demo-seeder")
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(firestore.time, "sleep", delays.append)
+    return delays
+
+
+def stub_batches(monkeypatch, fail_first: int = 0):
+    """Replace batch commits; the first fail_first batches raise like a failed RPC."""
+    sent = []
+
+    def send(writer, batch):
+        sent.append(sorted(ref.id for ref in batch._document_references.values()))
+        if len(sent) <= fail_first:
+            raise RuntimeError("503 UNAVAILABLE")
+        size = len(batch)
+        return BatchWriteResponse(
+            write_results=[WriteResult() for _ in range(size)],
+            status=[status_pb2.Status(code=0) for _ in range(size)],
+        )
+
+    monkeypatch.setattr(BulkWriter, "_send", send)
+    return sent
+
+
+def queue_documents(publisher, db, count):
+    chunks = db.collection("curriculum_chunks")
+    for i in range(count):
+        document = {"content": {"id": f"s{i}"}}
+        document["contentHash"] = firestore.content_hash(document)
+        publisher._queue(chunks.document(f"doc{i}"), document)
+
+
+def test_lost_batch_is_resent_with_a_new_writer(db, monkeypatch, sleeps):
+    sent = stub_batches(monkeypatch, fail_first=1)
+    publisher = firestore.ChunkPublisher(db)
+    queue_documents(publisher, db, 3)
+
+    failures = publisher.close()
+
+    assert failures == []
+    assert publisher.written == 3
+    assert sent == [["doc0", "doc1", "doc2"], ["doc0", "doc1", "doc2"]]
+    assert sleeps == [firestore.RETRY_DELAY]
+
+
+def test_writes_still_lost_after_every_round_are_failures(db, monkeypatch, sleeps):
+    sent = stub_batches(monkeypatch, fail_first=10_000)
+    publisher = firestore.ChunkPublisher(db)
+    queue_documents(publisher, db, 2)
+
+    failures = publisher.close()
+
+    assert [path for path, _ in failures] == ["curriculum_chunks/doc0", "curriculum_chunks/doc1"]
+    assert len(sent) == firestore.FIRESTORE_BATCH_RETRY_ROUNDS + 1
+    assert sleeps == sorted(sleeps)
+
+
+def test_flush_leaves_the_publisher_usable(db, monkeypatch, sleeps):
+    sent = stub_batches(monkeypatch)
+    publisher = firestore.ChunkPublisher(db)
+    queue_documents(publisher, db, 1)
+    publisher.flush()
+    queue_documents(publisher, db, 2)
+
+    assert publisher.close() == []
+    assert publisher.written == 3
+    assert len(sent) == 2
+    assert sleeps == []
+
+
+def test_published_ids_query_projects_only_the_document_name(db, monkeypatch):
+    projections = []
+
+    def stream(query):
+        projections.append([field.field_path for field in query._projection.fields])
+        return iter([])
+
+    monkeypatch.setattr(Query, "stream", stream)
+
+    assert firestore.ChunkPublisher(db)._published_ids("Science", "science-7-6") == []
+    assert projections == [["__name__"]]
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    monkeypatch.setattr(firestore.firestore, "transactional", lambda fn: fn)
+    monkeypatch.setattr(firestore.time, "sleep", lambda seconds: None)
+    return FakeClient()
+
+
+def make_chapter(count, chapter_id="science-7-6"):
+    subtopics = [
+        {
+            "id": f"6.1.{i}",
+            "title": f"Subtopic {i}",
+            "keyConcepts": [f"Concept {i}"],
+            "keyTerms": {f"Term {i}": "definition"},
+            "questionBank": [{"id": f"q{i}", "type": "mcq", "question": "?"}],
+            "status": "completed",
+        }
+        for i in range(count)
+    ]
+    return {"id": chapter_id, "title": "Chapter", "topics": [{"id": "6.1", "title": "Topic", "subtopics": subtopics}]}
+
+
+def publish(db, chapter, chapter_num="6", **kwargs):
+    publisher = firestore.ChunkPublisher(db, force=kwargs.pop("force", False))
+    summary = publisher.publish(chapter, "science", "7", chapter_num, **kwargs)
+    return summary, publisher.close()
+
+
+def catalog_subtopics(db, chapter_id="science-7-6"):
+    chapters = db.data(firestore.CATALOG_COLLECTION)["Science"]["chapters"]
+    return [s["id"] for topic in chapters[chapter_id]["topics"] for s in topic["subtopics"]]
+
+
+def test_first_catalog_keeps_chapters_published_before_it(fake_db):
+    publish(fake_db, make_chapter(3, "science-7-5"), chapter_num="5")
+    fake_db.data(firestore.CATALOG_COLLECTION).clear()
+
+    publish(fake_db, make_chapter(2))
+
+    chapters = fake_db.data(firestore.CATALOG_COLLECTION)["Science"]["chapters"]
+    assert sorted(chapters) == ["science-7-5", "science-7-6"]
+    assert catalog_subtopics(fake_db, "science-7-5") == ["6.1.0", "6.1.1", "6.1.2"]
+    assert catalog_subtopics(fake_db) == ["6.1.0", "6.1.1"]
+
+
+def test_checkpoint_is_removed_once_a_chapter_fully_commits(fake_db, tmp_path):
+    output_path = tmp_path / "chapter_6.json"
+    publish(fake_db, make_chapter(2), checkpoint=PublishCheckpoint(output_path))
+
+    assert not checkpoint_path_for(output_path).exists()
+
+    reads = fake_db.reads
+    summary, _ = publish(fake_db, make_chapter(2), checkpoint=PublishCheckpoint(output_path))
+
+    assert summary["subtopics_written"] == "0"
+    assert fake_db.reads > reads
+
+
+def test_checkpoint_is_kept_when_a_write_fails(fake_db, tmp_path):
+    output_path = tmp_path / "chapter_6.json"
+    fake_db.lose_writes = 10_000
+
+    _, failures = publish(fake_db, make_chapter(2), checkpoint=PublishCheckpoint(output_path))
+
+    assert failures
+    assert checkpoint_path_for(output_path).exists()
+
+
+def test_forced_republish_still_deletes_removed_documents(fake_db, monkeypatch):
+    monkeypatch.setattr(firestore, "_pool_documents", functools.partial(firestore._pool_documents, max_bytes=100))
+    publish(fake_db, make_chapter(3))
+    assert len(fake_db.data(firestore.POOL_COLLECTION)) > 2
+
+    summary, failures = publish(fake_db, make_chapter(1), force=True)
+
+    assert failures == []
+    assert summary["subtopics_written"] == "1"
+    assert len(fake_db.data("curriculum_chunks")) == 1
+    assert sorted(fake_db.data(firestore.POOL_COLLECTION)) == [
+        "Science__science-7-6__flashcards__0",
+        "Science__science-7-6__flashcards__1",
+        "Science__science-7-6__questions__0",
+    ]
+
+
+def test_pools_carry_samples_and_split_under_the_size_limit():
+    chapter = make_chapter(12)
+    for subtopic in chapter["topics"][0]["subtopics"]:
+        subtopic["questionBank"] = [
+            {"id": "short", "type": "short", "question": "x" * 400},
+            {"id": f"mcq-{subtopic['id']}", "type": "mcq", "question": "y" * 400},
+        ]
+    pools = firestore._pool_documents(
+        "Science", "science-7-6", "Chapter", "6", "Class_7",
+        {f"Science__science-7-6__6.1__{s['id']}": {"topicId": "6.1", "subtopicId": s["id"], "content": s}
+         for s in chapter["topics"][0]["subtopics"]},
+        max_bytes=2_000,
+    )
+
+    question_parts = sorted(
+        (doc for doc in pools.values() if doc["kind"] == "questions"), key=lambda doc: doc["part"]
+    )
+    assert len(question_parts) > 1
+    assert all(doc["parts"] == len(question_parts) for doc in question_parts)
+    assert sum(len(doc["items"]) for doc in question_parts) == 24
+    assert all(len(json.dumps(doc["items"], separators=(",", ":"))) <= 2_000 for doc in question_parts)
+    # Doc id order puts 6.1.10 before 6.1.2, as a chunk scan would.
+    assert question_parts[0]["sample"]["question"]["id"] == "mcq-6.1.0"
+    assert "sample" not in question_parts[1]
+
+    cards = pools["Science__science-7-6__flashcards__0"]["sample"]
+    assert [card["term"] for card in cards] == ["Term 0", "Concept 0"]
+
+
+def test_chapter_without_questions_still_gets_an_empty_pool(fake_db):
+    chapter = make_chapter(2)
+    for subtopic in chapter["topics"][0]["subtopics"]:
+        subtopic["questionBank"] = []
+
+    publish(fake_db, chapter)
+
+    pool = fake_db.data(firestore.POOL_COLLECTION)["Science__science-7-6__questions__0"]
+    assert pool["items"] == [] and pool["sample"] is None and pool["parts"] == 1
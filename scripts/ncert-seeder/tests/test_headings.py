@@ -0,0 +1,64 @@
+# Heading decisions of the compiled classifier against the checks it replaced
+import random
+
+import pytest
+
+from bench_headings import decide, fuzz_block, legacy_decide
+from detector import _detect_font_threshold
+from extractor import extract_pdf
+
+EDGE_CASES = [
+    ("", 20.0, True),
+    ("   ", 20.0, True),
+    ("Chapter 6", 20.0, True),
+    ("CHAPTER xii: Light", 12.0, False),
+    ("6 Chapter", 9.0, False),
+    ("6.1 Force", 14.0, True),
+    ("6.4.2 Contact forces", 12.0, True),
+    ("1.2.3.4.5.6 Too deep", 12.0, False),
+    ("Activity 6.1", 14.0, True),
+    ("6.1 Activity", 14.0, True),
+    ("Fig. 6.2 A ball", 9.0, False),
+    ("In a nutshell", 14.0, True),
+    ("Friction", 14.0, True),
+    ("Force and\nPressure", 14.0, True),
+    ("Mass\nWeight\nVolume", 14.0, True),
+    ("A force can change the motion of a body.", 14.0, True),
+    ("–", 20.0, True),
+    ("é", 20.0, True),
+]
+
+
+@pytest.fixture(scope="module")
+def sample_blocks(sample_pdfs):
+    blocks = []
+    thresholds = []
+    for path in sample_pdfs.values():
+        pages = extract_pdf(path).pages
+        thresholds.append(_detect_font_threshold(pages))
+        blocks.extend(
+            (text, size, bold, thresholds[-1])
+            for page in pages
+            for text, size, bold in zip(
+                page.block_texts(), page.font_size.tolist(), page.table["is_bold"].tolist()
+            )
+        )
+    return blocks
+
+
+@pytest.mark.parametrize("saw_numeric_topic", [False, True])
+def test_classifier_matches_legacy_on_sample_pdfs(sample_blocks, saw_numeric_topic):
+    for text, size, bold, threshold in sample_blocks:
+        assert decide(text, size, bold, threshold, saw_numeric_topic) == legacy_decide(
+            text, size, bold, threshold, saw_numeric_topic
+        ), text
+
+
+@pytest.mark.parametrize("saw_numeric_topic", [False, True])
+def test_classifier_matches_legacy_on_edge_cases_and_fuzz(saw_numeric_topic):
+    rng = random.Random(18)
+    blocks = EDGE_CASES + [fuzz_block(rng) for _ in range(20_000)]
+    for text, size, bold in blocks:
+        assert decide(text, size, bold, 12.0, saw_numeric_topic) == legacy_decide(
+            text, size, bold, 12.0, saw_numeric_topic
+        ), text
@@ -0,0 +1,33 @@
+# Tests for the append-only chapter journal
+import json
+
+from journal import ChapterJournal, fold_journal_into, journal_path_for
+
+
+def test_journal_replays_finished_subtopics_after_a_crash(tmp_path):
+    output_path = tmp_path / "chapter_6.json"
+    journal = ChapterJournal(output_path)
+    journal.append({"id": "s1", "status": "completed"})
+    journal.append({"id": "s2", "status": "failed"})
+    journal.append({"id": "s1", "status": "failed"})
+    journal.close()
+    with open(journal_path_for(output_path), "a", encoding="utf-8") as f:
+        f.write('{"id": "s2", "sta')
+
+    lookup = {"s1": {"id": "s1", "status": "pending"}, "s2": {"id": "s2", "status": "pending"}}
+    assert ChapterJournal(output_path).replay(lookup) == 3
+    assert lookup == {"s1": {"id": "s1", "status": "failed"}, "s2": {"id": "s2", "status": "failed"}}
+
+
+def test_folding_a_journal_saves_the_chapter_and_truncates_it(tmp_path):
+    output_path = tmp_path / "chapter_6.json"
+    journal = ChapterJournal(output_path)
+    journal.append({"id": "s1", "status": "completed"})
+    journal.close()
+    lookup = {"s1": {"id": "s1", "status": "pending"}, "s9": {"id": "s9", "status": "pending"}}
+    saved = []
+
+    assert fold_journal_into(output_path, lookup, lambda: saved.append(json.dumps(lookup))) == 1
+    assert saved and lookup["s1"]["status"] == "completed"
+    assert not journal_path_for(output_path).exists()
+    assert fold_journal_into(output_path, lookup, lambda: saved.append("again")) is None
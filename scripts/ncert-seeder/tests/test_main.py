@@ -0,0 +1,180 @@
+# Tests for resuming failed subtopics and for chapter runs
+import argparse
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import main
+import processor
+from conftest import SAMPLE_PAGES
+from journal import ChapterJournal
+from main import checkpointed_phase1, source_content_hash
+
+
+def phase1_entry(**overrides):
+    entry = {
+        "id": "6-1-1-subtopic-1",
+        "status": "failed",
+        "failedPhase": "phase2",
+        "learningObjectives": ["a", "b", "c"],
+        "keyConcepts": ["a", "b", "c"],
+        "keyTerms": {"Force": "A push or pull"},
+        "examples": ["a", "b"],
+        "misconceptions": [],
+    }
+    entry.update(overrides)
+    return entry
+
+
+def test_phase1_checkpoint_resumes_only_a_failed_phase2():
+    source = {"content": "Forces change motion."}
+    entry = phase1_entry(sourceHash=source_content_hash(source))
+
+    resumed = checkpointed_phase1(entry, source)
+
+    assert resumed == {
+        field: entry[field]
+        for field in ("learningObjectives", "keyConcepts", "keyTerms", "examples", "misconceptions")
+    }
+    assert checkpointed_phase1(phase1_entry(failedPhase="phase1"), source) is None
+    assert checkpointed_phase1(phase1_entry(status="completed"), source) is None
+
+
+def test_phase1_checkpoint_is_invalidated_by_changed_source_or_bad_output():
+    source = {"content": "Forces change motion."}
+    stale = phase1_entry(sourceHash=source_content_hash({"content": "Older text."}))
+
+    assert checkpointed_phase1(stale, source) is None
+    assert checkpointed_phase1(phase1_entry(keyConcepts=["only one"]), source) is None
+
+
+def test_phase1_checkpoint_reads_entries_saved_before_failed_phase():
+    source = {"content": "Forces change motion."}
+    legacy = phase1_entry(error="Phase 2 failed: no questions generated")
+    del legacy["failedPhase"]
+
+    assert checkpointed_phase1(legacy, source) is not None
+    assert checkpointed_phase1({**legacy, "error": "Phase 1 failed"}, source) is None
+
+
+def run_args(**overrides):
+    args = argparse.Namespace(
+        extract_workers=1,
+        no_extract_cache=True,
+        tiered_extract=False,
+        keep_running_text=False,
+        ignore_outline=False,
+        no_figure_index=False,
+        fresh=False,
+        retry_subtopic=None,
+        retry_failed=False,
+        concurrency=1,
+        no_cache=True,
+    )
+    vars(args).update(overrides)
+    return args
+
+
+def finished(source):
+    return {
+        "id": source["subtopic_id"],
+        "title": source["subtopic_title"],
+        "learningObjectives": ["a", "b", "c"],
+        "keyConcepts": ["a", "b", "c"],
+        "questionBank": [{"id": "q1"}],
+    }
+
+
+@pytest.fixture
+def chapter_run(tmp_path, monkeypatch):
+    """Patches run_chapter's output and Gemini calls; records pages pulled per call."""
+    output_path = tmp_path / "science-class7-chapter6.json"
+    pulled = []
+    calls = []
+    open_extraction = main.open_extraction
+
+    def counting_extraction(*args, **kwargs):
+        metadata, pages, cache_hit = open_extraction(*args, **kwargs)
+
+        def counted():
+            for page in pages:
+                pulled.append(page.page_num)
+                yield page
+
+        return metadata, counted(), cache_hit
+
+    def process(client, source, grade_level, phase1_result=None):
+        calls.append((source["subtopic_id"], len(pulled)))
+        return finished(source)
+
+    async def process_async(client, source, grade_level, phase1_result=None, label=""):
+        return process(client, source, grade_level, phase1_result)
+
+    monkeypatch.setattr(main, "build_output_path", lambda *args: output_path)
+    monkeypatch.setattr(main, "open_extraction", counting_extraction)
+    monkeypatch.setattr(main, "get_gemini_client", lambda: object())
+    monkeypatch.setattr(main, "process_subtopic", process)
+    monkeypatch.setattr(processor, "process_subtopic_async", process_async)
+    monkeypatch.setattr(main, "set_response_cache_enabled", lambda enabled: None)
+    monkeypatch.setattr(main, "get_response_cache", lambda: SimpleNamespace(enabled=False))
+    return SimpleNamespace(output_path=output_path, pulled=pulled, calls=calls)
+
+
+def saved_subtopics(output_path):
+    chapter = json.loads(output_path.read_text(encoding="utf-8"))
+    return [s for topic in chapter["topics"] for s in topic["subtopics"]]
+
+
+def saved_statuses(output_path):
+    return {s["id"]: s["status"] for s in saved_subtopics(output_path)}
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_run_chapter_processes_subtopics_while_pages_are_still_extracted(
+    chapter_run, sample, concurrency
+):
+    pdf_path, baseline = sample
+
+    assert main.run_chapter(run_args(concurrency=concurrency), "Science", "7", "6", pdf_path)
+
+    assert [subtopic_id for subtopic_id, _ in chapter_run.calls] == [s["subtopic_id"] for s in baseline]
+    assert chapter_run.calls[0][1] < len(chapter_run.pulled)
+    assert saved_statuses(chapter_run.output_path) == {
+        s["subtopic_id"]: "completed" for s in baseline
+    }
+
+
+def test_run_chapter_applies_journaled_results_for_subtopics_not_saved_yet(chapter_run, sample):
+    pdf_path, baseline = sample
+    done = baseline[1]
+    journal = ChapterJournal(chapter_run.output_path)
+    journal.append({**finished(done), "status": "completed"})
+    journal.close()
+
+    assert main.run_chapter(run_args(), "Science", "7", "6", pdf_path)
+
+    processed = [subtopic_id for subtopic_id, _ in chapter_run.calls]
+    assert done["subtopic_id"] not in processed
+    assert len(processed) == len(baseline) - 1
+    assert saved_statuses(chapter_run.output_path)[done["subtopic_id"]] == "completed"
+
+
+def test_run_chapter_records_figures_on_each_subtopics_pages(chapter_run, sample_pdfs):
+    pdf_path = sample_pdfs["math_dense"]
+
+    assert main.run_chapter(run_args(), "Science", "7", "6", pdf_path)
+
+    subtopics = saved_subtopics(chapter_run.output_path)
+    figure_pages = set()
+    for subtopic in subtopics:
+        for figure in subtopic["figures"]:
+            assert subtopic["page_start"] <= figure["page"] <= subtopic["page_end"]
+            assert figure["caption"] == "Fig. 6.1 A figure"
+            assert len(figure["bbox"]) == 4
+            figure_pages.add(figure["page"])
+    # The fixture draws a figure on every other page.
+    assert figure_pages == set(range(1, SAMPLE_PAGES + 1, 2))
+
+    assert main.run_chapter(run_args(no_figure_index=True, fresh=True), "Science", "7", "6", pdf_path)
+    assert all("figures" not in s for s in saved_subtopics(chapter_run.output_path))
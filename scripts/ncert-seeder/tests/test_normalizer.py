@@ -0,0 +1,62 @@
+# Byte-identical checks for the normalizer against the functions it replaced
+import random
+
+import pytest
+
+from bench_normalizer import (
+    corpus,
+    fuzz_text,
+    legacy_clean_content_text,
+    legacy_merge_hyphenated_lines,
+    legacy_normalize_text,
+    legacy_tighten_math_line,
+)
+from normalizer import clean_content_text, merge_hyphenated_lines, normalize_text, tighten_math_line
+from sample_pdf import make_sample_pdf
+
+EDGE_CASES = [
+    "",
+    "   ",
+    "a\n\n\n\nb  c",
+    "See Fig. 6.1 and FIGURE 2 on page 14.",
+    "pafig. 1ge 2",
+    "fifigure 1g. 2",
+    "page fig. 1 2",
+    "fİg. 3 and fıgure 4 on PAGE 5",
+    "x = ( a + b ) / 2 , so y ÷ 3 = z",
+    "3 / 4 and 10 × 2",
+    " non-breaking thin‑hyphen\x01\x0b\x7f",
+]
+
+
+@pytest.fixture(scope="module")
+def sample_corpus(tmp_path_factory):
+    path = make_sample_pdf(tmp_path_factory.mktemp("pdf") / "sample.pdf", pages=30)
+    spans, blocks, lines = corpus(path)
+    contents = ["\n\n".join("\n".join(b) for b in blocks[i:i + 40]) for i in range(0, len(blocks), 40)]
+    rng = random.Random(17)
+    fuzz = EDGE_CASES + [fuzz_text(rng) for _ in range(20_000)]
+    return {"spans": spans, "blocks": blocks, "lines": lines, "contents": contents, "fuzz": fuzz}
+
+
+def test_normalize_text_matches_legacy(sample_corpus):
+    for text in sample_corpus["spans"] + sample_corpus["fuzz"]:
+        assert normalize_text(text) == legacy_normalize_text(text)
+
+
+def test_merge_hyphenated_lines_matches_legacy(sample_corpus):
+    blocks = sample_corpus["blocks"] + [
+        [normalize_text(part) for part in text.split("\n")] for text in sample_corpus["fuzz"]
+    ]
+    for lines in blocks:
+        assert merge_hyphenated_lines(lines) == legacy_merge_hyphenated_lines(lines)
+
+
+def test_tighten_math_line_matches_legacy(sample_corpus):
+    for line in sample_corpus["lines"] + sample_corpus["fuzz"]:
+        assert tighten_math_line(line) == legacy_tighten_math_line(line)
+
+
+def test_clean_content_text_matches_legacy(sample_corpus):
+    for text in sample_corpus["contents"] + sample_corpus["fuzz"]:
+        assert clean_content_text(text) == legacy_clean_content_text(text)
@@ -0,0 +1,78 @@
+# Tests for Gemini retry and model fallback behaviour
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import processor
+
+
+class FakeLimiter:
+    def __init__(self):
+        self.cooldowns = []
+
+    def acquire(self, model_name, tokens):
+        pass
+
+    async def acquire_async(self, model_name, tokens):
+        pass
+
+    def cooldown(self, model_name, seconds):
+        self.cooldowns.append(model_name)
+
+
+def fake_client(errors):
+    """Client whose generate_content raises errors[model] or returns JSON."""
+    calls = []
+
+    def generate_content(model, contents, config):
+        calls.append(model)
+        if model in errors:
+            raise errors[model]
+        return SimpleNamespace(text='{"ok": true}')
+
+    async def generate_content_async(model, contents, config):
+        return generate_content(model, contents, config)
+
+    client = SimpleNamespace(
+        models=SimpleNamespace(generate_content=generate_content),
+        aio=SimpleNamespace(models=SimpleNamespace(generate_content=generate_content_async)),
+    )
+    return client, calls
+
+
+def call(client, use_async):
+    args = (client, "prompt", "system", {"type": "object"})
+    if use_async:
+        return asyncio.run(processor._call_gemini_uncached_async(*args))
+    return processor._call_gemini_uncached(*args)
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    limiter = FakeLimiter()
+    monkeypatch.setattr(processor, "get_rate_limiter", lambda: limiter)
+    monkeypatch.setattr(processor, "_build_model_candidates", lambda: ["primary", "fallback"])
+    monkeypatch.setattr(processor, "RETRY_DELAY", 0)
+    return limiter
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_rate_limits_cool_down_the_same_model_instead_of_falling_back(limiter, use_async):
+    client, calls = fake_client({"primary": RuntimeError("429 RESOURCE_EXHAUSTED")})
+
+    assert call(client, use_async) is None
+    assert calls == ["primary"] * processor.MAX_RETRIES
+    assert limiter.cooldowns == ["primary"] * processor.MAX_RETRIES
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_other_failures_still_move_to_the_fallback_model(limiter, use_async):
+    missing = RuntimeError("404 NOT_FOUND models/primary is not found")
+    client, calls = fake_client({"primary": missing})
+    assert call(client, use_async) == {"ok": True}
+    assert calls == ["primary", "fallback"]
+
+    client, calls = fake_client({"primary": ValueError("Empty response from Gemini")})
+    assert call(client, use_async) == {"ok": True}
+    assert calls == ["primary"] * processor.MAX_RETRIES + ["fallback"]
@@ -0,0 +1,25 @@
+# Tests for the per-chapter publish checkpoint
+from publish_checkpoint import PublishCheckpoint, checkpoint_path_for
+
+
+def test_publish_checkpoint_reloads_committed_writes(tmp_path):
+    output_path = tmp_path / "chapter_6.json"
+    checkpoint = PublishCheckpoint(output_path)
+    checkpoint.record("a", "h1")
+    checkpoint.record("b", "h2")
+    checkpoint.record("a", "h3")
+    checkpoint.record("b", None)
+    checkpoint.close()
+    with open(checkpoint_path_for(output_path), "a", encoding="utf-8") as f:
+        f.write('{"id": "c", "ha')
+
+    resumed = PublishCheckpoint(output_path)
+    assert resumed.committed == {"a": "h3"}
+    assert resumed.is_committed("a", "h3")
+    assert not resumed.is_committed("a", "h1")
+
+    resumed.compact()
+    assert PublishCheckpoint(output_path).committed == {"a": "h3"}
+    resumed.reset()
+    assert not checkpoint_path_for(output_path).exists()
+    assert PublishCheckpoint(output_path).committed == {}
@@ -0,0 +1,135 @@
+# Tests for the persistent Gemini response cache
+import asyncio
+import threading
+
+import pytest
+
+from response_cache import ResponseCache, make_cache_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite3")
+    yield cache
+    cache.close()
+
+
+def has_questions(value):
+    return bool(value.get("questionBank"))
+
+
+def test_rejected_response_is_not_cached(cache):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"questionBank": []} if len(calls) == 1 else {"questionBank": [{"id": "q1"}]}
+
+    assert cache.get_or_compute("k", compute, has_questions) == {"questionBank": []}
+    assert cache.get("k") is None
+    assert cache.get_or_compute("k", compute, has_questions) == {"questionBank": [{"id": "q1"}]}
+    assert cache.get_or_compute("k", compute, has_questions) == {"questionBank": [{"id": "q1"}]}
+    assert len(calls) == 2
+
+
+def test_async_rejected_response_is_not_cached(cache):
+    responses = iter([{"questionBank": []}, {"questionBank": [{"id": "q1"}]}])
+
+    async def compute():
+        return next(responses)
+
+    async def run():
+        first = await cache.get_or_compute_async("k", compute, has_questions)
+        second = await cache.get_or_compute_async("k", compute, has_questions)
+        third = await cache.get_or_compute_async("k", compute, has_questions)
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert first == {"questionBank": []}
+    assert second == third == {"questionBank": [{"id": "q1"}]}
+
+
+def test_async_calls_on_one_loop_share_a_computation(cache):
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"questionBank": [{"id": "q1"}]}
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_compute_async("k", compute) for _ in range(3)))
+
+    assert asyncio.run(run()) == [{"questionBank": [{"id": "q1"}]}] * 3
+    assert len(calls) == 1
+
+
+def test_async_calls_on_loops_in_other_threads_do_not_share_futures(cache):
+    started = threading.Event()
+    release = threading.Event()
+    results = {}
+
+    async def slow():
+        started.set()
+        while not release.is_set():
+            await asyncio.sleep(0.001)
+        return {"loop": "first"}
+
+    async def fast():
+        return {"loop": "second"}
+
+    def first():
+        results["first"] = asyncio.run(cache.get_or_compute_async("k", slow))
+
+    thread = threading.Thread(target=first)
+    thread.start()
+    started.wait(5)
+    try:
+        results["second"] = asyncio.run(cache.get_or_compute_async("k", fast))
+    finally:
+        release.set()
+        thread.join(5)
+
+    assert results == {"first": {"loop": "first"}, "second": {"loop": "second"}}
+
+
+def test_stored_entry_failing_validation_is_recomputed(cache):
+    cache.put("k", {"questionBank": []})
+
+    value = cache.get_or_compute("k", lambda: {"questionBank": [{"id": "q1"}]}, has_questions)
+
+    assert value == {"questionBank": [{"id": "q1"}]}
+    assert cache.get("k") == value
+
+
+def test_none_is_never_cached(cache):
+    assert cache.get_or_compute("k", lambda: None) is None
+    assert cache.get("k") is None
+
+
+def test_cache_key_covers_every_input():
+    base = dict(models=["m"], prompt="p", system_instruction="s", schema={"a": 1}, temperature=0.1)
+    key = make_cache_key(**base)
+    assert make_cache_key(**dict(reversed(list(base.items())))) == key
+    for field, changed in [
+        ("models", ["m", "fallback"]),
+        ("prompt", "p2"),
+        ("system_instruction", "s2"),
+        ("schema", {"a": 2}),
+        ("temperature", 0.2),
+    ]:
+        assert make_cache_key(**{**base, field: changed}) != key
+
+
+def test_expired_entries_miss(cache):
+    cache.put("k", {"v": 1})
+    cache.max_age_seconds = -1
+    assert cache.get("k") is None
+
+
+def test_disabled_cache_always_computes(cache):
+    cache.enabled = False
+    calls = []
+    for _ in range(2):
+        cache.get_or_compute("k", lambda: calls.append(1) or {"v": 1})
+    assert len(calls) == 2
@@ -6,22 +6,13 @@ import json
 from typing import Any, Dict, List, Tuple
 
 
-def validate_subtopic(data: Dict[str, Any]) -> Tuple[bool, List[str]]:
-    """
-    Validate a subtopic against the required schema.
-    Returns (is_valid, error_messages)
-    """
+PHASE1_FIELDS = ["learningObjectives", "keyConcepts", "keyTerms", "examples"]
+
+
+def _validate_phase1_fields(data: Dict[str, Any]) -> List[str]:
+    """Validate fields produced by Phase 1 (structure extraction)."""
     errors = []
     
-    required_fields = [
-        "id", "title", "learningObjectives", "keyConcepts",
-        "keyTerms", "examples", "questionBank"
-    ]
-    
-    for field in required_fields:
-        if field not in data:
-            errors.append(f"Missing required field: {field}")
-    
     if "learningObjectives" in data:
         objectives = data["learningObjectives"]
         if not isinstance(objectives, list):
@@ -50,21 +41,66 @@ def validate_subtopic(data: Dict[str, Any]) -> Tuple[bool, List[str]]:
         elif len(examples) < 2:
             errors.append(f"examples needs at least 2, got {len(examples)}")
     
+    return errors
+
+
+def validate_phase1(data: Dict[str, Any]) -> Tuple[bool, List[str]]:
+    """
+    Validate only the Phase 1 part of a subtopic, e.g. before reusing it.
+    Returns (is_valid, error_messages)
+    """
+    errors = [f"Missing required field: {field}" for field in PHASE1_FIELDS if field not in data]
+    errors.extend(_validate_phase1_fields(data))
+    return len(errors) == 0, errors
+
+
+def validate_subtopic(data: Dict[str, Any]) -> Tuple[bool, List[str]]:
+    """
+    Validate a subtopic against the required schema.
+    Returns (is_valid, error_messages)
+    """
+    errors = []
+    
+    required_fields = [
+        "id", "title", "learningObjectives", "keyConcepts",
+        "keyTerms", "examples", "questionBank"
+    ]
+    
+    for field in required_fields:
+        if field not in data:
+            errors.append(f"Missing required field: {field}")
+    
+    errors.extend(_validate_phase1_fields(data))
+    
     if "questionBank" in data:
-        qb = data["questionBank"]
-        if not isinstance(qb, list):
-            errors.append("questionBank must be an array")
-        else:
-            if len(qb) < 6:
-                errors.append(f"questionBank needs at least 6, got {len(qb)}")
-            
-            for i, q in enumerate(qb):
-                q_errors = validate_question(q, i)
-                errors.extend(q_errors)
+        errors.extend(_validate_question_bank(data["questionBank"]))
     
     return len(errors) == 0, errors
 
 
+def _validate_question_bank(qb: Any) -> List[str]:
+    """Validate the questionBank produced by Phase 2."""
+    if not isinstance(qb, list):
+        return ["questionBank must be an array"]
+    errors = []
+    if len(qb) < 6:
+        errors.append(f"questionBank needs at least 6, got {len(qb)}")
+    for i, q in enumerate(qb):
+        errors.extend(validate_question(q, i))
+    return errors
+
+
+def validate_phase2(data: Dict[str, Any]) -> Tuple[bool, List[str]]:
+    """
+    Validate only the Phase 2 response, e.g. before caching it.
+    Returns (is_valid, error_messages)
+    """
+    if "questionBank" not in data:
+        return False, ["Missing required field: questionBank"]
+    errors = _validate_question_bank(data["questionBank"])
+    return len(errors) == 0, errors
+
+
 def validate_question(q: Dict[str, Any], index: int) -> List[str]:
     """Validate a single question."""
     errors = []